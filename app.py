@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from fwt_rankings.api.client import LiveheatsClient
+from fwt_rankings.api import session as liveheats_session
+from fwt_rankings.warehouse.crawler import WarehouseCrawler
+from fwt_rankings.pdf.generator import RENDER_WORKERS_ENV
 from fastapi.responses import FileResponse
 import os
 import asyncio
@@ -9,24 +12,16 @@ import subprocess
 from datetime import datetime, timedelta
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from typing import Optional
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Abstand zwischen zwei Warehouse-Crawls in Sekunden
+WAREHOUSE_CRAWL_INTERVAL = 6 * 3600
 
-# Pfad zur Python-Umgebung
-python_executable = os.path.join(os.getcwd(), "venv", "bin", "python")
-
-app.mount("/index", StaticFiles(directory="frontend", html=True), name="static")
-
-# CORS Middleware hinzufügen
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["https://report.open-faces.com"],  # Nur deine Domain erlauben
-    allow_methods=["GET", "POST"],  # Erlaube nur notwendige HTTP-Methoden
-    allow_headers=["Content-Type", "Authorization"],  # Nur notwendige Header erlauben
-)
+# Render-Prozesse pro /generate_pdf-Aufruf; bewusst weniger als die CLI, damit gleichzeitige Anfragen Kerne übrig haben
+WEB_RENDER_WORKERS = max(1, min(2, os.cpu_count() or 1))
 
 # Cache für Event-Daten
 event_cache = {
@@ -68,16 +63,50 @@ async def update_events_daily_at_fixed_time():
             # Task wird neu gestartet
             continue
 
+async def crawl_warehouse_periodically():
+    """Füllt das lokale Rankings-Warehouse beim Start und danach in festen Abständen."""
+    while True:
+        try:
+            crawler = WarehouseCrawler()
+            if crawler.warehouse is None:
+                logger.info("Rankings-Warehouse deaktiviert, Crawler wird beendet.")
+                return
+            await crawler.crawl()
+        except Exception as e:
+            logger.error(f"Fehler beim Warehouse-Crawl: {e}")
+        await asyncio.sleep(WAREHOUSE_CRAWL_INTERVAL)
+
+@asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialisierung beim Start
+    await liveheats_session.startup()  # Verbindungspool zu Liveheats öffnen
     logger.info("Initialisiere den Event-Cache beim Start der Anwendung...")
     await update_events_cache()  # Einmaliger Start
-    asyncio.create_task(update_events_daily_at_fixed_time())  # Täglichen Task starten
+    daily_task = asyncio.create_task(update_events_daily_at_fixed_time())  # Täglichen Task starten
+    crawler_task = asyncio.create_task(crawl_warehouse_periodically())  # Warehouse im Hintergrund füllen
 
     yield  # App wird gestartet
 
-    # Bereinigung beim Shutdown (falls erforderlich)
+    # Bereinigung beim Shutdown
     logger.info("Anwendung wird heruntergefahren...")
+    daily_task.cancel()
+    crawler_task.cancel()
+    await liveheats_session.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+# Pfad zur Python-Umgebung
+python_executable = os.path.join(os.getcwd(), "venv", "bin", "python")
+
+app.mount("/index", StaticFiles(directory="frontend", html=True), name="static")
+
+# CORS Middleware hinzufügen
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["https://report.open-faces.com"],  # Nur deine Domain erlauben
+    allow_methods=["GET", "POST"],  # Erlaube nur notwendige HTTP-Methoden
+    allow_headers=["Content-Type", "Authorization"],  # Nur notwendige Header erlauben
+)
 
 @app.get("/events")
 async def get_events():
@@ -90,17 +119,28 @@ async def get_events():
     return {"events": event_cache["data"]}
 
 @app.get("/generate_pdf")
-async def generate_pdf(event_id: str):
-    """Generiert ein PDF für ein ausgewähltes Event."""
+async def generate_pdf(event_id: str, seasons: Optional[int] = Query(None, ge=0)):
+    """Generiert ein PDF für ein ausgewähltes Event.
+
+    ``seasons`` begrenzt den Report auf die letzten N Saisons (0 = alle).
+    Jeder Report läuft in einem eigenen Prozess; In-Memory-Caches (z.B.
+    Athleten-Profile) werden daher nicht zwischen Anfragen geteilt, nur die
+    Caches auf der Platte (Responses, Season-Store, Warehouse, Bilder).
+    """
     try:
         logger.info(f"Starte PDF-Generierung für Event-ID: {event_id}")
         script_path = os.path.join(os.path.dirname(__file__), "generate_rankings_web.py")
 
+        command = [python_executable, script_path, event_id]
+        if seasons is not None:
+            command += ["--seasons", str(seasons)]
+
+        # Explizit gesetztes FWT_RANKINGS_RENDER_WORKERS hat Vorrang
+        env = dict(os.environ)
+        env.setdefault(RENDER_WORKERS_ENV, str(WEB_RENDER_WORKERS))
+
         os.makedirs("reports", exist_ok=True)
-        subprocess.run(
-            [python_executable, script_path, event_id],
-            check=True
-        )
+        subprocess.run(command, check=True, env=env)
 
         # PDF-Datei suchen
         output_dir = "reports"
@@ -0,0 +1,79 @@
+"""Offline benchmark of the rankings fetch pipeline.
+
+Record once against Liveheats, then replay without network access:
+
+    python examples/benchmark_replay.py record <event_id> cassette.json
+    python examples/benchmark_replay.py replay <event_id> cassette.json [latency_s] [error_rate]
+
+Response cache and warehouse are disabled so every run issues the same requests. After the
+fetch, the results are processed and rendered to a temporary PDF so all three
+stages are timed. Athlete photos are not part of the cassette: the first run
+downloads them, later runs read them from the on-disk image cache.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ["FWT_RANKINGS_CACHE"] = "0"
+os.environ["FWT_RANKINGS_WAREHOUSE"] = "0"
+
+from fwt_rankings.api import session as liveheats_session
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient
+from fwt_rankings.api.transport import (
+    ErrorProfile, LatencyProfile, RecordingTransport, ReplayTransport
+)
+from fwt_rankings.data.processors import RankingsProcessor
+from fwt_rankings.pdf.generator import RankingsReportGenerator
+
+
+async def run(mode: str, event_id: str, cassette: str, latency: float, error_rate: float):
+    if mode == "record":
+        transport = RecordingTransport(cassette)
+    else:
+        transport = ReplayTransport(
+            cassette,
+            latency=LatencyProfile(base=latency, jitter=latency / 2),
+            errors=ErrorProfile(rate=error_rate, status=429, retry_after=0.1),
+            seed=42,
+        )
+    client = LiveheatsClient(graphql_client=GraphQLClient(transport=transport))
+
+    started = time.perf_counter()
+    try:
+        await client.get_event_athletes(event_id)
+        entries = client.event_entries[str(event_id)]
+        athlete_ids = list(entries)
+        bib_mapping = {athlete_id: entry["bib"] for athlete_id, entry in entries.items() if entry.get("bib")}
+        series_ids = await client.get_fwt_series()
+        results = await client.fetch_multiple_series(series_ids, athlete_ids)
+    finally:
+        await client.client.close()
+        await liveheats_session.shutdown()
+    fetched = time.perf_counter()
+
+    rankings_data = RankingsProcessor().process_rankings({"results": results}, bib_mapping)
+    processed = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        RankingsReportGenerator().generate_report(rankings_data, os.path.join(output_dir, "benchmark.pdf"))
+    rendered = time.perf_counter()
+
+    print(f"{mode}: {len(results)} Series für {len(athlete_ids)} Athleten in {fetched - started:.2f}s geladen")
+    print(f"Verarbeitung: {len(rankings_data)} Athleten in {processed - fetched:.2f}s")
+    print(f"PDF: {rendered - processed:.2f}s, gesamt {rendered - started:.2f}s")
+    print(f"Client: {client.client.stats()}")
+    if isinstance(transport, ReplayTransport):
+        print(f"Transport: {transport.stats()}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] not in ("record", "replay"):
+        print(__doc__)
+        sys.exit(1)
+    asyncio.run(run(
+        sys.argv[1], sys.argv[2], sys.argv[3],
+        float(sys.argv[4]) if len(sys.argv) > 4 else 0.0,
+        float(sys.argv[5]) if len(sys.argv) > 5 else 0.0,
+    ))
@@ -0,0 +1,180 @@
+import asyncio
+from typing import AbstractSet, Dict, List, Optional, Tuple
+from ..utils.logging import get_logger
+from .queries import GraphQLQueries
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_WINDOW = 0.02
+DEFAULT_MAX_BATCH_SIZE = 25
+DEFAULT_MAX_QUERY_COST = 400
+
+# (series_id, division_id, Query-Profil)
+RankingKey = Tuple[str, str, str]
+
+
+class RankingsBatcher:
+    """Collect series/division ranking lookups and send them as aliased batch queries.
+
+    ``load`` returns the same shape as a single rankings request of the
+    same profile (``{"series": {"rankings": [...]}}``), so callers don't
+    need to know whether their lookup was batched. Lean and full lookups
+    are never mixed in one document.
+    """
+
+    def __init__(self, client,
+                 window: float = DEFAULT_BATCH_WINDOW,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_query_cost: int = DEFAULT_MAX_QUERY_COST):
+        self.client = client
+        self.queries = GraphQLQueries()
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.max_query_cost = max_query_cost
+        self._pending: Dict[RankingKey, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batch_tasks = set()
+        self._seasons: Dict[RankingKey, Optional[int]] = {}
+        self._filters: Dict[RankingKey, Optional[AbstractSet[str]]] = {}
+        self.stats = {"lookups": 0, "batches": 0, "fallbacks": 0}
+
+    def batch_limit(self, profile: str = "full") -> int:
+        """Number of lookups per document allowed by batch size and query cost."""
+        lookup_cost = self.queries.ranking_lookup_cost(profile)
+        by_cost = max(1, self.max_query_cost // max(lookup_cost, 1))
+        return max(1, min(self.max_batch_size, by_cost))
+
+    async def load(self, series_id: str, division_id: str, season: Optional[int] = None,
+                   row_filter: Optional[AbstractSet[str]] = None, profile: str = "full") -> Optional[Dict]:
+        """Queue a rankings lookup and wait for its batched result.
+
+        Lookups are cached individually under their single-query key, so
+        batched and unbatched requests share cache entries. ``row_filter``
+        limits the rows to these athletes where the client supports it; a
+        batch uses the union of its lookups' filters.
+        """
+        key = (str(series_id), str(division_id), profile)
+        self.stats["lookups"] += 1
+
+        cached = self.client.cache_lookup(self.queries.series_rankings_query(profile), self._variables(key))
+        if cached is not None:
+            return cached
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            self._seasons[key] = season
+            self._filters[key] = row_filter
+        elif self._filters.get(key) is not None:
+            # Gleiche Division mit anderem Filter: Vereinigung, bzw. ungefiltert
+            self._filters[key] = self._filters[key] | row_filter if row_filter is not None else None
+
+        if len(self._pending) >= self.batch_limit(profile):
+            self._flush_now()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+        # shield: ein abgebrochener Aufrufer soll den Batch der anderen nicht abbrechen
+        return await asyncio.shield(future)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._flush_now()
+
+    def _flush_now(self):
+        pending, self._pending = self._pending, {}
+        seasons, self._seasons = self._seasons, {}
+        filters, self._filters = self._filters, {}
+        by_profile: Dict[str, List[Tuple[RankingKey, asyncio.Future]]] = {}
+        for key, future in pending.items():
+            by_profile.setdefault(key[2], []).append((key, future))
+        for profile, items in by_profile.items():
+            limit = self.batch_limit(profile)
+            for start in range(0, len(items), limit):
+                task = asyncio.ensure_future(
+                    self._run_batch(items[start:start + limit], profile, seasons, filters)
+                )
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, items: List[Tuple[RankingKey, asyncio.Future]], profile: str,
+                         seasons: Dict[RankingKey, Optional[int]],
+                         filters: Dict[RankingKey, Optional[AbstractSet[str]]]):
+        try:
+            if len(items) == 1:
+                key, future = items[0]
+                result = await self._fetch_single(key, seasons.get(key), filters.get(key))
+                self._resolve(future, result)
+                return
+
+            variables = {}
+            for i, ((series_id, division_id, _), _) in enumerate(items):
+                variables[f"s{i}"] = series_id
+                variables[f"d{i}"] = division_id
+
+            self.stats["batches"] += 1
+            logger.debug(f"Sende Rankings-Batch mit {len(items)} Abfragen")
+            row_filter = self._union_filter(filters.get(key) for key, _ in items)
+            data = await self.client.execute(
+                self.queries.build_batched_rankings_query(len(items), profile),
+                variables,
+                row_filter=row_filter
+            )
+            # Gefilterte Tabellen sind unvollständig und dürfen nicht als Einzelabfrage gecacht werden
+            cacheable = row_filter is None or not self.client.supports_row_filter
+
+            if data is None:
+                # Ein fehlerhafter Eintrag soll nicht den ganzen Batch verlieren
+                logger.warning(f"Batch mit {len(items)} Abfragen fehlgeschlagen, frage einzeln ab")
+                self.stats["fallbacks"] += 1
+                results = await asyncio.gather(*[
+                    self._fetch_single(key, seasons.get(key), filters.get(key))
+                    for key, _ in items
+                ])
+                for (_, future), result in zip(items, results):
+                    self._resolve(future, result)
+                return
+
+            for i, (key, future) in enumerate(items):
+                series_data = data.get(f"s{i}")
+                result = {"series": series_data} if series_data is not None else None
+                if cacheable:
+                    self.client.cache_store(self.queries.series_rankings_query(profile), self._variables(key),
+                                            result, seasons.get(key))
+                self._resolve(future, result)
+
+        except Exception as e:
+            logger.error(f"Fehler im Rankings-Batch: {str(e)}")
+            for _, future in items:
+                self._resolve(future, None)
+
+    async def _fetch_single(self, key: RankingKey, season: Optional[int] = None,
+                            row_filter: Optional[AbstractSet[str]] = None) -> Optional[Dict]:
+        return await self.client.execute(
+            self.queries.series_rankings_query(key[2]),
+            self._variables(key),
+            season=season,
+            row_filter=row_filter
+        )
+
+    @staticmethod
+    def _union_filter(filters) -> Optional[AbstractSet[str]]:
+        """Athletes wanted by any lookup of a batch, or None if one lookup needs all rows."""
+        filters = list(filters)
+        if any(row_filter is None for row_filter in filters):
+            return None
+        # Im Normalfall teilen alle Abfragen eines Reports dieselbe Startliste
+        if all(row_filter is filters[0] for row_filter in filters):
+            return filters[0]
+        return frozenset().union(*filters)
+
+    @staticmethod
+    def _variables(key: RankingKey) -> Dict[str, str]:
+        series_id, division_id, _ = key
+        return {"id": series_id, "divisionId": division_id}
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Optional[Dict]):
+        if not future.done():
+            future.set_result(result)
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Optional
+from ..utils.logging import get_logger
+from ..utils.paths import get_cache_dir
+
+logger = get_logger(__name__)
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+CACHE_ENABLED_ENV = "FWT_RANKINGS_CACHE"
+
+# TTL pro GraphQL-Operation in Sekunden; None = kein Ablauf, 0 = nicht cachen
+DEFAULT_TTLS = {
+    "getFWTGlobalSeries": 6 * HOUR,
+    "GetOrganisationSeries": 6 * HOUR,
+    "GetDivisions": 6 * HOUR,
+    "GetEventsBySeries": 1 * HOUR,
+    "event": 10 * MINUTE,
+    "GetOrganisationEvents": 1 * HOUR,
+    "GetSeriesRankings": 10 * MINUTE,
+    "GetSeriesRankingsLean": 10 * MINUTE,
+    "GetAthleteHistory": 1 * HOUR,
+    # Batches werden pro Einzelabfrage gecacht, nicht als ganzes Dokument
+    "GetBatchedSeriesRankings": 0,
+    "GetBatchedSeriesRankingsLean": 0,
+    "GetBatchedAthleteHistory": 0,
+    # Profile und Event-Namen landen im Athleten-Cache bzw. in der Series
+    "GetBatchedAthleteProfiles": 0,
+    "GetBatchedEvents": 0,
+}
+DEFAULT_TTL = 10 * MINUTE
+PAST_SEASON_TTL = None
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting changes don't change the cache key."""
+    return re.sub(r'\s+', ' ', query).strip()
+
+
+def operation_name(query: str) -> str:
+    """Return the operation name of a GraphQL document (``""`` if anonymous)."""
+    match = re.search(r'\b(?:query|mutation)\s+(\w+)', query)
+    return match.group(1) if match else ""
+
+
+def request_key(query: str, variables: Optional[Dict[str, Any]] = None, namespace: str = "") -> str:
+    """Stable key for a request built from normalized query text and variables.
+
+    ``namespace`` separates endpoints (see ``api_namespace``); Liveheats itself uses ``""``.
+    """
+    request = {"query": normalize_query(query), "variables": variables or {}}
+    if namespace:
+        request["namespace"] = namespace
+    payload = json.dumps(request, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CachePolicy:
+    """Per-operation TTLs, with past seasons kept indefinitely."""
+
+    def __init__(self, ttls: Optional[Dict[str, Optional[float]]] = None,
+                 default_ttl: Optional[float] = DEFAULT_TTL,
+                 past_season_ttl: Optional[float] = PAST_SEASON_TTL):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.past_season_ttl = past_season_ttl
+
+    def ttl_for(self, operation: str, season: Optional[int] = None) -> Optional[float]:
+        if season is not None and season < datetime.now().year:
+            return self.past_season_ttl
+        return self.ttls.get(operation, self.default_ttl)
+
+
+class ResponseCache:
+    """SQLite-backed cache of GraphQL responses with compressed payloads and LRU eviction."""
+
+    def __init__(self, path: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 policy: Optional[CachePolicy] = None):
+        self.path = str(path or get_cache_dir() / "liveheats.sqlite")
+        self.max_bytes = max_bytes
+        self.policy = policy or CachePolicy()
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                operation TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                expires REAL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached data for ``key`` or None on miss/expiry."""
+        row = self._conn.execute(
+            "SELECT payload, expires FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None:
+            self.counters["misses"] += 1
+            return None
+
+        payload, expires = row
+        if expires is not None and expires <= now:
+            self.counters["expired"] += 1
+            self.counters["misses"] += 1
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+
+        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        self.counters["hits"] += 1
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def set(self, key: str, operation: str, data: Any, ttl: Optional[float]):
+        """Store ``data``; ``ttl`` None keeps it until evicted, 0 skips caching."""
+        if ttl == 0:
+            return
+        payload = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, operation, payload, size, created, expires, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, operation, payload, len(payload), now, expires, now)
+        )
+        self._conn.commit()
+        self.counters["stores"] += 1
+        self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Zuerst abgelaufene Einträge, dann die am längsten nicht genutzten
+        now = time.time()
+        cursor = self._conn.execute(
+            "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (now,)
+        )
+        self.counters["evictions"] += cursor.rowcount
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.counters["evictions"] += 1
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters plus entry count and stored bytes."""
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        self._conn.close()
+
+
+_default_cache: Optional[ResponseCache] = None
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """Return the shared on-disk cache, or None if disabled via FWT_RANKINGS_CACHE=0."""
+    global _default_cache
+    if os.environ.get(CACHE_ENABLED_ENV, "1").lower() in ("0", "false", "off", "no"):
+        return None
+    if _default_cache is None:
+        try:
+            _default_cache = ResponseCache()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Response-Cache nicht verfügbar: {e}")
+            return None
+    return _default_cache
@@ -1,9 +1,21 @@
 import aiohttp
 import asyncio
 import re
-from typing import Dict, Optional, Any, List
+from typing import AbstractSet, Dict, Optional, Any, List, Set
 from ..utils.logging import get_logger
-from .queries import GraphQLQueries
+from ..utils.paths import API_URL_ENV, DEFAULT_API_URL, api_namespace, api_url
+from .queries import ATHLETE_HISTORY_LIMIT, GraphQLQueries
+from .batching import RankingsBatcher
+from .singleflight import SingleFlight, get_default_single_flight
+from .cache import ResponseCache, get_default_cache, operation_name, request_key
+from .sync import SeasonSync, get_default_sync, is_series_finished
+from .entities import AthleteCache, get_default_athlete_cache
+from .session import SessionManager, get_session_manager
+from .transport import CassetteMiss, Transport, AiohttpTransport, transport_from_env
+from .streaming import decode_filtered, filter_digest
+from .scheduler import RequestScheduler, RETRYABLE_STATUS, get_default_scheduler, parse_retry_after
+from ..data.processors import RankingsProcessor
+from ..data.series_policy import SeriesPolicy, get_default_series_policy
 from datetime import datetime, timezone, timedelta
 import os
 print(f"Lade Client.py von: {os.path.abspath(__file__)}")
@@ -11,62 +23,305 @@ print(f"Lade Client.py von: {os.path.abspath(__file__)}")
 
 logger = get_logger(__name__)
 
+# Maximale Anzahl gleichzeitiger Rankings-Abfragen über alle Series hinweg; gilt nur ohne Batching,
+# mit Batching begrenzt der RequestScheduler die gleichzeitigen HTTP-Requests (in_flight_limit)
+DEFAULT_MAX_CONCURRENT_DIVISIONS = 16
+
+# Gleichzeitige Event-Abfragen und Timeout pro Series beim Aktualisieren der Event-Liste
+DEFAULT_MAX_CONCURRENT_SERIES = 8
+SERIES_EVENTS_TIMEOUT = 15.0
+
+# Athleten pro Alias-Batch bei der Historien-Abfrage
+ATHLETE_HISTORY_BATCH_SIZE = 25
+# Athleten-Modus lohnt sich, solange die Startliste klein gegenüber der Anzahl Series ist
+ATHLETE_STRATEGY_RATIO = 2.0
+
+FETCH_STRATEGIES = ("auto", "series", "athlete")
+
+# Anzahl zurückliegender Saisons (inkl. der aktuellen) für Reports; 0 oder leer = alle
+HISTORY_SEASONS_ENV = "FWT_RANKINGS_SEASONS"
+
+# Feldprofil der Report-Rankings: "lean" lädt Profile und Event-Namen einmal separat, "full" alles pro Zeile
+QUERY_PROFILE_ENV = "FWT_RANKINGS_QUERY_PROFILE"
+DEFAULT_QUERY_PROFILE = "lean"
+
+
+def default_history_seasons() -> int:
+    """History depth configured via FWT_RANKINGS_SEASONS (0 = all seasons)."""
+    value = os.environ.get(HISTORY_SEASONS_ENV, "").strip()
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        logger.warning(f"Ungültiger Wert für {HISTORY_SEASONS_ENV}: {value!r}, verwende alle Saisons")
+        return 0
+
+
+def default_query_profile() -> str:
+    profile = os.environ.get(QUERY_PROFILE_ENV, "").strip().lower()
+    return profile if profile in GraphQLQueries.RANKING_PROFILES else DEFAULT_QUERY_PROFILE
+
+
+def first_season_year(seasons: int) -> Optional[int]:
+    """First year inside a window of the last ``seasons`` seasons, or None for no limit."""
+    if not seasons or seasons <= 0:
+        return None
+    return datetime.now().year - seasons + 1
+
+
+def choose_fetch_strategy(athlete_count: int, series_count: int) -> str:
+    """Pick the cheaper rankings fetch strategy for a start list.
+
+    The athlete strategy costs one small history lookup per athlete
+    (batched) and then only fetches series the start list appears in; the
+    series strategy downloads every ranking table of every series.
+    """
+    if athlete_count == 0 or series_count == 0:
+        return "series"
+    return "athlete" if athlete_count <= ATHLETE_STRATEGY_RATIO * series_count else "series"
+
+def filter_upcoming_events(events: List[Dict], grace_days: int = 5) -> List[Dict]:
+    """Deduplicate events by id, keep those not older than ``grace_days`` and sort them by date."""
+    grace_period = datetime.now(timezone.utc) - timedelta(days=grace_days)
+    unique_events = {}
+    for event in events:
+        if datetime.fromisoformat(event["date"].replace("Z", "+00:00")) >= grace_period:
+            # Deduplizieren basierend auf der Event-ID
+            unique_events[event["id"]] = event
+    # Stabil nach Datum sortieren, unabhängig von der Ankunftsreihenfolge
+    return sorted(unique_events.values(), key=lambda event: (event["date"], event["id"]))
+
+
+def filter_series_by_years(series: List[Dict], years: range) -> List[Dict]:
+    """Keep series whose name contains a year (2024–2029) within ``years``."""
+    filtered_series = []
+    for s in series:
+        match = re.search(r'\b(202[4-9])\b', s["name"])
+        if match and int(match.group(1)) in years:
+            filtered_series.append(s)
+    return filtered_series
+
+
 class GraphQLClient:
     """Base GraphQL client for Liveheats API interactions."""
     
-    def __init__(self, base_url: str = "https://liveheats.com/api/graphql"):
-        self.base_url = base_url
-        self._session: Optional[aiohttp.ClientSession] = None
+    def __init__(self, base_url: Optional[str] = None,
+                 session_manager: Optional[SessionManager] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 cache: Optional[ResponseCache] = None,
+                 use_cache: bool = True,
+                 single_flight: Optional[SingleFlight] = None,
+                 transport: Optional[Transport] = None,
+                 stream_rows: bool = True):
+        self.base_url = api_url(base_url)
+        # Cache- und Single-Flight-Schlüssel anderer Endpunkte (z.B. Testserver) getrennt halten
+        self.namespace = api_namespace(self.base_url)
+        self.session_manager = session_manager or get_session_manager()
+        # Live-Netzwerk oder Aufzeichnung/Wiedergabe (FWT_RANKINGS_TRANSPORT)
+        if transport is None:
+            transport = AiohttpTransport(session_manager) if session_manager else transport_from_env()
+        self.transport = transport
+        self.scheduler = scheduler or get_default_scheduler()
+        self.cache = cache if cache is not None else (get_default_cache() if use_cache else None)
+        self.single_flight = single_flight or get_default_single_flight()
+        # Rankings-Zeilen beim Lesen filtern; gefilterte Antworten landen nicht im Cache
+        self.stream_rows = stream_rows
+        self._opened = False
+        self.stream_stats = {"streamed": 0, "rows_seen": 0, "rows_kept": 0}
         
     async def __aenter__(self):
-        self._session = aiohttp.ClientSession()
+        # Gemeinsame Session aus dem Pool, Verbindungen bleiben über Aufrufe hinweg offen
+        await self.transport.open()
+        self._opened = True
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._session:
-            await self._session.close()
+        # Die Session gehört dem SessionManager und wird erst beim Shutdown geschlossen
+        pass
+
+    async def close(self):
+        """Release the transport, e.g. write a recorded cassette to disk."""
+        await self.transport.close()
+            
+    def stats(self) -> Dict[str, Any]:
+        """Return request scheduler and coalescing counters for tuning."""
+        return {
+            **self.scheduler.stats(),
+            "coalesced": self.single_flight.counters["coalesced"],
+            **self.stream_stats,
+        }
             
-    async def execute(self, query: str, variables: Dict[str, Any] = None) -> Dict:
-        """Execute a GraphQL query."""
-        if not self._session:
+    def cache_lookup(self, query: str, variables: Dict[str, Any] = None) -> Optional[Dict]:
+        """Return a cached response for this request, if any."""
+        if self.cache is None or self.cache.policy.ttl_for(operation_name(query)) == 0:
+            return None
+        return self.cache.get(request_key(query, variables, self.namespace))
+
+    def cache_store(self, query: str, variables: Dict[str, Any], data: Dict, season: Optional[int] = None):
+        """Store a response using the TTL policy of its operation (and season)."""
+        if self.cache is None or data is None:
+            return
+        operation = operation_name(query)
+        ttl = self.cache.policy.ttl_for(operation, season)
+        self.cache.set(request_key(query, variables, self.namespace), operation, data, ttl)
+
+    @property
+    def supports_row_filter(self) -> bool:
+        """Whether ``row_filter`` is honoured; filtered responses bypass the response cache."""
+        return self.stream_rows
+
+    async def execute(self, query: str, variables: Dict[str, Any] = None, season: Optional[int] = None,
+                      row_filter: Optional[AbstractSet[str]] = None) -> Dict:
+        """Execute a GraphQL query, served from the response cache when possible.
+
+        ``season`` is the year of the series the request belongs to; finished
+        seasons are cached without expiry. With ``row_filter`` ranking rows
+        of uncached requests are decoded while streaming and only rows of
+        those athletes are returned; such partial responses are not cached.
+        """
+        if not self._opened:
             raise RuntimeError("Client not initialized. Use 'async with' context manager.")
             
-        try:
-            logger.debug(f"Sende Anfrage: {variables}")
-            async with self._session.post(
-                self.base_url,
-                json={
-                    "query": query,
-                    "variables": variables or {}
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.error(f"HTTP Error {response.status} für Variables: {variables}")
-                    response_text = await response.text()
-                    logger.error(f"Response: {response_text}")
-                    return None
-                    
-                data = await response.json()
-                if "errors" in data:
-                    logger.error(f"GraphQL Error: {data['errors']}")
-                    return None
-                    
-                return data.get("data")
+        cached = self.cache_lookup(query, variables)
+        if cached is not None:
+            return cached
+            
+        key = request_key(query, variables, self.namespace)
+        if row_filter is not None and self.supports_row_filter:
+            key = f"{key}:{filter_digest(row_filter)}"
+        else:
+            row_filter = None
+            
+        # Gleichzeitige identische Anfragen teilen sich einen Upstream-Request
+        return await self.single_flight.do(
+            key,
+            lambda: self._send_and_store(query, variables, season, row_filter)
+        )
+        
+    async def _send_and_store(self, query: str, variables: Dict[str, Any], season: Optional[int],
+                              row_filter: Optional[AbstractSet[str]] = None) -> Optional[Dict]:
+        data = await self._send(query, variables, row_filter)
+        if row_filter is None:
+            self.cache_store(query, variables, data, season)
+        return data
+        
+    async def _decode(self, response, row_filter: Optional[AbstractSet[str]]) -> Dict:
+        if row_filter is None:
+            return await response.json()
+        # Rankings-Zeilen einzeln dekodieren und nur die gesuchten Athleten behalten
+        decoded = await decode_filtered(response, row_filter)
+        self.stream_stats["streamed"] += 1
+        self.stream_stats["rows_seen"] += decoded.rows_seen
+        self.stream_stats["rows_kept"] += decoded.rows_kept
+        return decoded.close()
+        
+    async def _send(self, query: str, variables: Dict[str, Any] = None,
+                    row_filter: Optional[AbstractSet[str]] = None) -> Optional[Dict]:
+        """Send one request through the scheduler, retrying when throttled."""
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                logger.debug(f"Sende Anfrage: {variables}")
+                async with self.scheduler.slot():
+                    async with self.transport.post(
+                        self.base_url,
+                        {
+                            "query": query,
+                            "variables": variables or {}
+                        }
+                    ) as response:
+                        if response.status in RETRYABLE_STATUS:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                            self.scheduler.record_throttled(response.status, retry_after)
+                            logger.warning(f"HTTP {response.status} für Variables: {variables} (Versuch {attempt})")
+                        elif response.status != 200:
+                            logger.error(f"HTTP Error {response.status} für Variables: {variables}")
+                            response_text = await response.text()
+                            logger.error(f"Response: {response_text}")
+                            self.scheduler.record_failure()
+                            return None
+                        else:
+                            data = await self._decode(response, row_filter)
+                            self.scheduler.record_success()
+                            if "errors" in data:
+                                logger.error(f"GraphQL Error: {data['errors']}")
+                                return None
+                                
+                            return data.get("data")
+                            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.scheduler.record_throttled(None)
+                logger.warning(f"Request fehlgeschlagen: {str(e)} (Versuch {attempt})")
+            except CassetteMiss:
+                # Eine unvollständige Aufzeichnung soll den Benchmark abbrechen, nicht verfälschen
+                raise
+            except Exception as e:
+                logger.error(f"Request failed: {str(e)}")
+                self.scheduler.record_failure()
+                return None
                 
-        except Exception as e:
-            logger.error(f"Request failed: {str(e)}")
-            return None
+            if not self.scheduler.should_retry(attempt):
+                logger.error(f"Gebe auf nach {attempt} Versuchen für Variables: {variables}")
+                self.scheduler.record_failure()
+                return None
+            await asyncio.sleep(self.scheduler.backoff_delay(attempt, retry_after))
         
 class LiveheatsClient:
-    """Specialized client for Liveheats API operations."""
+    """Specialized client for Liveheats API operations.
+
+    ``max_concurrent_divisions`` bounds concurrent single rankings requests
+    and only applies with ``use_batching=False``. Batched lookups are queued
+    without limit and sent as few alias documents; their concurrency is
+    bounded per HTTP request by the shared :class:`RequestScheduler`.
+    """
     
-    def __init__(self):
-        self.client = GraphQLClient()
+    def __init__(self, max_concurrent_divisions: int = DEFAULT_MAX_CONCURRENT_DIVISIONS,
+                 use_batching: bool = True,
+                 max_concurrent_series: int = DEFAULT_MAX_CONCURRENT_SERIES,
+                 sync: Optional[SeasonSync] = None,
+                 use_sync: bool = True,
+                 graphql_client: Optional[GraphQLClient] = None,
+                 athlete_cache: Optional[AthleteCache] = None,
+                 series_policy: Optional[SeriesPolicy] = None,
+                 history_seasons: Optional[int] = None,
+                 query_profile: Optional[str] = None):
+        self.client = graphql_client or GraphQLClient()
+        # Lokaler Store für abgeschlossene Series, nur aktive Saisons werden neu geladen
+        self.sync = sync if sync is not None else (get_default_sync() if use_sync else None)
         self.queries = GraphQLQueries()
-        self.athlete_details = {}  # Cache für Athleten-Details
+        # Rankings-Abfragen werden zu Alias-Batches zusammengefasst
+        self.batcher = RankingsBatcher(self.client) if use_batching else None
+        # Athleten-Profile werden über Clients und Events hinweg geteilt
+        self.athletes = athlete_cache or get_default_athlete_cache()
+        # Event-bezogene Startlisten-Daten: event_id -> athlete_id -> {"bib", "status", "division"}
+        self.event_entries: Dict[str, Dict[str, Dict]] = {}
+        # Ausgeschlossene Series (Seeding Lists, National Rankings) werden gar nicht erst geladen
+        self.series_policy = series_policy or get_default_series_policy()
+        self.history_seasons = default_history_seasons() if history_seasons is None else history_seasons
+        # Report-Abfragen mit "lean" holen Athleten-Profile und Event-Namen nur einmal statt pro Zeile
+        self.query_profile = query_profile or default_query_profile()
+        self.queries.ranking_fields(self.query_profile)
+        # Event-ID -> {"name", "date"} für schlanke Rankings-Zeilen
+        self.event_details: Dict[str, Dict] = {}
+        # Ergebnis der letzten Saison-Beschneidung in get_fwt_series
+        self.pruning_stats = {"pruned_series": 0, "avoided_lookups": 0, "avoided_requests": 0}
+        # Nur ohne Batcher wirksam, siehe _fetch_division_rankings
+        self.max_concurrent_divisions = max_concurrent_divisions
+        self.max_concurrent_series = max_concurrent_series
+        self._division_slots: Optional[asyncio.Semaphore] = None
+        self._division_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_division_slots(self) -> asyncio.Semaphore:
+        """Return the semaphore bounding unbatched division fetches across all series."""
+        loop = asyncio.get_running_loop()
+        if self._division_slots is None or self._division_slots_loop is not loop:
+            self._division_slots = asyncio.Semaphore(self.max_concurrent_divisions)
+            self._division_slots_loop = loop
+        return self._division_slots
         
     async def get_event_athletes(self, event_id: str) -> Dict:
-        """Fetch athletes for a specific event and cache their details."""
+        """Fetch athletes for a specific event, caching profiles and the event's entries."""
         async with self.client as client:
             result = await client.execute(
                 self.queries.GET_EVENT_ATHLETES,
@@ -77,25 +332,31 @@ class LiveheatsClient:
                 logger.error(f"Keine Event-Daten gefunden für ID: {event_id}")
                 return None
 
-            # Cache athlete details from event
+            # Profile in den geteilten Cache, BIB und Status nur für dieses Event merken
+            entries = {}
             for division in result["event"]["eventDivisions"]:
                 for entry in division["entries"]:
                     if entry["status"] in ["confirmed", "waitlisted"]:
                         athlete = entry["athlete"]
-                        athlete_id = athlete["id"]
-                        # Erweitere Athleten-Details um BIB und Status
-                        self.athlete_details[athlete_id] = {
-                            **athlete,
+                        self.athletes.put(athlete)
+                        entries[athlete["id"]] = {
                             "bib": entry.get("bib"),
-                            "status": entry["status"]
+                            "status": entry["status"],
+                            "division": division["division"]["name"],
                         }
-                        logger.debug(f"Cached athlete details: {athlete['name']} (ID: {athlete_id})")
+                        logger.debug(f"Cached athlete details: {athlete['name']} (ID: {athlete['id']})")
+            self.event_entries[str(event_id)] = entries
             
-            logger.info(f"Cached details for {len(self.athlete_details)} athletes")
+            logger.info(f"Cached details for {len(entries)} athletes")
             return result
         
-    async def get_fwt_series(self, organisation_short_name: str = "fwtglobal") -> List[str]:
-        """Fetch all FWT series IDs from Liveheats."""
+    async def get_fwt_series(self, organisation_short_name: str = "fwtglobal",
+                             seasons: Optional[int] = None) -> List[str]:
+        """Fetch the IDs of all FWT series with rankings that the series policy includes.
+
+        Only series of the last ``seasons`` seasons are returned (default:
+        ``history_seasons``; 0 = all), judged by the year in the series name.
+        """
         async with self.client as client:
             result = await client.execute(
                 self.queries.GET_FWT_SERIES,
@@ -114,17 +375,80 @@ class LiveheatsClient:
                 if series.get("rankingsDivisions") and len(series["rankingsDivisions"]) > 0
             ]
             
+            relevant_series, excluded = self.series_policy.classify(relevant_series)
+            if excluded:
+                logger.info(f"{len(excluded)} Series ausgeschlossen (z.B. {excluded[0]['name']})")
+            
+            first_year = first_season_year(self.history_seasons if seasons is None else seasons)
+            self.pruning_stats = {"pruned_series": 0, "avoided_lookups": 0, "avoided_requests": 0}
+            if first_year is not None:
+                pruned = [
+                    series for series in relevant_series
+                    if RankingsProcessor.extract_year_from_series(series["name"]) < first_year
+                ]
+                relevant_series = [series for series in relevant_series if series not in pruned]
+                # Pro Series entfallen die Divisions-Abfrage und ein Rankings-Lookup je Division
+                division_lookups = sum(len(series["rankingsDivisions"]) for series in pruned)
+                avoided_lookups = len(pruned) + division_lookups
+                avoided_requests = avoided_lookups
+                if self.batcher is not None:
+                    # Mit Batching entfallen nur ganze Rankings-Batches (Schätzung über die Batch-Größe)
+                    batch_limit = self.batcher.batch_limit(self.query_profile)
+                    avoided_requests = len(pruned) + -(-division_lookups // batch_limit)
+                self.pruning_stats = {
+                    "pruned_series": len(pruned),
+                    "avoided_lookups": avoided_lookups,
+                    "avoided_requests": avoided_requests,
+                }
+                logger.info(
+                    f"Saisons ab {first_year}: {len(pruned)} ältere Series übersprungen, "
+                    f"{avoided_lookups} Lookups in ca. {avoided_requests} Requests eingespart"
+                )
+            
             return [series["id"] for series in relevant_series]
         
-    async def fetch_multiple_series(self, series_ids: List[str], athlete_ids: List[str]) -> list:
-        """Fetch rankings data for multiple series and create uniform data structure for all athletes."""
+    async def fetch_multiple_series(self, series_ids: List[str], athlete_ids: List[str],
+                                    strategy: str = "auto") -> list:
+        """Fetch rankings data for multiple series and create uniform data structure for all athletes.
+
+        ``strategy`` is ``"series"`` (scan every ranking table), ``"athlete"``
+        (resolve the start list's history first and only fetch series they
+        appear in) or ``"auto"`` to pick the cheaper one.
+        """
+        if strategy not in FETCH_STRATEGIES:
+            raise ValueError(f"Unbekannte Strategie: {strategy}")
+            
         async with self.client as client:
             # Track processed athletes
             processed_athletes = set()
+            # Startliste einmal hashen, der Join pro Ranking-Zeile ist dann ein Set-Lookup
+            wanted = frozenset(athlete_ids)
+            
+            if strategy == "auto":
+                strategy = choose_fetch_strategy(len(athlete_ids), len(series_ids))
+            logger.info(f"Rankings-Strategie: {strategy} ({len(athlete_ids)} Athleten, {len(series_ids)} Series)")
+            
+            division_filter: Dict[str, Set[str]] = {}
+            if strategy == "athlete":
+                history = await self._resolve_athlete_series(client, athlete_ids)
+                if history is None:
+                    logger.warning("Athleten-Historie unvollständig, lade alle Series")
+                else:
+                    division_filter = history
+                    relevant_ids = [s for s in series_ids if str(s) in history]
+                    logger.info(
+                        f"Athleten-Modus: {len(relevant_ids)} von {len(series_ids)} Series relevant, "
+                        f"{len(series_ids) - len(relevant_ids)} übersprungen"
+                    )
+                    series_ids = relevant_ids
+            
+            if self.query_profile == "lean":
+                # Schlanke Zeilen enthalten nur die Athleten-ID, Profile fehlender Athleten einmal vorab laden
+                await self._ensure_athlete_profiles(client, wanted)
             
             # Create tasks for all series
             tasks = [
-                self._process_series(client, series_id, athlete_ids)
+                self._process_series(client, series_id, wanted, division_filter.get(str(series_id)))
                 for series_id in series_ids
             ]
             
@@ -142,53 +466,27 @@ class LiveheatsClient:
                             processed_athletes.add(ranking['athlete']['id'])
             
             # Find athletes without any results
-            athletes_without_results = set(athlete_ids) - processed_athletes
+            athletes_without_results = wanted - processed_athletes
             
             if athletes_without_results:
                 logger.info(f"Gefunden: {len(athletes_without_results)} Athleten ohne Ergebnisse")
                 
-                # Erstelle leere Series für Athleten ohne Ergebnisse
-                empty_series = {
-                    'series_id': 'new_athlete',
-                    'series_name': 'New Athlete',
-                    'divisions': {'New Athletes': []}
-                }
-                
-                # Füge jeden Athleten ohne Ergebnisse hinzu
-                for athlete_id in athletes_without_results:
-                    # Hole gespeicherte Athleten-Details
-                    athlete_data = self.athlete_details.get(athlete_id)
-                    if athlete_data:
-                        empty_ranking = {
-                            'athlete': {
-                                'id': athlete_id,
-                                'name': athlete_data['name'],
-                                'nationality': athlete_data.get('nationality'),
-                                'dob': athlete_data.get('dob'),
-                                'image': athlete_data.get('image')
-                            },
-                            'place': None,
-                            'points': None,
-                            'results': []
-                        }
-                        empty_series['divisions']['New Athletes'].append(empty_ranking)
-                        logger.debug(f"Added new athlete: {athlete_data['name']} (ID: {athlete_id})")
-                    else:
-                        logger.warning(f"Keine Details gefunden für Athlet ID: {athlete_id}")
-
-                # Füge die leere Series nur hinzu, wenn sie Athleten enthält
-                if empty_series['divisions']['New Athletes']:
+                # Leere Series für Athleten ohne Ergebnisse, nur wenn sie Athleten enthält
+                empty_series = RankingsProcessor.build_new_athlete_series(
+                    athletes_without_results, self.athletes
+                )
+                if empty_series:
                     valid_results.append(empty_series)
             
             total_athletes = len(processed_athletes) + len(athletes_without_results)
             logger.info(f"Verarbeitet: {len(valid_results)} Series")
             logger.info(f"Gefundene Athleten insgesamt: {total_athletes}")
-            
-            if total_athletes != len(self.athlete_details):
-                logger.warning(
-                    f"Warnung: Anzahl verarbeiteter Athleten ({total_athletes}) "
-                    f"weicht von gecachten Athleten ({len(self.athlete_details)}) ab"
-                )
+            logger.debug(f"Request-Statistik: {client.stats()}")
+            if client.cache is not None:
+                logger.info(f"Cache-Statistik: {client.cache.stats()}")
+            if self.sync is not None:
+                logger.info(f"Season-Store: {self.sync.stats()}")
+            logger.debug(f"Athleten-Cache: {self.athletes.stats()}")
             
             return valid_results
         
@@ -205,53 +503,320 @@ class LiveheatsClient:
             logger.info(f"{len(series)} Serien gefunden.")
             
             # Filter Serien basierend auf Jahreszahlen
-            filtered_series = []
-            for s in series:
-                match = re.search(r'\b(202[4-9])\b', s["name"])
-                if match and int(match.group(1)) in years:
-                    filtered_series.append(s)
+            filtered_series = filter_series_by_years(series, years)
             
             logger.info(f"{len(filtered_series)} Serien in den Jahren {years} gefunden.")
             return filtered_series
 
-    async def get_events_from_series(self, series_ids: list) -> list:
-        """Fetch all events from a list of series IDs."""
+    async def get_events_from_series(self, series_ids: list, timeout: float = SERIES_EVENTS_TIMEOUT) -> list:
+        """Fetch all events from a list of series IDs.
+
+        Series are queried concurrently (bounded by ``max_concurrent_series``);
+        a series that doesn't answer within ``timeout`` seconds is skipped.
+        """
         async with self.client as client:
-            events = []
-            for series_id in series_ids:
-                result = await client.execute(self.queries.GET_EVENTS_BY_SERIES, {"id": series_id})
-                if result and "series" in result and "events" in result["series"]:
-                    events.extend(result["series"]["events"])
+            slots = asyncio.Semaphore(self.max_concurrent_series)
             
-            # Nach Datum filtern (nur zukünftige Events)
-            now = datetime.now(timezone.utc)
-            grace_period = now - timedelta(days=5)
-            future_events = [
-                event for event in events 
-                if datetime.fromisoformat(event["date"].replace("Z", "+00:00")) >= grace_period
-            ]
+            async def fetch_series_events(series_id):
+                async with slots:
+                    try:
+                        result = await asyncio.wait_for(
+                            client.execute(self.queries.GET_EVENTS_BY_SERIES, {"id": series_id}),
+                            timeout
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Timeout beim Laden der Events von Series {series_id}")
+                        return []
+                if result and "series" in result and result["series"] and "events" in result["series"]:
+                    return result["series"]["events"] or []
+                return []
             
-            # Deduplizieren basierend auf der Event-ID
-            unique_events = {event["id"]: event for event in future_events}.values()
+            # Events sammeln, sobald ihre Series geantwortet hat
+            events = []
+            for next_series in asyncio.as_completed([fetch_series_events(s) for s in series_ids]):
+                events.extend(await next_series)
             
-            logger.info(f"{len(unique_events)} zukünftige Events gefunden.")
-            return list(unique_events)
+            # Nach Datum filtern (nur zukünftige Events)
+            upcoming = filter_upcoming_events(events)
+            logger.info(f"{len(upcoming)} zukünftige Events gefunden.")
+            return upcoming
+
+    async def get_future_events(self, short_name: str = "fwtglobal") -> list:
+        """Fetch future events for FWT series in 2024–2029.
 
-    async def get_future_events(self) -> list:
-        """Fetch future events for FWT series in 2024–2029."""
-        # Hole die Serien der Organisation
-        series = await self.get_series_by_years("fwtglobal", range(2024, 2030))
+        Uses one nested organisation → series → events query with a minimal
+        event profile; falls back to querying the series one by one.
+        """
+        years = range(2024, 2030)
+        async with self.client as client:
+            result = await client.execute(self.queries.GET_ORGANISATION_EVENTS, {"shortName": short_name})
+        organisation = (result or {}).get("organisationByShortName")
+        
+        if organisation:
+            series = filter_series_by_years(organisation.get("series") or [], years)
+        else:
+            logger.warning("Event-Liste der Organisation nicht verfügbar, frage Series einzeln ab")
+            series = await self.get_series_by_years(short_name, years)
         if not series:
             return []
         
-        # Extrahiere Serien-IDs
-        series_ids = [s["id"] for s in series]
+        # Eingefrorene Series haben keine zukünftigen Events mehr
+        if self.sync is not None:
+            frozen = self.sync.frozen_ids([s["id"] for s in series])
+            if frozen:
+                logger.info(f"{len(frozen)} abgeschlossene Series übersprungen")
+                series = [s for s in series if str(s["id"]) not in frozen]
+        
+        if not organisation:
+            # Hole Events aus den Serien
+            return await self.get_events_from_series([s["id"] for s in series])
+        
+        upcoming = filter_upcoming_events([event for s in series for event in s.get("events") or []])
+        logger.info(f"{len(upcoming)} zukünftige Events gefunden.")
+        return upcoming
+            
+    async def _resolve_athlete_series(self, client: GraphQLClient, athlete_ids: List[str]) -> Optional[Dict[str, Set[str]]]:
+        """Map series id -> division ids the given athletes competed in.
+
+        Returns None if any history lookup failed, so the caller can fall
+        back to scanning all series instead of silently losing results.
+        """
+        histories: Dict[str, Dict] = {}
+        missing = []
+        for athlete_id in dict.fromkeys(athlete_ids):
+            cached = client.cache_lookup(self.queries.GET_ATHLETE_HISTORY, {"id": athlete_id})
+            if cached is not None:
+                histories[athlete_id] = cached.get("athlete")
+            else:
+                missing.append(athlete_id)
+        
+        chunks = [
+            missing[i:i + ATHLETE_HISTORY_BATCH_SIZE]
+            for i in range(0, len(missing), ATHLETE_HISTORY_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*[
+            client.execute(
+                self.queries.build_batched_athlete_history_query(len(chunk)),
+                {f"a{i}": athlete_id for i, athlete_id in enumerate(chunk)}
+            )
+            for chunk in chunks
+        ])
+        
+        for chunk, data in zip(chunks, results):
+            if data is None:
+                return None
+            for i, athlete_id in enumerate(chunk):
+                athlete = data.get(f"a{i}")
+                client.cache_store(self.queries.GET_ATHLETE_HISTORY, {"id": athlete_id}, {"athlete": athlete})
+                histories[athlete_id] = athlete
+        
+        series_divisions: Dict[str, Set[str]] = {}
+        # Series mit Starts ohne bekannte Division werden nicht eingegrenzt
+        unrestricted: Set[str] = set()
+        try:
+            for athlete in histories.values():
+                event_divisions = (athlete or {}).get("eventDivisions") or []
+                if len(event_divisions) >= ATHLETE_HISTORY_LIMIT:
+                    # Historie abgeschnitten, ältere Starts würden fehlen
+                    logger.info(f"Historie von Athlet {athlete.get('id')} erreicht das Limit ({ATHLETE_HISTORY_LIMIT})")
+                    return None
+                for event_division in event_divisions:
+                    division_id = (event_division.get("division") or {}).get("id")
+                    for series in (event_division.get("event") or {}).get("series") or []:
+                        divisions = series_divisions.setdefault(str(series["id"]), set())
+                        if division_id:
+                            divisions.add(str(division_id))
+                        else:
+                            unrestricted.add(str(series["id"]))
+        except (AttributeError, KeyError, TypeError) as e:
+            logger.warning(f"Athleten-Historie nicht auswertbar: {e}")
+            return None
+        
+        for series_id in unrestricted:
+            series_divisions[series_id] = set()
+        return series_divisions
+        
+    async def _ensure_athlete_profiles(self, client: GraphQLClient, athlete_ids: AbstractSet[str]):
+        """Load profiles of athletes missing from the athlete cache in aliased batches."""
+        missing = sorted(a for a in athlete_ids if a not in self.athletes)
+        if not missing:
+            return
+        chunks = [
+            missing[i:i + ATHLETE_HISTORY_BATCH_SIZE]
+            for i in range(0, len(missing), ATHLETE_HISTORY_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*[
+            client.execute(
+                self.queries.build_batched_athlete_profiles_query(len(chunk)),
+                {f"a{i}": athlete_id for i, athlete_id in enumerate(chunk)}
+            )
+            for chunk in chunks
+        ])
+        for chunk, data in zip(chunks, results):
+            for i in range(len(chunk)):
+                athlete = (data or {}).get(f"a{i}")
+                if athlete:
+                    self.athletes.put(athlete)
+        logger.debug(f"{len(missing)} Athleten-Profile nachgeladen")
+    
+    async def _ensure_event_details(self, client: GraphQLClient, event_ids: AbstractSet[str]):
+        """Load name and date of events not listed in their series' event list."""
+        missing = sorted(e for e in event_ids if e not in self.event_details)
+        if not missing:
+            return
+        chunks = [
+            missing[i:i + ATHLETE_HISTORY_BATCH_SIZE]
+            for i in range(0, len(missing), ATHLETE_HISTORY_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*[
+            client.execute(
+                self.queries.build_batched_events_query(len(chunk)),
+                {f"e{i}": event_id for i, event_id in enumerate(chunk)}
+            )
+            for chunk in chunks
+        ])
+        for chunk, data in zip(chunks, results):
+            for i, event_id in enumerate(chunk):
+                event = (data or {}).get(f"e{i}")
+                if event:
+                    self.event_details[event_id] = {"name": event.get("name"), "date": event.get("date")}
+    
+    def _hydrate_ranking(self, row: Dict) -> Dict:
+        """Expand a lean ranking row to the shape of the full profile."""
+        athlete_id = row["athlete"]["id"]
+        athlete = self.athletes.get(athlete_id) or {"id": athlete_id}
+        results = []
+        for result in row.get("results") or []:
+            event_id = (((result.get("eventDivision") or {}).get("event")) or {}).get("id")
+            event = self.event_details.get(str(event_id), {"name": None, "date": None})
+            results.append({
+                "place": result.get("place"),
+                "points": result.get("points"),
+                "eventDivision": {"event": {"name": event["name"], "date": event["date"]}},
+            })
+        return {
+            "athlete": {
+                "id": athlete_id,
+                "name": athlete.get("name"),
+                "dob": athlete.get("dob"),
+                "nationality": athlete.get("nationality"),
+                "image": athlete.get("image"),
+            },
+            "place": row.get("place"),
+            "points": row.get("points"),
+            "results": results,
+        }
+        
+    async def _fetch_division_rankings(self, client: GraphQLClient, series_id: str, division_id: str,
+                                       season: Optional[int] = None,
+                                       row_filter: Optional[AbstractSet[str]] = None,
+                                       profile: str = "full") -> Optional[Dict]:
+        """Fetch the rankings of one division, batched or within the global concurrency budget.
+
+        The ``max_concurrent_divisions`` budget only applies to unbatched
+        fetches; a semaphore around batched lookups would cap the batch size.
+        """
+        if self.batcher is not None:
+            # Parallelität begrenzt hier der Scheduler pro HTTP-Request, nicht pro Division
+            return await self.batcher.load(series_id, division_id, season, row_filter, profile)
+        async with self._get_division_slots():
+            return await client.execute(
+                self.queries.series_rankings_query(profile),
+                {"id": series_id, "divisionId": division_id},
+                season=season,
+                row_filter=row_filter
+            )
+
+    async def fetch_series_tables(self, series_id: str) -> Optional[Dict]:
+        """Fetch the complete, unfiltered ranking tables of one series.
+
+        Returns ``{"name", "divisions": [(division, rankings or None), ...],
+        "events"}``; ``events`` is None when the series came from the season store.
+        """
+        async with self.client as client:
+            return await self._load_series_tables(client, str(series_id))
+            
+    async def _load_series_tables(self, client: GraphQLClient, series_id: str,
+                                  division_ids: Optional[Set[str]] = None,
+                                  athlete_ids: Optional[AbstractSet[str]] = None) -> Optional[Dict]:
+        # Abgeschlossene Series kommen vollständig aus dem lokalen Season-Store
+        stored = self.sync.load_series(series_id) if self.sync is not None else None
+        if stored is not None:
+            return {**stored, "events": None}
+        return await self._fetch_series_tables(client, series_id, division_ids, athlete_ids)
+        
+    async def _fetch_series_tables(self, client: GraphQLClient, series_id: str,
+                                   division_ids: Optional[Set[str]] = None,
+                                   athlete_ids: Optional[AbstractSet[str]] = None) -> Optional[Dict]:
+        """Fetch a series' divisions and their ranking tables from Liveheats.
+
+        Finished series are frozen in the season store on the way. With
+        ``athlete_ids`` the tables may already be reduced to those athletes
+        while decoding and use the lean query profile, unless full tables are
+        needed for caching or freezing. ``profile`` tells which one was used.
+        """
+        # Get divisions for series
+        divisions_data = await client.execute(
+            self.queries.GET_DIVISIONS,
+            {"id": str(series_id)}
+        )
+        
+        if not divisions_data or "series" not in divisions_data:
+            return None
+            
+        series_data = divisions_data["series"]
+        if not series_data:
+            return None
         
-        # Hole Events aus den Serien
-        return await self.get_events_from_series(series_ids)
+        divisions = series_data.get("rankingsDivisions", [])
+        if not divisions:
+            return None
             
-    async def _process_series(self, client: GraphQLClient, series_id: str, athlete_ids: List[str]) -> Optional[Dict]:
-        """Process a single series and its divisions."""
+        finished = self.sync is not None and is_series_finished(series_data.get("events"))
+        if division_ids and not finished:
+            # Nur Divisionen, in denen die Athleten gestartet sind. Event-Divisionen müssen nicht
+            # den Rankings-Divisionen entsprechen: ist eine davon keine Rankings-Division, alle laden.
+            # Abgeschlossene Series werden komplett geladen, um sie einfrieren zu können.
+            if division_ids <= {str(d["id"]) for d in divisions}:
+                divisions = [d for d in divisions if str(d["id"]) in division_ids]
+        
+        # Saison bestimmt die Cache-Dauer: abgeschlossene Saisons ändern sich nicht mehr
+        season = RankingsProcessor.extract_year_from_series(series_data["name"])
+        
+        # Einzufrierende Series brauchen die vollständigen Tabellen
+        row_filter = athlete_ids if not finished else None
+        profile = self.query_profile if row_filter is not None else "full"
+        
+        # Alle Divisionen der Series parallel abfragen, gather liefert sie in Divisions-Reihenfolge
+        division_rankings = await asyncio.gather(*[
+            self._fetch_division_rankings(client, series_id, division["id"], season, row_filter, profile)
+            for division in divisions
+        ])
+        
+        tables = [
+            rankings["series"]["rankings"]
+            if rankings and rankings.get("series") and "rankings" in rankings["series"] else None
+            for rankings in division_rankings
+        ]
+        
+        if finished:
+            self.sync.freeze_series(series_id, series_data["name"], divisions, tables)
+        elif self.sync is not None:
+            self.sync.record_active()
+        
+        return {
+            "name": series_data["name"],
+            "divisions": list(zip(divisions, tables)),
+            "events": series_data.get("events") or [],
+            "profile": profile,
+        }
+        
+    async def _process_series(self, client: GraphQLClient, series_id: str, athlete_ids: AbstractSet[str],
+                              division_ids: Optional[Set[str]] = None) -> Optional[Dict]:
+        """Process a single series and its divisions, optionally limited to ``division_ids``.
+
+        ``athlete_ids`` is the hashed start list, so each ranking row costs one lookup.
+        """
         try:
             if not series_id or series_id.lower() == "id":
                 logger.debug(f"Überspringe ungültige Series ID: {series_id}")
@@ -259,50 +824,47 @@ class LiveheatsClient:
                 
             logger.debug(f"Verarbeite Series ID: {series_id}")
             
-            # Get divisions for series
-            divisions_data = await client.execute(
-                self.queries.GET_DIVISIONS,
-                {"id": str(series_id)}
-            )
-            
-            if not divisions_data or "series" not in divisions_data:
-                return None
-                
-            series_data = divisions_data["series"]
-            if not series_data:
-                return None
-            
-            divisions = series_data.get("rankingsDivisions", [])
-            if not divisions:
+            series_tables = await self._load_series_tables(client, series_id, division_ids, athlete_ids)
+            if series_tables is None:
                 return None
+            series_name = series_tables["name"]
                 
             results = {}
             series_has_results = False
             
-            for division in divisions:
-                rankings = await client.execute(
-                    self.queries.GET_SERIES_RANKINGS,
-                    {"id": series_id, "divisionId": division["id"]}
-                )
-                
-                if rankings and "series" in rankings and "rankings" in rankings["series"]:
-                    filtered_rankings = [
-                        r for r in rankings["series"]["rankings"]
-                        if r["athlete"]["id"] in athlete_ids
-                    ]
-                    
-                    if filtered_rankings:
-                        results[division["name"]] = filtered_rankings
-                        series_has_results = True
-                        logger.debug(
-                            f"Gefunden: {len(filtered_rankings)} Athleten "
-                            f"in Division {division['name']}"
-                        )
+            divisions = [
+                (division, [r for r in rankings if r["athlete"]["id"] in athlete_ids] if rankings else None)
+                for division, rankings in series_tables["divisions"]
+            ]
+            
+            if series_tables.get("profile") == "lean":
+                # Event-Namen stehen in der Event-Liste der Series, nur Unbekannte werden nachgeladen
+                for event in series_tables["events"]:
+                    self.event_details[str(event["id"])] = {"name": event.get("name"), "date": event.get("date")}
+                await self._ensure_event_details(client, {
+                    str(result["eventDivision"]["event"]["id"])
+                    for _, rankings in divisions for r in rankings or []
+                    for result in r.get("results") or []
+                    if (result.get("eventDivision") or {}).get("event")
+                })
+                divisions = [
+                    (division, [self._hydrate_ranking(r) for r in rankings] if rankings else None)
+                    for division, rankings in divisions
+                ]
+            
+            for division, filtered_rankings in divisions:
+                if filtered_rankings:
+                    results[division["name"]] = filtered_rankings
+                    series_has_results = True
+                    logger.debug(
+                        f"Gefunden: {len(filtered_rankings)} Athleten "
+                        f"in Division {division['name']}"
+                    )
             
             if series_has_results:
                 return {
                     "series_id": series_id,
-                    "series_name": series_data["name"],
+                    "series_name": series_name,
                     "divisions": results
                 }
             
@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Profilfelder eines Athleten; Event-bezogene Daten (BIB, Status) gehören nicht dazu
+ATHLETE_PROFILE_FIELDS = ("id", "name", "nationality", "dob", "image")
+
+DEFAULT_MAX_ATHLETES = 20000
+DEFAULT_ATHLETE_TTL = 6 * 60 * 60
+
+
+class AthleteCache:
+    """Bounded LRU cache of athlete profiles with a TTL, shared across clients.
+
+    Only identity/profile fields are stored, so a profile fetched for one
+    event is reused for every other event the athlete enters. The cache
+    lives in memory and is shared within one process only: the web app's
+    ``/generate_pdf`` runs each report in a new ``generate_rankings_web.py``
+    process, so there profiles are not shared across requests (the on-disk
+    response cache still serves repeated event queries).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ATHLETES, ttl: Optional[float] = DEFAULT_ATHLETE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, athlete_id: str, default: Optional[Dict] = None) -> Optional[Dict]:
+        """Return the cached profile of ``athlete_id`` (``default`` on miss/expiry)."""
+        entry = self._entries.get(athlete_id)
+        if entry is None:
+            self.counters["misses"] += 1
+            return default
+
+        profile, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[athlete_id]
+            self.counters["expired"] += 1
+            self.counters["misses"] += 1
+            return default
+
+        self._entries.move_to_end(athlete_id)
+        self.counters["hits"] += 1
+        return profile
+
+    def put(self, athlete: Dict):
+        """Store the profile fields of an athlete as returned by Liveheats."""
+        athlete_id = athlete["id"]
+        profile = {field: athlete.get(field) for field in ATHLETE_PROFILE_FIELDS}
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[athlete_id] = (profile, expires)
+        self._entries.move_to_end(athlete_id)
+        self.counters["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def update(self, athletes: Iterable[Dict]):
+        for athlete in athletes:
+            self.put(athlete)
+
+    def __contains__(self, athlete_id: str) -> bool:
+        entry = self._entries.get(athlete_id)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+_default_athlete_cache: Optional[AthleteCache] = None
+
+
+def get_default_athlete_cache() -> AthleteCache:
+    """Return the process-wide athlete profile cache."""
+    global _default_athlete_cache
+    if _default_athlete_cache is None:
+        _default_athlete_cache = AthleteCache()
+    return _default_athlete_cache
@@ -1,17 +1,23 @@
 # api/queries.py
+import re
 from typing import Dict
 
+# Athletenfotos stehen im PDF 60 mm breit; Liveheats skaliert sie serverseitig auf die passende Pixelbreite
+ATHLETE_IMAGE_WIDTH_MM = 60
+ATHLETE_IMAGE_DPI = 200
+ATHLETE_IMAGE_SIZE = round(ATHLETE_IMAGE_WIDTH_MM / 25.4 * ATHLETE_IMAGE_DPI)
+# Obergrenze für die Wettkampf-Historie je Athlet; wer sie erreicht, gilt als unvollständig
+ATHLETE_HISTORY_LIMIT = 200
+
 class GraphQLQueries:
-    GET_SERIES_RANKINGS = """
-    query GetSeriesRankings($id: ID!, $divisionId: ID!) {
-        series(id: $id) {
-            rankings(divisionId: $divisionId) {
+    # Felder einer Rankings-Zeile, geteilt von Einzel- und Batch-Abfragen
+    SERIES_RANKING_FIELDS = """
                 athlete {
                     id
                     name
                     dob
                     nationality
-                    image
+                    image(size: %d)
                 }
                 place
                 points
@@ -25,10 +31,136 @@ class GraphQLQueries:
                         }
                     }
                 }
-            }
+            """ % ATHLETE_IMAGE_SIZE
+
+    # Schlanke Rankings-Zeile: Athleten-Profile und Event-Namen werden separat und dedupliziert geladen
+    SERIES_RANKING_FIELDS_LEAN = """
+                athlete {
+                    id
+                }
+                place
+                points
+                results {
+                    place
+                    points
+                    eventDivision {
+                        event {
+                            id
+                        }
+                    }
+                }
+            """
+
+    RANKING_PROFILES = ("full", "lean")
+
+    GET_SERIES_RANKINGS = """
+    query GetSeriesRankings($id: ID!, $divisionId: ID!) {
+        series(id: $id) {
+            rankings(divisionId: $divisionId) {%s}
         }
     }
-    """
+    """ % SERIES_RANKING_FIELDS
+
+    GET_SERIES_RANKINGS_LEAN = """
+    query GetSeriesRankingsLean($id: ID!, $divisionId: ID!) {
+        series(id: $id) {
+            rankings(divisionId: $divisionId) {%s}
+        }
+    }
+    """ % SERIES_RANKING_FIELDS_LEAN
+
+    @classmethod
+    def ranking_fields(cls, profile: str = "full") -> str:
+        if profile not in cls.RANKING_PROFILES:
+            raise ValueError(f"Unbekanntes Query-Profil: {profile}")
+        return cls.SERIES_RANKING_FIELDS_LEAN if profile == "lean" else cls.SERIES_RANKING_FIELDS
+
+    @classmethod
+    def series_rankings_query(cls, profile: str = "full") -> str:
+        """Single-division rankings document for the given profile."""
+        cls.ranking_fields(profile)
+        return cls.GET_SERIES_RANKINGS_LEAN if profile == "lean" else cls.GET_SERIES_RANKINGS
+
+    @classmethod
+    def build_batched_rankings_query(cls, count: int, profile: str = "full") -> str:
+        """Build one aliased document fetching ``count`` series/division rankings.
+
+        Variables are named ``s{i}``/``d{i}`` and the results are returned
+        under the aliases ``s{i}``.
+        """
+        fields = cls.ranking_fields(profile)
+        params = ", ".join(f"$s{i}: ID!, $d{i}: ID!" for i in range(count))
+        selections = "\n".join(
+            f"        s{i}: series(id: $s{i}) {{ rankings(divisionId: $d{i}) {{{fields}}} }}"
+            for i in range(count)
+        )
+        name = "GetBatchedSeriesRankingsLean" if profile == "lean" else "GetBatchedSeriesRankings"
+        return f"query {name}({params}) {{\n{selections}\n    }}"
+
+    @classmethod
+    def ranking_lookup_cost(cls, profile: str = "full") -> int:
+        """Estimated cost of one aliased rankings lookup (number of selected fields)."""
+        return len(re.findall(r'[A-Za-z_]\w*', cls.ranking_fields(profile)))
+
+    # Profil eines Athleten, einmal pro Athlet statt in jeder Rankings-Zeile
+    ATHLETE_PROFILE_FIELDS = """
+                id
+                name
+                nationality
+                dob
+                image(size: %d)
+            """ % ATHLETE_IMAGE_SIZE
+
+    @classmethod
+    def build_batched_athlete_profiles_query(cls, count: int) -> str:
+        """Build one aliased document fetching ``count`` athlete profiles (``a{i}``)."""
+        params = ", ".join(f"$a{i}: ID!" for i in range(count))
+        selections = "\n".join(
+            f"        a{i}: athlete(id: $a{i}) {{{cls.ATHLETE_PROFILE_FIELDS}}}"
+            for i in range(count)
+        )
+        return f"query GetBatchedAthleteProfiles({params}) {{\n{selections}\n    }}"
+
+    @classmethod
+    def build_batched_events_query(cls, count: int) -> str:
+        """Build one aliased document fetching name and date of ``count`` events (``e{i}``)."""
+        params = ", ".join(f"$e{i}: ID!" for i in range(count))
+        selections = "\n".join(
+            f"        e{i}: event(id: $e{i}) {{ id name date }}"
+            for i in range(count)
+        )
+        return f"query GetBatchedEvents({params}) {{\n{selections}\n    }}"
+
+    # Wettkampf-Historie eines Athleten: in welchen Series/Divisionen ist er gestartet
+    ATHLETE_HISTORY_FIELDS = """
+                id
+                eventDivisions(limit: %d) {
+                    division {
+                        id
+                    }
+                    event {
+                        series {
+                            id
+                        }
+                    }
+                }
+            """ % ATHLETE_HISTORY_LIMIT
+
+    GET_ATHLETE_HISTORY = """
+    query GetAthleteHistory($id: ID!) {
+        athlete(id: $id) {%s}
+    }
+    """ % ATHLETE_HISTORY_FIELDS
+
+    @classmethod
+    def build_batched_athlete_history_query(cls, count: int) -> str:
+        """Build one aliased document fetching the history of ``count`` athletes (``a{i}``)."""
+        params = ", ".join(f"$a{i}: ID!" for i in range(count))
+        selections = "\n".join(
+            f"        a{i}: athlete(id: $a{i}) {{{cls.ATHLETE_HISTORY_FIELDS}}}"
+            for i in range(count)
+        )
+        return f"query GetBatchedAthleteHistory({params}) {{\n{selections}\n    }}"
 
     GET_DIVISIONS = """
     query GetDivisions($id: ID!) {
@@ -38,6 +170,12 @@ class GraphQLQueries:
                 id
                 name
             }
+            events {
+                id
+                name
+                date
+                status
+            }
         }
     }
     """
@@ -58,7 +196,7 @@ class GraphQLQueries:
                         name
                         nationality
                         dob
-                        image
+                        image(size: %d)
                     }
                     status
                     bib
@@ -67,7 +205,7 @@ class GraphQLQueries:
             }
         }
     }
-    """
+    """ % ATHLETE_IMAGE_SIZE
 
     GET_FWT_SERIES = """
     query getFWTGlobalSeries($shortName: String) {
@@ -96,6 +234,23 @@ class GraphQLQueries:
     }
     """
     
+    # Minimale Event-Liste aller Series einer Organisation in einer Abfrage (für /events)
+    GET_ORGANISATION_EVENTS = """
+    query GetOrganisationEvents($shortName: String!) {
+        organisationByShortName(shortName: $shortName) {
+            series {
+                id
+                name
+                events {
+                    id
+                    name
+                    date
+                }
+            }
+        }
+    }
+    """
+
     GET_EVENTS_BY_SERIES = """
     query GetEventsBySeries($id: ID!) {
         series(id: $id) {
@@ -0,0 +1,215 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_MIN_IN_FLIGHT = 2
+DEFAULT_INITIAL_IN_FLIGHT = 8
+DEFAULT_REQUESTS_PER_SECOND = 20.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+
+# HTTP-Status, bei denen Liveheats drosselt oder überlastet ist
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Requests-per-second limiter with a configurable burst size."""
+
+    def __init__(self, rate: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for the given time (e.g. on Retry-After)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> float:
+        """Wait for a token and return the time spent waiting."""
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                delay = self._paused_until - now
+            else:
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class AdaptiveLimiter:
+    """In-flight limit with additive increase and multiplicative decrease (AIMD)."""
+
+    def __init__(self,
+                 initial: int = DEFAULT_INITIAL_IN_FLIGHT,
+                 minimum: int = DEFAULT_MIN_IN_FLIGHT,
+                 maximum: int = DEFAULT_MAX_IN_FLIGHT,
+                 decrease_factor: float = 0.5,
+                 decrease_cooldown: float = 1.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    async def acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            while self.in_flight >= int(self.limit):
+                await condition.wait()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def release(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self):
+        # +1 pro vollem Fenster erfolgreicher Requests
+        self.limit = min(self.maximum, self.limit + 1.0 / max(self.limit, 1.0))
+
+    def on_throttled(self) -> bool:
+        """Shrink the limit; returns False if a decrease just happened."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return False
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        return True
+
+
+class RequestScheduler:
+    """Client-side scheduler combining a token bucket and an adaptive in-flight limit."""
+
+    def __init__(self,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 min_in_flight: int = DEFAULT_MIN_IN_FLIGHT,
+                 initial_in_flight: int = DEFAULT_INITIAL_IN_FLIGHT,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 burst: int = DEFAULT_BURST,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX):
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.limiter = AdaptiveLimiter(initial_in_flight, min_in_flight, max_in_flight)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.counters = {
+            "requests": 0,
+            "successes": 0,
+            "throttled": 0,
+            "server_errors": 0,
+            "network_errors": 0,
+            "retries": 0,
+            "failures": 0,
+            "wait_seconds": 0.0,
+        }
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a token and a free in-flight slot for one HTTP request."""
+        started = time.monotonic()
+        await self.bucket.acquire()
+        await self.limiter.acquire()
+        self.counters["wait_seconds"] += time.monotonic() - started
+        self.counters["requests"] += 1
+        try:
+            yield
+        finally:
+            await self.limiter.release()
+
+    def record_success(self):
+        self.counters["successes"] += 1
+        self.limiter.on_success()
+
+    def record_throttled(self, status: Optional[int], retry_after: Optional[float] = None):
+        """Back off after a 429/5xx response or a network error (status None)."""
+        if status == 429:
+            self.counters["throttled"] += 1
+        elif status is None:
+            self.counters["network_errors"] += 1
+        else:
+            self.counters["server_errors"] += 1
+
+        if self.limiter.on_throttled():
+            logger.warning(
+                f"Liveheats drosselt (Status {status}), "
+                f"reduziere parallele Requests auf {int(self.limiter.limit)}"
+            )
+        if retry_after:
+            self.bucket.pause(retry_after)
+
+    def record_failure(self):
+        self.counters["failures"] += 1
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number ``attempt`` (starting at 1)."""
+        if retry_after:
+            return min(self.backoff_max, retry_after)
+        return min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+
+    def should_retry(self, attempt: int) -> bool:
+        if attempt > self.max_retries:
+            return False
+        self.counters["retries"] += 1
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """Return counters and the current limiter state."""
+        return {
+            **self.counters,
+            "in_flight_limit": int(self.limiter.limit),
+            "in_flight": self.limiter.in_flight,
+            "peak_in_flight": self.limiter.peak_in_flight,
+            "requests_per_second": self.bucket.rate,
+        }
+
+
+_default_scheduler = RequestScheduler()
+
+
+def get_default_scheduler() -> RequestScheduler:
+    """Return the process-wide scheduler shared by all GraphQL clients."""
+    return _default_scheduler
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
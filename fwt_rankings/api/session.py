@@ -0,0 +1,149 @@
+import asyncio
+import os
+import aiohttp
+from typing import Optional
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 20
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_CONNECT_TIMEOUT = 10
+# Kein Gesamt-Timeout: große gebündelte Antworten dürfen länger dauern, solange Daten fließen
+DEFAULT_READ_TIMEOUT = 30
+READ_TIMEOUT_ENV = "FWT_RANKINGS_READ_TIMEOUT"
+
+
+def default_read_timeout() -> float:
+    """Socket read timeout in seconds, configurable via FWT_RANKINGS_READ_TIMEOUT."""
+    value = os.environ.get(READ_TIMEOUT_ENV, "").strip()
+    try:
+        return float(value) if value else DEFAULT_READ_TIMEOUT
+    except ValueError:
+        logger.warning(f"Ungültiger Wert für {READ_TIMEOUT_ENV}: {value!r}")
+        return DEFAULT_READ_TIMEOUT
+
+
+class SessionManager:
+    """Process-wide pool of keep-alive connections to the Liveheats API."""
+
+    def __init__(self,
+                 limit: int = DEFAULT_LIMIT,
+                 limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+                 dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+                 keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: Optional[float] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout if read_timeout is not None else default_read_timeout()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def configure(self, **options):
+        """Change pool settings; applied the next time the session is created."""
+        for name, value in options.items():
+            if not hasattr(self, name) or name.startswith('_'):
+                raise ValueError(f"Unbekannte Session-Option: {name}")
+            setattr(self, name, value)
+
+    def _is_usable(self) -> bool:
+        return (
+            self._session is not None
+            and not self._session.closed
+            and self._loop is asyncio.get_running_loop()
+        )
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=self.connect_timeout,
+                sock_read=self.read_timeout,
+            ),
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use in this event loop."""
+        if self._is_usable():
+            return self._session
+
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            # Ein Lock gehört immer zu genau einem Event Loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._is_usable():
+                return self._session
+            if self._session is not None and not self._session.closed and self._loop is not loop:
+                # Session stammt aus einem anderen oder bereits beendeten Loop (z.B. mehrere asyncio.run)
+                await self._close_stale(self._session, self._loop)
+            self._session = self._create_session()
+            self._loop = loop
+            logger.debug(
+                f"Neue HTTP-Session erstellt (limit_per_host={self.limit_per_host}, "
+                f"dns_cache_ttl={self.dns_cache_ttl}s)"
+            )
+            return self._session
+
+    @staticmethod
+    async def _close_stale(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a session that was created in another event loop."""
+        if loop is not None and loop.is_running():
+            # Loop läuft noch in einem anderen Thread: dort schließen
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            logger.debug("Session aus einem anderen Event Loop wird dort geschlossen")
+            return
+        try:
+            # Beendeter Loop: Session und Connector schließen, die Sockets gibt der GC frei
+            await session.close()
+        except Exception as e:
+            logger.debug(f"Alte Session nicht schließbar ({e}), löse Connector")
+            session.detach()
+        else:
+            logger.debug("Session aus einem beendeten Event Loop geschlossen")
+
+    async def startup(self):
+        """Open the pooled session eagerly, e.g. in an application lifespan hook."""
+        await self.get_session()
+
+    async def shutdown(self):
+        """Close the pooled session and release all pooled connections."""
+        session, self._session = self._session, None
+        self._loop = None
+        if session is not None and not session.closed:
+            await session.close()
+            logger.debug("HTTP-Session geschlossen")
+
+
+_session_manager = SessionManager()
+
+
+def get_session_manager() -> SessionManager:
+    """Return the process-wide session manager."""
+    return _session_manager
+
+
+async def startup():
+    """Startup hook for applications and CLI scripts."""
+    await _session_manager.startup()
+
+
+async def shutdown():
+    """Shutdown hook for applications and CLI scripts."""
+    await _session_manager.shutdown()
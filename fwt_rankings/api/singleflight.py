@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Call:
+    """One upstream request and the number of callers waiting for it."""
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Coalesce concurrent identical requests into one upstream call.
+
+    The upstream call runs in its own task. Callers wait on it through
+    ``asyncio.shield``, so a cancelled caller never cancels the request of
+    the others; only when every waiting caller is gone is the upstream
+    request cancelled as well.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.counters = {"leaders": 0, "coalesced": 0, "abandoned": 0}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``factory()`` once for all concurrent callers with the same ``key``."""
+        call = self._calls.get(key)
+        if call is None or call.task.done() or call.abandoned:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.counters["leaders"] += 1
+        else:
+            self.counters["coalesced"] += 1
+            logger.debug(f"Identische Anfrage läuft bereits, warte auf Ergebnis ({key[:12]})")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Letzter Wartender ist weg: Upstream-Anfrage wird nicht mehr gebraucht
+                call.abandoned = True
+                call.task.cancel()
+                self.counters["abandoned"] += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "in_flight": self.in_flight}
+
+
+_default_single_flight = SingleFlight()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight group shared by all GraphQL clients."""
+    return _default_single_flight
@@ -0,0 +1,121 @@
+import codecs
+import hashlib
+import json
+import re
+from typing import AbstractSet, Any, AsyncIterator, List
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Beginn einer Rankings-Liste; in JSON-Strings kann die Folge wegen der Escapes nicht vorkommen
+ROWS_KEY = re.compile(r'"rankings"\s*:\s*')
+# So viel vom Pufferende wird aufgehoben, falls der Schlüssel über eine Chunk-Grenze geht
+KEY_TAIL = 32
+ROW_SEPARATORS = " \t\r\n,"
+
+
+def filter_digest(athlete_ids: AbstractSet[str]) -> str:
+    """Short stable key of an athlete filter, for coalescing identical filtered requests."""
+    return hashlib.sha256(",".join(sorted(athlete_ids)).encode('utf-8')).hexdigest()[:16]
+
+
+class RankingsRowFilter:
+    """Incrementally decode a GraphQL response, keeping only wanted ranking rows.
+
+    Everything outside ``"rankings": [...]`` lists is passed through as
+    text. Inside such a list each row is decoded on its own as soon as it
+    is complete, and only rows whose ``athlete.id`` is in ``athlete_ids``
+    are kept, so the full table is never held as Python objects.
+    """
+
+    def __init__(self, athlete_ids: AbstractSet[str]):
+        self.athlete_ids = athlete_ids
+        self.rows_seen = 0
+        self.rows_kept = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._output: List[str] = []
+        self._kept: List[str] = []
+        self._in_rows = False
+
+    def feed(self, chunk: bytes):
+        self._buffer += self._decoder.decode(chunk)
+        self._process(final=False)
+
+    def close(self) -> Any:
+        """Finish decoding and return the (filtered) response document."""
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._process(final=True)
+        if self._in_rows:
+            raise ValueError("Antwort endet innerhalb einer Rankings-Liste")
+        return json.loads("".join(self._output))
+
+    def _process(self, final: bool):
+        buffer, pos = self._buffer, 0
+        while pos < len(buffer):
+            if not self._in_rows:
+                match = ROWS_KEY.search(buffer, pos)
+                if match is None:
+                    keep = len(buffer) if final else max(pos, len(buffer) - KEY_TAIL)
+                    self._output.append(buffer[pos:keep])
+                    pos = keep
+                    break
+                if match.end() == len(buffer) and not final:
+                    # Ob eine Liste oder null folgt, steht erst im nächsten Chunk
+                    self._output.append(buffer[pos:match.start()])
+                    pos = match.start()
+                    break
+                if match.end() < len(buffer) and buffer[match.end()] == "[":
+                    self._output.append(buffer[pos:match.end() + 1])
+                    pos = match.end() + 1
+                    self._in_rows = True
+                    self._kept = []
+                else:
+                    self._output.append(buffer[pos:match.end()])
+                    pos = match.end()
+                continue
+
+            while pos < len(buffer) and buffer[pos] in ROW_SEPARATORS:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._output.append(",".join(self._kept))
+                self._output.append("]")
+                self._in_rows = False
+                pos += 1
+                continue
+            try:
+                row, end = self._json.raw_decode(buffer, pos)
+            except ValueError:
+                if final:
+                    raise
+                break  # Zeile noch unvollständig
+            self.rows_seen += 1
+            if (row.get("athlete") or {}).get("id") in self.athlete_ids:
+                self._kept.append(buffer[pos:end])
+                self.rows_kept += 1
+            pos = end
+        self._buffer = buffer[pos:]
+
+
+async def iter_response_chunks(response, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield the body of an aiohttp (or buffered replay) response in chunks."""
+    content = getattr(response, "content", None)
+    if content is not None:
+        async for chunk in content.iter_chunked(chunk_size):
+            yield chunk
+    else:
+        async for chunk in response.iter_chunks(chunk_size):
+            yield chunk
+
+
+async def decode_filtered(response, athlete_ids: AbstractSet[str]) -> RankingsRowFilter:
+    """Stream ``response`` through a :class:`RankingsRowFilter`; call ``close()`` for the document."""
+    row_filter = RankingsRowFilter(athlete_ids)
+    async for chunk in iter_response_chunks(response):
+        row_filter.feed(chunk)
+    return row_filter
@@ -0,0 +1,176 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from ..utils.logging import get_logger
+from ..utils.paths import get_cache_dir
+from .cache import CACHE_ENABLED_ENV
+
+logger = get_logger(__name__)
+
+# Event-Status, nach denen sich Rankings einer Series nicht mehr ändern
+FINISHED_EVENT_STATUSES = {"finished", "results_published", "cancelled"}
+
+# Wartezeit nach dem letzten Event, damit nachträgliche Korrekturen noch ankommen
+FREEZE_SETTLE_DAYS = 7
+
+# Eingefrorene Series werden nach dieser Zeit einmal neu geladen und erneut eingefroren,
+# damit spätere Korrekturen bei Liveheats nicht dauerhaft fehlen (None = nie)
+FROZEN_MAX_AGE_DAYS = 30
+
+
+def is_series_finished(events: Optional[List[Dict]], settle_days: int = FREEZE_SETTLE_DAYS) -> bool:
+    """A series is final once all its events are finished and the last one is settled."""
+    if not events:
+        return False
+    if not all(event.get("status") in FINISHED_EVENT_STATUSES for event in events):
+        return False
+    dates = [event["date"] for event in events if event.get("date")]
+    if not dates:
+        return False
+    last_event = max(datetime.fromisoformat(d.replace("Z", "+00:00")) for d in dates)
+    return datetime.now(timezone.utc) - last_event >= timedelta(days=settle_days)
+
+
+class SeasonSync:
+    """Permanent store of finished series so only active seasons are re-pulled.
+
+    A series is frozen when every one of its events is finished; its full
+    (unfiltered) ranking tables are then stored and served locally for
+    every later report. Series with upcoming or running events are never
+    frozen and are fetched from Liveheats as before. Entries older than
+    ``max_age_days`` count as not frozen, so they are re-fetched and
+    re-frozen once.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age_days: Optional[float] = FROZEN_MAX_AGE_DAYS):
+        self.path = str(path or get_cache_dir() / "season_sync.sqlite")
+        self.max_age_days = max_age_days
+        self.counters = {"frozen_hits": 0, "frozen_stored": 0, "active": 0}
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS frozen_series (
+                series_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                frozen_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS frozen_divisions (
+                series_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                division_id TEXT NOT NULL,
+                division_name TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (series_id, division_id)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _min_frozen_at(self) -> float:
+        if not self.max_age_days:
+            return 0.0
+        return time.time() - self.max_age_days * 86400
+
+    def is_frozen(self, series_id: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM frozen_series WHERE series_id = ? AND frozen_at >= ?",
+            (str(series_id), self._min_frozen_at())
+        ).fetchone()
+        return row is not None
+
+    def frozen_ids(self, series_ids: Iterable[str]) -> set:
+        """Return the subset of ``series_ids`` that is frozen."""
+        frozen = {row[0] for row in self._conn.execute(
+            "SELECT series_id FROM frozen_series WHERE frozen_at >= ?", (self._min_frozen_at(),)
+        )}
+        return {str(s) for s in series_ids} & frozen
+
+    def load_series(self, series_id: str) -> Optional[Dict]:
+        """Return ``{"name", "divisions": [(division, rankings), ...]}`` for a frozen series."""
+        row = self._conn.execute(
+            "SELECT name FROM frozen_series WHERE series_id = ? AND frozen_at >= ?",
+            (str(series_id), self._min_frozen_at())
+        ).fetchone()
+        if row is None:
+            return None
+
+        divisions = []
+        for division_id, division_name, payload in self._conn.execute(
+            "SELECT division_id, division_name, payload FROM frozen_divisions "
+            "WHERE series_id = ? ORDER BY position", (str(series_id),)
+        ):
+            rankings = json.loads(zlib.decompress(payload).decode('utf-8'))
+            divisions.append(({"id": division_id, "name": division_name}, rankings))
+
+        self.counters["frozen_hits"] += 1
+        return {"name": row[0], "divisions": divisions}
+
+    def freeze_series(self, series_id: str, name: str, divisions: List[Dict], rankings: List[Optional[List[Dict]]]):
+        """Store the complete ranking tables of a finished series permanently.
+
+        Nothing is stored if a division's rankings are missing (failed
+        request), so an incomplete series is retried on the next run.
+        """
+        if any(r is None for r in rankings):
+            logger.debug(f"Series {series_id} unvollständig, wird nicht eingefroren")
+            return
+
+        series_id = str(series_id)
+        with self._conn:
+            self._conn.execute("DELETE FROM frozen_divisions WHERE series_id = ?", (series_id,))
+            self._conn.executemany(
+                "INSERT INTO frozen_divisions (series_id, position, division_id, division_name, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (series_id, position, str(division["id"]), division["name"],
+                     zlib.compress(json.dumps(division_rankings, separators=(',', ':')).encode('utf-8')))
+                    for position, (division, division_rankings) in enumerate(zip(divisions, rankings))
+                ]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO frozen_series (series_id, name, frozen_at) VALUES (?, ?, ?)",
+                (series_id, name, time.time())
+            )
+        self.counters["frozen_stored"] += 1
+        logger.info(f"Series eingefroren: {name} ({series_id})")
+
+    def record_active(self):
+        self.counters["active"] += 1
+
+    def unfreeze(self, series_id: str) -> bool:
+        """Drop a frozen series, e.g. after results were corrected upstream."""
+        with self._conn:
+            self._conn.execute("DELETE FROM frozen_divisions WHERE series_id = ?", (str(series_id),))
+            deleted = self._conn.execute("DELETE FROM frozen_series WHERE series_id = ?", (str(series_id),))
+        if deleted.rowcount:
+            logger.info(f"Series {series_id} aufgetaut, wird neu von Liveheats geladen")
+        return deleted.rowcount > 0
+
+    def stats(self) -> Dict[str, int]:
+        frozen = self._conn.execute("SELECT COUNT(*) FROM frozen_series").fetchone()[0]
+        return {**self.counters, "frozen_series": frozen}
+
+    def close(self):
+        self._conn.close()
+
+
+_default_sync: Optional[SeasonSync] = None
+
+
+def get_default_sync() -> Optional[SeasonSync]:
+    """Return the shared season store, or None if local caching is disabled."""
+    global _default_sync
+    if os.environ.get(CACHE_ENABLED_ENV, "1").lower() in ("0", "false", "off", "no"):
+        return None
+    if _default_sync is None:
+        try:
+            _default_sync = SeasonSync()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Season-Store nicht verfügbar: {e}")
+            return None
+    return _default_sync
@@ -0,0 +1,298 @@
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from ..utils.logging import get_logger
+from .cache import normalize_query, operation_name, request_key
+from .session import SessionManager, get_session_manager
+
+logger = get_logger(__name__)
+
+CASSETTE_VERSION = 1
+TRANSPORT_ENV = "FWT_RANKINGS_TRANSPORT"
+CASSETTE_ENV = "FWT_RANKINGS_CASSETTE"
+
+# Alias-Batches verwenden Variablen/Aliase der Form s0, d0, a0, ...
+ALIAS_PATTERN = re.compile(r'^([A-Za-z]+)(\d+)$')
+
+
+def _alias_lookups(variables: Dict[str, Any]) -> Dict[str, Tuple]:
+    """Group batch variables by alias index: ``{"0": (("d", "40"), ("s", "4")), ...}``."""
+    groups: Dict[str, Dict[str, Any]] = {}
+    for name, value in variables.items():
+        match = ALIAS_PATTERN.match(name)
+        if match is None:
+            return {}
+        groups.setdefault(match.group(2), {})[match.group(1)] = value
+    return {index: tuple(sorted(group.items())) for index, group in groups.items()}
+
+
+def _alias_key(operation: str, lookup: Tuple) -> str:
+    return json.dumps([operation, lookup], default=str)
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Transport:
+    """Sends one GraphQL POST; ``post`` yields an aiohttp-like response."""
+
+    async def open(self):
+        """Prepare the transport (e.g. open the pooled session)."""
+
+    def post(self, url: str, payload: Dict[str, Any]):
+        raise NotImplementedError
+
+    async def close(self):
+        """Flush or release resources held by the transport."""
+
+
+class AiohttpTransport(Transport):
+    """Live transport using the process-wide pooled aiohttp session."""
+
+    def __init__(self, session_manager: Optional[SessionManager] = None):
+        self.session_manager = session_manager or get_session_manager()
+
+    async def open(self):
+        await self.session_manager.get_session()
+
+    @asynccontextmanager
+    async def post(self, url: str, payload: Dict[str, Any]):
+        session = await self.session_manager.get_session()
+        async with session.post(url, json=payload) as response:
+            yield response
+
+
+class BufferedResponse:
+    """Fully-read response with the parts of the aiohttp API the client uses."""
+
+    def __init__(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode('utf-8')
+
+    async def json(self) -> Any:
+        return json.loads(self._body.decode('utf-8'))
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start:start + chunk_size]
+
+
+class Cassette:
+    """Versioned JSON file of recorded request/response pairs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: Dict[str, List[Dict]] = {}
+        # Einzelergebnisse aus Alias-Batches, damit anders zusammengesetzte Batches abspielbar sind
+        self.aliases: Dict[str, Tuple[str, Any]] = {}
+        self.created = datetime.now().isoformat()
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+        if raw.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Cassette-Version {raw.get('version')} wird nicht unterstützt: {path}")
+        cassette = cls(path)
+        cassette.created = raw.get("created", cassette.created)
+        for interaction in raw.get("interactions", []):
+            cassette.interactions.setdefault(interaction["key"], []).append(interaction)
+            cassette._index_aliases(interaction)
+        return cassette
+
+    def _index_aliases(self, interaction: Dict):
+        response = interaction["response"]
+        lookups = _alias_lookups(interaction["request"]["variables"])
+        if response["status"] != 200 or not lookups:
+            return
+        data = json.loads(response["body"]).get("data") or {}
+        for alias, result in data.items():
+            match = ALIAS_PATTERN.match(alias)
+            if match and match.group(2) in lookups:
+                key = _alias_key(interaction["operation"], lookups[match.group(2)])
+                self.aliases[key] = (match.group(1), result)
+
+    def compose(self, operation: str, variables: Dict[str, Any]) -> Optional[bytes]:
+        """Answer an alias batch from individually recorded lookups, or None if any is missing."""
+        lookups = _alias_lookups(variables)
+        if not lookups:
+            return None
+        data = {}
+        for index, lookup in lookups.items():
+            key = _alias_key(operation, lookup)
+            if key not in self.aliases:
+                return None
+            prefix, result = self.aliases[key]
+            data[f"{prefix}{index}"] = result
+        return json.dumps({"data": data}).encode('utf-8')
+
+    def add(self, payload: Dict[str, Any], status: int, body: bytes, headers: Dict[str, str], elapsed: float):
+        key = request_key(payload["query"], payload.get("variables"))
+        self.interactions.setdefault(key, []).append({
+            "key": key,
+            "operation": operation_name(payload["query"]),
+            "request": {"query": normalize_query(payload["query"]), "variables": payload.get("variables") or {}},
+            "response": {"status": status, "headers": headers, "body": body.decode('utf-8')},
+            "elapsed": elapsed,
+        })
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        interactions = [i for recorded in self.interactions.values() for i in recorded]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": CASSETTE_VERSION,
+                "created": self.created,
+                "interactions": interactions,
+            }, f, ensure_ascii=False)
+        logger.info(f"Cassette gespeichert: {self.path} ({len(interactions)} Requests)")
+
+
+class RecordingTransport(Transport):
+    """Forward requests to a live transport and record every response."""
+
+    # Nur Header, die das Client-Verhalten beeinflussen
+    RECORDED_HEADERS = ("Retry-After", "Content-Type")
+
+    def __init__(self, cassette_path: str, inner: Optional[Transport] = None):
+        self.cassette = Cassette(cassette_path)
+        self.inner = inner or AiohttpTransport()
+
+    async def open(self):
+        await self.inner.open()
+
+    @asynccontextmanager
+    async def post(self, url: str, payload: Dict[str, Any]):
+        started = time.monotonic()
+        async with self.inner.post(url, payload) as response:
+            body = await response.read()
+            headers = {h: response.headers[h] for h in self.RECORDED_HEADERS if h in response.headers}
+            status = response.status
+        self.cassette.add(payload, status, body, headers, time.monotonic() - started)
+        yield BufferedResponse(status, body, headers)
+
+    async def close(self):
+        self.cassette.save()
+
+
+class LatencyProfile:
+    """Artificial latency for replayed responses.
+
+    ``delay = recorded * scale`` when ``use_recorded`` is set, otherwise
+    ``base + uniform(0, jitter)``.
+    """
+
+    def __init__(self, base: float = 0.0, jitter: float = 0.0,
+                 use_recorded: bool = False, scale: float = 1.0):
+        self.base = base
+        self.jitter = jitter
+        self.use_recorded = use_recorded
+        self.scale = scale
+
+    def delay(self, recorded: float, rng: random.Random) -> float:
+        if self.use_recorded:
+            return recorded * self.scale
+        return self.base + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+
+class ErrorProfile:
+    """Inject throttling/server errors into a replay with the given probability."""
+
+    def __init__(self, rate: float = 0.0, status: int = 503, retry_after: Optional[float] = None):
+        self.rate = rate
+        self.status = status
+        self.retry_after = retry_after
+
+
+class ReplayTransport(Transport):
+    """Serve recorded responses from a cassette without any network access.
+
+    Alias batches that were grouped differently during recording are
+    rebuilt from the individually recorded lookups.
+    """
+
+    def __init__(self, cassette_path: str,
+                 latency: Optional[LatencyProfile] = None,
+                 errors: Optional[ErrorProfile] = None,
+                 seed: Optional[int] = None):
+        self.cassette = Cassette.load(cassette_path)
+        self.latency = latency or LatencyProfile()
+        self.errors = errors or ErrorProfile()
+        self._rng = random.Random(seed)
+        self._positions: Dict[str, int] = {}
+        self.latencies: List[float] = []
+        self.counters = {"replayed": 0, "composed": 0, "injected_errors": 0, "misses": 0}
+
+    @asynccontextmanager
+    async def post(self, url: str, payload: Dict[str, Any]):
+        key = request_key(payload["query"], payload.get("variables"))
+        recorded = self.cassette.interactions.get(key)
+        if recorded:
+            # Mehrfach aufgezeichnete Requests werden der Reihe nach abgespielt
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            interaction = recorded[position % len(recorded)]
+        else:
+            operation = operation_name(payload["query"])
+            body = self.cassette.compose(operation, payload.get("variables") or {})
+            if body is None:
+                self.counters["misses"] += 1
+                raise CassetteMiss(f"Request nicht in Cassette: {operation} {payload.get('variables')}")
+            self.counters["composed"] += 1
+            interaction = {"response": {"status": 200, "body": body.decode('utf-8')}, "elapsed": 0.0}
+
+        delay = self.latency.delay(interaction.get("elapsed", 0.0), self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+        self.latencies.append(delay)
+
+        if self.errors.rate and self._rng.random() < self.errors.rate:
+            self.counters["injected_errors"] += 1
+            headers = {"Retry-After": str(self.errors.retry_after)} if self.errors.retry_after else {}
+            yield BufferedResponse(self.errors.status, b'{"errors": ["injected"]}', headers)
+            return
+
+        self.counters["replayed"] += 1
+        response = interaction["response"]
+        yield BufferedResponse(response["status"], response["body"].encode('utf-8'), response.get("headers"))
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {**self.counters, "p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99)}
+
+
+def transport_from_env() -> Transport:
+    """Build the transport selected by FWT_RANKINGS_TRANSPORT (live, record or replay)."""
+    mode = os.environ.get(TRANSPORT_ENV, "live").lower()
+    if mode == "live":
+        return AiohttpTransport()
+    cassette_path = os.environ.get(CASSETTE_ENV)
+    if not cassette_path:
+        raise ValueError(f"{TRANSPORT_ENV}={mode} benötigt {CASSETTE_ENV}")
+    if mode == "record":
+        return RecordingTransport(cassette_path)
+    if mode == "replay":
+        return ReplayTransport(cassette_path)
+    raise ValueError(f"Unbekannter Transport: {mode}")
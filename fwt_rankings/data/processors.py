@@ -1,11 +1,15 @@
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from .models import (
     Athlete, EventResult, SeriesResult, 
     AthleteStats, RankingsData
 )
+from .series_policy import get_default_series_policy
+from ..utils.logging import get_logger
 import re
 
+logger = get_logger(__name__)
+
 class RankingsProcessor:
     @staticmethod
     def extract_year_from_series(series_name: str) -> int:
@@ -63,6 +67,37 @@ class RankingsProcessor:
             results=[]
         )
 
+    @staticmethod
+    def build_new_athlete_series(athlete_ids, athlete_details: Dict[str, Dict]) -> Optional[Dict]:
+        """Build the raw 'New Athlete' series for athletes without any rankings."""
+        empty_series = {
+            'series_id': 'new_athlete',
+            'series_name': 'New Athlete',
+            'divisions': {'New Athletes': []}
+        }
+        
+        # Füge jeden Athleten ohne Ergebnisse hinzu
+        for athlete_id in athlete_ids:
+            # Hole gespeicherte Athleten-Details
+            athlete_data = athlete_details.get(athlete_id)
+            if athlete_data:
+                empty_series['divisions']['New Athletes'].append({
+                    'athlete': {
+                        'id': athlete_id,
+                        'name': athlete_data['name'],
+                        'nationality': athlete_data.get('nationality'),
+                        'dob': athlete_data.get('dob'),
+                        'image': athlete_data.get('image')
+                    },
+                    'place': None,
+                    'points': None,
+                    'results': []
+                })
+            else:
+                logger.warning(f"Keine Details gefunden für Athlet ID: {athlete_id}")
+        
+        return empty_series if empty_series['divisions']['New Athletes'] else None
+
     @staticmethod
     def calculate_athlete_stats(series_results: List[SeriesResult]) -> AthleteStats:
         """Calculate athlete statistics."""
@@ -91,11 +126,11 @@ class RankingsProcessor:
         unique_seasons = {RankingsProcessor.extract_year_from_series(r.series_name) 
                       for r in series_results if r and r.series_name and r.series_name != "New Athlete"}
         
+        policy = get_default_series_policy()
         relevant_series = [
             r for r in series_results
             if r and r.series_name  # Stelle sicher, dass die Serie gültig ist
-            and not any(term.lower() in r.series_name.lower()
-                        for term in ["National Ranking", "Seeding List"])  # Filtere irrelevante Serien
+            and policy.is_included(r.series_name)  # Filtere irrelevante Serien
         ]
 
 
@@ -116,7 +151,7 @@ class RankingsProcessor:
             # Track best series result by overall place
             if result.place and \
             (not best_series_by_place or result.place < best_series_by_place.place) and \
-            not any(term.lower() in result.series_name.lower() for term in ["National Ranking", "Seeding List"]):
+            policy.is_included(result.series_name):
                 best_series_by_place = result
 
             # Best Pro Event
@@ -172,60 +207,73 @@ class RankingsProcessor:
             best_challenger_event=best_challenger_by_event
         )
 
-    def process_rankings(self, raw_data: Dict, bib_mapping: Dict[str, str]) -> List[RankingsData]:
-        """Process raw rankings data into structured format."""
-        rankings_data = []
-        athlete_processed = set()  # Track processed athletes
-        
-        # Verarbeite alle Series-Ergebnisse
-        for series_data in raw_data.get('results', []):
+    def process_from_warehouse(self, warehouse, athlete_ids: List[str], bib_mapping: Dict[str, str],
+                               athlete_details: Optional[Dict[str, Dict]] = None,
+                               min_year: Optional[int] = None,
+                               live_series_ids: Optional[List[str]] = None,
+                               live_results: Optional[List[Dict]] = None) -> List[RankingsData]:
+        """Process rankings read from the local warehouse instead of the Liveheats API.
+
+        ``live_results`` are the results of ``fetch_multiple_series`` for
+        ``live_series_ids`` (the running season); they replace the stored tables.
+        """
+        live = dict.fromkeys(str(series_id) for series_id in live_series_ids or [])
+        live.update({
+            str(r["series_id"]): r for r in live_results or []
+            if r.get("series_id") != "new_athlete"
+        })
+        raw_results = warehouse.load_results(athlete_ids, athlete_details, min_year, live)
+        return self.process_rankings({"results": raw_results}, bib_mapping)
+
+    @staticmethod
+    def group_by_athlete(series_list: List[Dict]) -> Dict[str, List[Tuple[str, str, Dict]]]:
+        """Bucket raw rankings per athlete: ``{athlete_id: [(series_name, division_name, ranking), ...]}``.
+
+        One pass over all rows; buckets keep the order of ``series_list``.
+        """
+        buckets: Dict[str, List[Tuple[str, str, Dict]]] = {}
+        for series_data in series_list:
             if not series_data:
                 continue
-                
             series_name = series_data['series_name']
-            
             for division_name, rankings in series_data['divisions'].items():
                 for ranking in rankings:
-                    athlete_data = ranking.get('athlete', {})
-                    if not athlete_data:
-                        continue
-                        
-                    athlete_id = athlete_data.get('id')
-                    if not athlete_id:
-                        continue
+                    athlete_id = (ranking.get('athlete') or {}).get('id')
+                    if athlete_id:
+                        buckets.setdefault(athlete_id, []).append((series_name, division_name, ranking))
+        return buckets
 
-                    # Create or update athlete object
-                    athlete = Athlete(
-                        id=athlete_id,
-                        name=athlete_data.get('name', 'Unknown'),
-                        nationality=athlete_data.get('nationality'),
-                        dob=datetime.fromisoformat(athlete_data['dob'].replace('Z', '+00:00')) if athlete_data.get('dob') else None,
-                        image=athlete_data.get('image'),
-                        bib=bib_mapping.get(athlete_id)
-                    )
+    def process_rankings(self, raw_data: Dict, bib_mapping: Dict[str, str]) -> List[RankingsData]:
+        """Process raw rankings data into structured format."""
+        rankings_data = []
+        athlete_processed = set()  # Track processed athletes
+        
+        # Verarbeite alle Series-Ergebnisse, gruppiert nach Athlet
+        for athlete_id, entries in self.group_by_athlete(raw_data.get('results', [])).items():
+            athlete_data = entries[0][2]['athlete']
+            athlete = Athlete(
+                id=athlete_id,
+                name=athlete_data.get('name', 'Unknown'),
+                nationality=athlete_data.get('nationality'),
+                dob=datetime.fromisoformat(athlete_data['dob'].replace('Z', '+00:00')) if athlete_data.get('dob') else None,
+                image=athlete_data.get('image'),
+                bib=bib_mapping.get(athlete_id)
+            )
 
-                    # Process series result
-                    series_result = self.process_series_result(series_name, division_name, ranking)
-                    if not series_result:
-                        continue
+            series_results = []
+            for series_name, division_name, ranking in entries:
+                series_result = self.process_series_result(series_name, division_name, ranking)
+                if series_result:
+                    series_results.append(series_result)
+            if not series_results:
+                continue
 
-                    # Find or create rankings data for this athlete
-                    athlete_rankings = next(
-                        (r for r in rankings_data if r.athlete.id == athlete.id),
-                        None
-                    )
-                    
-                    if athlete_rankings:
-                        athlete_rankings.series_results.append(series_result)
-                    else:
-                        athlete_rankings = RankingsData(
-                            athlete=athlete,
-                            stats=None,  # Will be calculated later
-                            series_results=[series_result]
-                        )
-                        rankings_data.append(athlete_rankings)
-                    
-                    athlete_processed.add(athlete_id)
+            rankings_data.append(RankingsData(
+                athlete=athlete,
+                stats=None,  # Will be calculated later
+                series_results=series_results
+            ))
+            athlete_processed.add(athlete_id)
 
         # Verarbeite Athleten ohne Ergebnisse
         for athlete_id, bib in bib_mapping.items():
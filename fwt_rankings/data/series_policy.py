@@ -0,0 +1,61 @@
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Series, die nicht in den Report gehören (Teilbegriffe, ohne Groß-/Kleinschreibung)
+DEFAULT_EXCLUDE_TERMS = ("National Ranking", "Seeding List")
+
+# Kommagetrennte Begriffe, überschreiben die Standardliste
+SERIES_EXCLUDE_ENV = "FWT_RANKINGS_SERIES_EXCLUDE"
+SERIES_INCLUDE_ENV = "FWT_RANKINGS_SERIES_INCLUDE"
+
+
+def _terms_from_env(name: str) -> Optional[Tuple[str, ...]]:
+    value = os.environ.get(name)
+    if value is None:
+        return None
+    return tuple(term.strip() for term in value.split(",") if term.strip())
+
+
+class SeriesPolicy:
+    """Decide from its name whether a series belongs in the rankings report.
+
+    A series is excluded if its name contains any exclude term. If include
+    terms are set, it must additionally contain one of them.
+    """
+
+    def __init__(self, exclude_terms: Sequence[str] = DEFAULT_EXCLUDE_TERMS,
+                 include_terms: Optional[Sequence[str]] = None):
+        self.exclude_terms = tuple(term.lower() for term in exclude_terms)
+        self.include_terms = tuple(term.lower() for term in include_terms) if include_terms else None
+
+    @classmethod
+    def from_env(cls) -> "SeriesPolicy":
+        exclude_terms = _terms_from_env(SERIES_EXCLUDE_ENV)
+        return cls(
+            exclude_terms=DEFAULT_EXCLUDE_TERMS if exclude_terms is None else exclude_terms,
+            include_terms=_terms_from_env(SERIES_INCLUDE_ENV),
+        )
+
+    def is_included(self, series_name: str) -> bool:
+        name = series_name.lower()
+        if any(term in name for term in self.exclude_terms):
+            return False
+        return self.include_terms is None or any(term in name for term in self.include_terms)
+
+    def classify(self, series_list: Iterable[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Split series dicts (with ``name``) into ``(included, excluded)``."""
+        included, excluded = [], []
+        for series in series_list:
+            (included if self.is_included(series.get("name", "")) else excluded).append(series)
+        return included, excluded
+
+
+_default_policy: Optional[SeriesPolicy] = None
+
+
+def get_default_series_policy() -> SeriesPolicy:
+    """Return the series policy configured via environment (or the default terms)."""
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = SeriesPolicy.from_env()
+    return _default_policy
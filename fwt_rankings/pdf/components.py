@@ -1,3 +1,53 @@
+import math
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+
+class ChartStyle(NamedTuple):
+    """Visual parameters of the performance chart; part of the chart cache key."""
+    title: str = 'Performance Development'
+    # Linienfarbe wie die bisherige Matplotlib-Standardfarbe
+    line_color: Tuple[int, int, int] = (31, 119, 180)
+    grid_color: Tuple[int, int, int] = (220, 220, 220)
+    line_width: float = 0.5
+    marker_radius: float = 0.8
+    label_size: float = 6
+    title_size: float = 7
+
+
+DEFAULT_CHART_STYLE = ChartStyle()
+
+# Viele Athleten teilen dieselbe Platzierungsfolge (z.B. nur eine Saison); deren Charts werden pro Report nur
+# einmal berechnet. Der Cache lebt nur im Render-Prozess: jeder /generate_pdf-Aufruf und jeder Render-Worker
+# beginnt leer, über Reports hinweg wird nichts geteilt.
+CHART_CACHE_SIZE = 1024
+_chart_cache: "OrderedDict[tuple, Tuple[tuple, ...]]" = OrderedDict()
+chart_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def chart_key(points: Sequence[Tuple[int, float]], w: float, h: float,
+              style: ChartStyle = DEFAULT_CHART_STYLE) -> tuple:
+    """Cache key of a chart: normalized ``(year, place)`` tuple, size and style."""
+    normalized = tuple(sorted((int(year), float(place)) for year, place in points))
+    return normalized, round(w, 3), round(h, 3), style
+
+
+def _store_chart(key: tuple, operations: Tuple[tuple, ...]):
+    _chart_cache[key] = operations
+    while len(_chart_cache) > CHART_CACHE_SIZE:
+        _chart_cache.popitem(last=False)
+        chart_cache_stats["evictions"] += 1
+
+
+def chart_ticks(low: float, high: float, max_ticks: int = 5) -> List[int]:
+    """Integer tick positions with a 1/2/5 step covering ``low``..``high``."""
+    raw_step = max(1.0, (high - low) / max(1, max_ticks - 1))
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    first = math.ceil(low / step) * step
+    return [int(first + i * step) for i in range(int((high - first) // step) + 1)]
+
+
 class PDFComponents:
     def __init__(self, pdf):
         self.pdf = pdf
@@ -118,3 +168,116 @@ class PDFComponents:
 
 
         self.pdf.ln(5)
+
+    def add_performance_chart(self, points: Sequence[Tuple[int, float]], x: float, y: float,
+                              w: float, h: float = 35, style: ChartStyle = DEFAULT_CHART_STYLE):
+        """Draw the yearly best-place line chart with vector primitives.
+
+        ``points`` are ``(year, place)`` pairs sorted by year; better places are
+        drawn on top. Within one rendering process the drawing operations are
+        memoized per placement series and style, so repeated charts of a
+        report are only replayed at a new position.
+        """
+        if not points:
+            return
+        key = chart_key(points, w, h, style)
+        operations = _chart_cache.get(key)
+        if operations is None:
+            chart_cache_stats["misses"] += 1
+            operations = self._build_chart(key[0], w, h, style)
+            _store_chart(key, operations)
+        else:
+            _chart_cache.move_to_end(key)
+            chart_cache_stats["hits"] += 1
+        self._replay_chart(operations, x, y)
+
+    def _build_chart(self, points: Tuple[Tuple[int, float], ...], w: float, h: float,
+                     style: ChartStyle) -> Tuple[tuple, ...]:
+        """Lay out the chart at the origin as a sequence of drawing operations."""
+        operations = []
+        years = [year for year, _ in points]
+        places = [place for _, place in points]
+
+        # Zeichenfläche: Platz für Titel oben, Achsenbeschriftungen links und unten
+        left, right = 10, w - 2
+        top, bottom = 5, h - 8
+        year_lo, year_hi = (min(years) - 1, max(years) + 1) if len(set(years)) == 1 else (min(years), max(years))
+        place_lo, place_hi = (min(places) - 1, max(places) + 1) if len(set(places)) == 1 else (min(places), max(places))
+        # 5 % Rand wie bei Matplotlib, damit Marker nicht auf den Achsen liegen
+        year_pad = (year_hi - year_lo) * 0.05
+        place_pad = (place_hi - place_lo) * 0.05
+
+        def to_x(year: float) -> float:
+            return left + (year - year_lo + year_pad) / (year_hi - year_lo + 2 * year_pad) * (right - left)
+
+        def to_y(place: float) -> float:
+            # Invertierte Achse: Platz 1 oben
+            return top + (place - place_lo + place_pad) / (place_hi - place_lo + 2 * place_pad) * (bottom - top)
+
+        def width(text: str, font_style: str, size: float) -> float:
+            self.pdf.use_unicode_font(font_style, size)
+            return self.pdf.get_string_width(text)
+
+        # Weißer Hintergrund, der Chart liegt teilweise über der Statistik-Box
+        operations += [("fill_color", (255, 255, 255)), ("fill_rect", 0, 0, w, h)]
+        operations += [("line_width", 0.1), ("draw_color", style.grid_color), ("font", "normal", style.label_size)]
+        for year in chart_ticks(year_lo, year_hi):
+            label = str(year)
+            operations.append(("line", to_x(year), top, to_x(year), bottom))
+            operations.append(("text", to_x(year) - width(label, "normal", style.label_size) / 2, bottom + 3, label))
+        for place in chart_ticks(max(1, place_lo), place_hi):
+            label = str(place)
+            operations.append(("line", left, to_y(place), right, to_y(place)))
+            operations.append(("text", left - 1 - width(label, "normal", style.label_size), to_y(place) + 0.8, label))
+
+        operations += [
+            ("draw_color", (0, 0, 0)),
+            ("rect", left, top, right - left, bottom - top),
+            ("text", (left + right - width("Year", "normal", style.label_size)) / 2, bottom + 6.5, "Year"),
+            ("rotated_text", 90, 2.5, (top + bottom) / 2,
+             2.5 - width("Place", "normal", style.label_size) / 2, (top + bottom) / 2, "Place"),
+            ("font", "bold", style.title_size),
+            ("text", (left + right - width(style.title, "bold", style.title_size)) / 2, 3.5, style.title),
+        ]
+
+        coordinates = tuple((to_x(year), to_y(place)) for year, place in points)
+        operations += [
+            ("draw_color", style.line_color),
+            ("fill_color", style.line_color),
+            ("line_width", style.line_width),
+        ]
+        if len(coordinates) > 1:
+            operations.append(("polyline", coordinates))
+        radius = style.marker_radius
+        operations += [("ellipse", cx - radius, cy - radius, 2 * radius, 2 * radius) for cx, cy in coordinates]
+        operations += [("draw_color", (0, 0, 0)), ("line_width", 0.2)]
+        return tuple(operations)
+
+    def _replay_chart(self, operations: Sequence[tuple], x: float, y: float):
+        """Draw memoized chart operations with the chart's top-left corner at ``x``/``y``."""
+        pdf = self.pdf
+        for operation, *args in operations:
+            if operation == "line":
+                pdf.line(x + args[0], y + args[1], x + args[2], y + args[3])
+            elif operation == "text":
+                pdf.text(x + args[0], y + args[1], args[2])
+            elif operation == "ellipse":
+                pdf.ellipse(x + args[0], y + args[1], args[2], args[3], 'F')
+            elif operation == "polyline":
+                pdf.polyline([(x + px, y + py) for px, py in args[0]])
+            elif operation == "rect":
+                pdf.rect(x + args[0], y + args[1], args[2], args[3])
+            elif operation == "fill_rect":
+                pdf.rect(x + args[0], y + args[1], args[2], args[3], 'F')
+            elif operation == "rotated_text":
+                angle, cx, cy, tx, ty, text = args
+                with pdf.rotation(angle, x + cx, y + cy):
+                    pdf.text(x + tx, y + ty, text)
+            elif operation == "font":
+                pdf.use_unicode_font(args[0], args[1])
+            elif operation == "draw_color":
+                pdf.set_draw_color(*args[0])
+            elif operation == "fill_color":
+                pdf.set_fill_color(*args[0])
+            elif operation == "line_width":
+                pdf.set_line_width(args[0])
@@ -1,17 +1,67 @@
 from fpdf import FPDF
-import tempfile
-from PIL import Image
-import matplotlib.pyplot as plt
 from datetime import datetime
 import os
-from typing import List, Optional, Dict
+import math
+from typing import List, Optional, Dict, Tuple
 import requests
 from io import BytesIO
 from ..data.models import RankingsData, SeriesResult
+from ..data.series_policy import SeriesPolicy, get_default_series_policy
 from .components import PDFComponents
+from .images import ImagePipeline, get_default_image_pipeline
+from ..api.queries import ATHLETE_IMAGE_WIDTH_MM
 from .styles import PDFStyles
+from ..utils.logging import get_logger
+from concurrent.futures import ProcessPoolExecutor
 import unicodedata
 
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # ohne pypdf wird sequentiell gerendert
+    PdfReader = PdfWriter = None
+
+logger = get_logger(__name__)
+
+# Anzahl Render-Prozesse; 1 = sequentiell, leer = Anzahl CPU-Kerne (höchstens MAX_DEFAULT_RENDER_WORKERS)
+RENDER_WORKERS_ENV = "FWT_RANKINGS_RENDER_WORKERS"
+MAX_DEFAULT_RENDER_WORKERS = 4
+# Darunter lohnt sich das Starten der Prozesse nicht
+MIN_PARALLEL_ATHLETES = 24
+# Teile pro Prozess, damit ungleich lange Athleten-Seiten die Last nicht blockieren
+CHUNKS_PER_WORKER = 2
+
+
+def default_render_workers() -> int:
+    value = os.environ.get(RENDER_WORKERS_ENV, "").strip()
+    if value.isdigit():
+        return max(1, int(value))
+    return max(1, min(os.cpu_count() or 1, MAX_DEFAULT_RENDER_WORKERS))
+
+
+_warned_no_pypdf = False
+
+
+def _warn_no_pypdf():
+    global _warned_no_pypdf
+    if not _warned_no_pypdf:
+        _warned_no_pypdf = True
+        logger.warning("Paralleles Rendern angefordert, aber pypdf fehlt (pip install pypdf); rendere sequentiell")
+
+
+def _init_render_worker():
+    # Font-Parser und Schriftdateien einmal pro Prozess aufwärmen, bevor der erste Teil kommt
+    RankingsPDF.preload_fonts()
+
+
+def _render_chunk(chunk: List[RankingsData], images: Dict[str, bytes]) -> bytes:
+    """Render the pages of ``chunk`` into a partial PDF without page numbers (runs in a worker process)."""
+    generator = RankingsReportGenerator(image_pipeline=ImagePipeline(use_disk_cache=False))
+    generator.pdf.show_page_numbers = False
+    generator.prefetched_images = images
+    for data in chunk:
+        generator._add_athlete_page(data)
+    return bytes(generator.pdf.output())
+
 class RankingsPDF(FPDF):
     """Enhanced PDF class with Unicode support and safe text handling."""
     
@@ -20,6 +70,8 @@ class RankingsPDF(FPDF):
         self.set_auto_page_break(auto=True, margin=15)
         self.styles = PDFStyles()
         self.components = PDFComponents(self)
+        # Parallel gerenderte Teile bekommen ihre Seitenzahlen erst nach dem Zusammenfügen
+        self.show_page_numbers = True
         
         # Initialize Unicode fonts
         self.add_unicode_fonts()
@@ -30,6 +82,19 @@ class RankingsPDF(FPDF):
         self.cell(0, 10, 'FWT Rankings Report', 0, 0, 'R')
         self.ln(10)
 
+    def footer(self):
+        """Add the page number to each page."""
+        if not self.show_page_numbers:
+            return
+        self.set_y(-12)
+        self.use_unicode_font('normal', 8)
+        self.cell(0, 10, f'Page {self.page_no()} of {{nb}}', 0, 0, 'C')
+
+    @classmethod
+    def preload_fonts(cls):
+        """Download missing font files and warm up font parsing in this process."""
+        cls()
+
     def add_unicode_fonts(self):
         """Add fonts with Unicode support."""
         fonts_dir = os.path.join(os.path.dirname(__file__), 'fonts')
@@ -87,62 +152,53 @@ class RankingsPDF(FPDF):
         safe_txt = self.safe_text(txt)
         self.cell(w, h, safe_txt, border, ln, align, fill)
 
+class PageNumberStamp(RankingsPDF):
+    """Blank pages carrying only the footer, laid over a merged report."""
+
+    def header(self):
+        pass
+
+    @classmethod
+    def build(cls, page_count: int) -> bytes:
+        stamp = cls()
+        for _ in range(page_count):
+            stamp.add_page()
+        return bytes(stamp.output())
+
 class RankingsReportGenerator:
     """Main class for generating ranking reports."""
     
-    def __init__(self):
+    def __init__(self, series_policy: Optional[SeriesPolicy] = None,
+                 image_pipeline: Optional[ImagePipeline] = None):
         self.pdf = RankingsPDF()
-        self.temp_files = []
+        self.series_policy = series_policy or get_default_series_policy()
+        # Fotos kommen bereits verkleinert und als kompaktes JPEG aus der Pipeline
+        self.images = image_pipeline or get_default_image_pipeline()
+        # Vor dem Layout geladene Fotos (URL -> JPEG-Bytes); das Layout lädt selbst nichts nach
+        self.prefetched_images: Dict[str, bytes] = {}
         self.components = PDFComponents(self.pdf)
 
-    def _download_image(self, url: str, athlete_name: str) -> Optional[str]:
-        """Download and save athlete image temporarily."""
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                img = Image.open(BytesIO(response.content))
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-                img.convert('RGB').save(temp_file.name, 'JPEG')
-                self.temp_files.append(temp_file.name)
-                return temp_file.name
-        except Exception as e:
-            print(f"Error downloading image for {athlete_name}: {e}")
-        return None
+    def _prefetch_images(self, rankings_data: List[RankingsData]):
+        """Download all athlete photos of the report concurrently before layout."""
+        self.prefetched_images = self.images.prefetch(
+            data.athlete.image for data in rankings_data if data.athlete.image
+        )
 
-    def _create_performance_chart(self, series_results: List[SeriesResult]) -> Optional[str]:
-        """Create performance development chart."""
-        try:
-            placements = {}
-            for series in series_results:
-                if series.series_year not in placements:
-                    placements[series.series_year] = float('inf')
+    def _athlete_image(self, url: str) -> Optional[BytesIO]:
+        """Return a prefetched athlete image as an in-memory JPEG."""
+        data = self.prefetched_images.get(url)
+        # fpdf2 bettet JPEGs unverändert ein und erkennt gleiche Bilder am Inhalt
+        return BytesIO(data) if data is not None else None
+
+    def _yearly_best_places(self, series_results: List[SeriesResult]) -> List[Tuple[int, float]]:
+        """Best place per year, sorted by year; years without a place are left out."""
+        placements = {}
+        for series in series_results:
+            if series.place:
                 placements[series.series_year] = min(
-                    placements[series.series_year],
-                    float(series.place) if series.place else float('inf')
+                    placements.get(series.series_year, float('inf')), float(series.place)
                 )
-
-            if placements:
-                years = sorted(placements.keys())
-                places = [placements[year] for year in years]
-
-                plt.figure(figsize=(4, 2))
-                plt.plot(years, places, marker='o', linestyle='-', linewidth=2)
-                plt.gca().invert_yaxis()
-                plt.title('Performance Development')
-                plt.xlabel('Year')
-                plt.ylabel('Place')
-                plt.grid(True)
-
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                plt.savefig(temp_file.name, bbox_inches='tight')
-                plt.close()
-
-                self.temp_files.append(temp_file.name)
-                return temp_file.name
-
-        except Exception as e:
-            print(f"Error creating chart: {e}")
-        return None
+        return sorted((year, place) for year, place in placements.items() if math.isfinite(place))
     
     def calculate_age(self, dob: datetime) -> Optional[int]:
         """Calculate age from date of birth."""
@@ -166,10 +222,10 @@ class RankingsReportGenerator:
 
         # Athlete image
         if data.athlete.image:
-            image_file = self._download_image(data.athlete.image, data.athlete.name)
-            if image_file:
+            image = self._athlete_image(data.athlete.image)
+            if image:
                 try:
-                    self.pdf.image(image_file,
+                    self.pdf.image(image,
                                  x=self.pdf.w - self.pdf.r_margin - image_width,
                                  y=self.pdf.t_margin,
                                  w=image_width)
@@ -381,68 +437,118 @@ class RankingsReportGenerator:
 
     def _filter_series(self, series_results: List[SeriesResult]) -> List[SeriesResult]:
         """Filter out unwanted series like seeding lists and national rankings."""
-        excluded_terms = [
-            "National Rankings",
-            "Seeding List"
-        ]
-        
-        filtered = [
+        # Dieselbe Policy wie beim Laden; greift hier nur noch für Daten aus älteren Quellen
+        return [
             series for series in series_results
-            if not any(term.lower() in series.series_name.lower() for term in excluded_terms)
+            if series.series_name == "New Athlete" or self.series_policy.is_included(series.series_name)
         ]
-            
-        return filtered
 
-    def generate_report(self, rankings_data: List[RankingsData], output_file: str):
-        """Generate complete PDF report."""
+    def _add_athlete_page(self, data: RankingsData):
+        """Render the page(s) of one athlete."""
+        self.pdf.add_page()
+
+        # Layout calculations
+        image_width = ATHLETE_IMAGE_WIDTH_MM
+        text_width = self.pdf.w - self.pdf.l_margin - self.pdf.r_margin - image_width - 10
+
+        # Add main sections
+        self._add_athlete_section(data, image_width, text_width)
+        self._add_stats_section(data)
+        
+        # Performance Chart
         try:
-            # Sort athletes by BIB number
-            sorted_athletes = sorted(
-                rankings_data,
-                key=lambda x: int(x.athlete.bib) if x.athlete.bib and x.athlete.bib.isdigit() else float('inf')
+            self.components.add_performance_chart(
+                self._yearly_best_places(data.series_results),
+                x=self.pdf.w - self.pdf.r_margin - image_width,
+                y=self.pdf.t_margin + image_width + 5,
+                w=image_width
             )
+        except Exception as e:
+            print(f"Error creating chart: {e}")
 
-            for data in sorted_athletes:
-                # Filter series before processing
-                filtered_series = self._filter_series(data.series_results)
-                if not filtered_series:
-                    print(f"Skipping {data.athlete.name} - no relevant series found")
-                    continue
-                    
-                # Replace original series with filtered ones
-                data.series_results = filtered_series
-                
-                self.pdf.add_page()
+        # Add series results
+        self._add_series_results(data.series_results)
+
+    def _render_sequential(self, report_athletes: List[RankingsData], output_file: str):
+        for data in report_athletes:
+            self._add_athlete_page(data)
+        self.pdf.output(output_file)
+
+    def _render_parallel(self, report_athletes: List[RankingsData], output_file: str, workers: int):
+        """Render contiguous chunks in worker processes and merge them in BIB order.
+
+        The parts carry no page numbers; once the page count of the merged
+        document is known, the footers are stamped onto every page.
+        """
+        chunk_count = min(len(report_athletes), workers * CHUNKS_PER_WORKER)
+        chunk_size = -(-len(report_athletes) // chunk_count)
+        chunks = [report_athletes[i:i + chunk_size] for i in range(0, len(report_athletes), chunk_size)]
+        images = [
+            {data.athlete.image: self.prefetched_images[data.athlete.image]
+             for data in chunk if data.athlete.image in self.prefetched_images}
+            for chunk in chunks
+        ]
 
-                # Layout calculations
-                image_width = 60
-                text_width = self.pdf.w - self.pdf.l_margin - self.pdf.r_margin - image_width - 10
+        # Schriften im Hauptprozess laden, damit die Worker nicht gleichzeitig herunterladen
+        RankingsPDF.preload_fonts()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as pool:
+            parts = list(pool.map(_render_chunk, chunks, images))
+
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(PdfReader(BytesIO(part)))
+        # Seitenzahlen über das ganze Dokument, wie beim sequentiellen Rendern
+        stamps = PdfReader(BytesIO(PageNumberStamp.build(len(writer.pages))))
+        for page, stamp in zip(writer.pages, stamps.pages):
+            page.merge_page(stamp)
+        if hasattr(writer, "compress_identical_objects"):
+            # Jeder Teil bringt eigene Kopien gemeinsamer Bilder mit
+            writer.compress_identical_objects()
+        with open(output_file, "wb") as f:
+            writer.write(f)
+        logger.info(f"{len(report_athletes)} Athleten in {len(chunks)} Teilen auf {workers} Prozessen gerendert")
+
+    def generate_report(self, rankings_data: List[RankingsData], output_file: str,
+                        workers: Optional[int] = None):
+        """Generate complete PDF report.
+
+        With ``workers`` > 1 (default: ``FWT_RANKINGS_RENDER_WORKERS`` or the
+        number of CPU cores, at most ``MAX_DEFAULT_RENDER_WORKERS``) pages are
+        rendered in parallel processes if ``pypdf`` is installed; otherwise
+        sequentially.
+        """
+        # Sort athletes by BIB number
+        sorted_athletes = sorted(
+            rankings_data,
+            key=lambda x: int(x.athlete.bib) if x.athlete.bib and x.athlete.bib.isdigit() else float('inf')
+        )
 
-                # Add main sections
-                self._add_athlete_section(data, image_width, text_width)
-                self._add_stats_section(data)
+        report_athletes = []
+        for data in sorted_athletes:
+            # Filter series before processing
+            filtered_series = self._filter_series(data.series_results)
+            if not filtered_series:
+                print(f"Skipping {data.athlete.name} - no relevant series found")
+                continue
                 
-                # Performance Chart
-                chart_file = self._create_performance_chart(data.series_results)
-                if chart_file:
-                    self.pdf.image(chart_file,
-                                 x=self.pdf.w - self.pdf.r_margin - image_width,
-                                 y=self.pdf.t_margin + image_width + 5,
-                                 w=image_width)
-
-                # Add series results
-                self._add_series_results(data.series_results)
-
-            # Save the PDF
-            self.pdf.output(output_file)
-            print(f"Report generated: {output_file}")
+            # Replace original series with filtered ones
+            data.series_results = filtered_series
+            report_athletes.append(data)
+
+        # Alle Fotos parallel laden, bevor die erste Seite gesetzt wird
+        self._prefetch_images(report_athletes)
+
+        workers = default_render_workers() if workers is None else workers
+        if workers > 1 and PdfWriter is None:
+            _warn_no_pypdf()
+        if workers > 1 and len(report_athletes) >= MIN_PARALLEL_ATHLETES and PdfWriter is not None:
+            try:
+                self._render_parallel(report_athletes, output_file, workers)
+            except Exception as e:
+                logger.warning(f"Paralleles Rendern fehlgeschlagen, rendere sequentiell: {e}")
+                self._render_sequential(report_athletes, output_file)
+        else:
+            self._render_sequential(report_athletes, output_file)
 
-        finally:
-            # Cleanup
-            plt.close('all')
-            for temp_file in self.temp_files:
-                try:
-                    if os.path.exists(temp_file):
-                        os.unlink(temp_file)
-                except Exception as e:
-                    print(f"Warning: Could not delete temporary file {temp_file}: {e}")
\ No newline at end of file
+        print(f"Report generated: {output_file}")
+        logger.info(f"Bild-Pipeline: {self.images.stats()}")
@@ -0,0 +1,213 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+from ..utils.logging import get_logger
+from ..utils.paths import get_cache_dir
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 300 * 1024 * 1024
+# Nach dieser Zeit wird ein Bild per ETag/Last-Modified beim Server revalidiert
+DEFAULT_REVALIDATE_AFTER = 24 * 60 * 60
+IMAGE_CACHE_ENV = "FWT_RANKINGS_IMAGE_CACHE"
+IMAGE_CACHE_MB_ENV = "FWT_RANKINGS_IMAGE_CACHE_MB"
+
+
+class CachedImage(NamedTuple):
+    data: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImageCache:
+    """Content-addressed on-disk cache of PDF-ready athlete images.
+
+    Processed JPEGs are stored once per content hash under ``objects/``;
+    a SQLite index maps ``(url, variant)`` to the object together with the
+    validators of the source response and the hash of the source image, so
+    identical photos behind different URLs are processed only once. The
+    total object size is capped with LRU eviction.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 revalidate_after: float = DEFAULT_REVALIDATE_AFTER):
+        self.root = Path(path) if path else get_cache_dir("images")
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.counters = {"hits": 0, "stale": 0, "misses": 0, "shared": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "index.sqlite"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                url TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                object TEXT NOT NULL,
+                source_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                checked REAL NOT NULL,
+                PRIMARY KEY (url, variant)
+            );
+            CREATE INDEX IF NOT EXISTS idx_images_source ON images (source_hash, variant);
+            CREATE TABLE IF NOT EXISTS objects (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_objects_accessed ON objects (accessed);
+            """
+        )
+        self._conn.commit()
+
+    def _object_path(self, object_hash: str) -> Path:
+        return self.objects_dir / object_hash[:2] / f"{object_hash}.jpg"
+
+    def _read_object(self, object_hash: str) -> Optional[bytes]:
+        try:
+            data = self._object_path(object_hash).read_bytes()
+        except OSError:
+            return None
+        self._conn.execute("UPDATE objects SET accessed = ? WHERE hash = ?", (time.time(), object_hash))
+        return data
+
+    def get(self, url: str, variant: str) -> Optional[CachedImage]:
+        """Return the cached variant of ``url``; ``fresh`` is False once it needs revalidation."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT object, etag, last_modified, checked FROM images WHERE url = ? AND variant = ?",
+                (url, variant)
+            ).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            object_hash, etag, last_modified, checked = row
+            data = self._read_object(object_hash)
+            if data is None:
+                # Datei wurde außerhalb gelöscht
+                self._conn.execute("DELETE FROM images WHERE url = ? AND variant = ?", (url, variant))
+                self._conn.commit()
+                self.counters["misses"] += 1
+                return None
+            self._conn.commit()
+            fresh = time.time() - checked < self.revalidate_after
+            self.counters["hits" if fresh else "stale"] += 1
+            return CachedImage(data, etag, last_modified, fresh)
+
+    def get_by_source(self, source_hash: str, variant: str) -> Optional[bytes]:
+        """Return an already processed variant of identical source bytes, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT object FROM images WHERE source_hash = ? AND variant = ? LIMIT 1",
+                (source_hash, variant)
+            ).fetchone()
+            data = self._read_object(row[0]) if row else None
+            self._conn.commit()
+            if data is not None:
+                self.counters["shared"] += 1
+            return data
+
+    def mark_validated(self, url: str, variant: str):
+        """Record a successful revalidation (HTTP 304) of ``url``."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE images SET checked = ? WHERE url = ? AND variant = ?", (time.time(), url, variant)
+            )
+            self._conn.commit()
+
+    def put(self, url: str, variant: str, data: bytes, source_hash: str,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a processed variant of ``url`` and evict old objects beyond ``max_bytes``."""
+        object_hash = content_hash(data)
+        path = self._object_path(object_hash)
+        now = time.time()
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                temp_path.write_bytes(data)
+                os.replace(temp_path, path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO objects (hash, size, accessed) VALUES (?, ?, ?)",
+                (object_hash, len(data), now)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images (url, variant, object, source_hash, etag, last_modified, checked) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, variant, object_hash, source_hash, etag, last_modified, now)
+            )
+            self._conn.commit()
+            self.counters["stores"] += 1
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT hash, size FROM objects ORDER BY accessed ASC").fetchall()
+        for object_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM images WHERE object = ?", (object_hash,))
+            self._conn.execute("DELETE FROM objects WHERE hash = ?", (object_hash,))
+            try:
+                self._object_path(object_hash).unlink()
+            except OSError:
+                pass
+            total -= size
+            self.counters["evictions"] += 1
+        self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            for (object_hash,) in self._conn.execute("SELECT hash FROM objects").fetchall():
+                try:
+                    self._object_path(object_hash).unlink()
+                except OSError:
+                    pass
+            self._conn.execute("DELETE FROM images")
+            self._conn.execute("DELETE FROM objects")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()
+            return {**self.counters, "objects": entries, "bytes": size}
+
+    def close(self):
+        self._conn.close()
+
+
+_default_image_cache: Optional[ImageCache] = None
+
+
+def get_default_image_cache() -> Optional[ImageCache]:
+    """Return the shared on-disk image cache, or None if disabled via FWT_RANKINGS_IMAGE_CACHE=0."""
+    global _default_image_cache
+    if os.environ.get(IMAGE_CACHE_ENV, "1").lower() in ("0", "false", "off", "no"):
+        return None
+    if _default_image_cache is None:
+        try:
+            max_mb = os.environ.get(IMAGE_CACHE_MB_ENV)
+            _default_image_cache = ImageCache(
+                max_bytes=int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+            )
+        except (OSError, sqlite3.Error, ValueError) as e:
+            logger.warning(f"Bild-Cache nicht verfügbar: {e}")
+            return None
+    return _default_image_cache
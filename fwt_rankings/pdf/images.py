@@ -0,0 +1,203 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, Iterable, Optional
+import requests
+from PIL import Image, ImageOps
+from ..api.queries import ATHLETE_IMAGE_DPI, ATHLETE_IMAGE_WIDTH_MM
+from .image_cache import ImageCache, content_hash, get_default_image_cache
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_JPEG_QUALITY = 82
+DEFAULT_MAX_IMAGES = 512
+DOWNLOAD_TIMEOUT = 10
+# Gleichzeitige Bild-Downloads beim Vorladen eines Reports
+DEFAULT_IMAGE_WORKERS = 8
+
+
+def pixels_for_width(width_mm: float, dpi: int) -> int:
+    """Pixel width needed to print ``width_mm`` at ``dpi``."""
+    return max(1, round(width_mm / 25.4 * dpi))
+
+
+class ImagePipeline:
+    """Download, normalize and recompress athlete photos for the PDF.
+
+    Images are EXIF-rotated, flattened to RGB, scaled down to the pixel
+    width needed for ``width_mm`` at ``dpi`` and stored as baseline JPEG.
+    Results are kept in a bounded in-memory LRU keyed by URL and in the
+    shared on-disk :class:`ImageCache`, which is revalidated with
+    ETag/Last-Modified. ``fetch`` is thread-safe; ``prefetch`` loads many
+    images concurrently.
+    """
+
+    def __init__(self, width_mm: float = ATHLETE_IMAGE_WIDTH_MM, dpi: int = ATHLETE_IMAGE_DPI,
+                 quality: int = DEFAULT_JPEG_QUALITY, max_entries: int = DEFAULT_MAX_IMAGES,
+                 timeout: float = DOWNLOAD_TIMEOUT, max_workers: int = DEFAULT_IMAGE_WORKERS,
+                 disk_cache: Optional[ImageCache] = None, use_disk_cache: bool = True):
+        self.target_width = pixels_for_width(width_mm, dpi)
+        self.quality = quality
+        # Verschiedene Zielgrößen/Qualitäten liegen als eigene Varianten im Bild-Cache
+        self.variant = f"w{self.target_width}q{quality}"
+        self.disk_cache = disk_cache if disk_cache is not None else (
+            get_default_image_cache() if use_disk_cache else None
+        )
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.counters = {"hits": 0, "disk_hits": 0, "revalidated": 0, "downloads": 0, "failures": 0,
+                         "bytes_in": 0, "bytes_out": 0}
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        # requests.Session ist nicht threadsicher, daher eine Session pro Download-Thread
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _count(self, **increments: int):
+        with self._lock:
+            for name, value in increments.items():
+                self.counters[name] += value
+
+    def cached(self, url: str) -> Optional[bytes]:
+        """Return the processed image for ``url`` if it is in memory, without downloading."""
+        with self._lock:
+            data = self._images.get(url)
+            if data is not None:
+                self._images.move_to_end(url)
+                self.counters["hits"] += 1
+            return data
+
+    def fetch(self, url: str) -> Optional[bytes]:
+        """Return the PDF-ready JPEG for ``url`` (None if it can't be loaded)."""
+        cached = self.cached(url)
+        if cached is not None:
+            return cached
+
+        stored = self.disk_cache.get(url, self.variant) if self.disk_cache is not None else None
+        if stored is not None and stored.fresh:
+            self._count(disk_hits=1)
+            self._store(url, stored.data)
+            return stored.data
+
+        headers = {}
+        if stored is not None:
+            if stored.etag:
+                headers["If-None-Match"] = stored.etag
+            if stored.last_modified:
+                headers["If-Modified-Since"] = stored.last_modified
+
+        try:
+            response = self._session().get(url, timeout=self.timeout, headers=headers)
+            if response.status_code == 304 and stored is not None:
+                self.disk_cache.mark_validated(url, self.variant)
+                self._count(revalidated=1)
+                self._store(url, stored.data)
+                return stored.data
+            response.raise_for_status()
+            self._count(downloads=1, bytes_in=len(response.content))
+            source_hash = content_hash(response.content)
+            data = None
+            if self.disk_cache is not None:
+                # Gleiches Foto unter anderer URL: bereits verarbeitete Variante wiederverwenden
+                data = self.disk_cache.get_by_source(source_hash, self.variant)
+            if data is None:
+                data = self.process(response.content)
+                self._count(bytes_out=len(data))
+        except Exception as e:
+            if stored is not None:
+                # Veraltetes Bild ist besser als keins
+                logger.debug(f"Revalidierung fehlgeschlagen, nutze gespeichertes Bild ({url}): {e}")
+                self._store(url, stored.data)
+                return stored.data
+            self._count(failures=1)
+            logger.warning(f"Bild konnte nicht geladen werden ({url}): {e}")
+            return None
+
+        if self.disk_cache is not None:
+            try:
+                self.disk_cache.put(url, self.variant, data, source_hash,
+                                    response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Bild konnte nicht gespeichert werden ({url}): {e}")
+        self._store(url, data)
+        return data
+
+    def prefetch(self, urls: Iterable[str]) -> Dict[str, bytes]:
+        """Load all ``urls`` concurrently; returns the images that could be loaded.
+
+        Each download is bounded by ``timeout``; failed images are left out.
+        """
+        unique = list(dict.fromkeys(url for url in urls if url))
+        if not unique:
+            return {}
+        start = time.perf_counter()
+        workers = max(1, min(self.max_workers, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-prefetch") as pool:
+            images = dict(zip(unique, pool.map(self.fetch, unique)))
+        loaded = {url: data for url, data in images.items() if data is not None}
+        logger.info(
+            f"{len(loaded)}/{len(unique)} Bilder in {time.perf_counter() - start:.1f}s vorgeladen "
+            f"({workers} parallel)"
+        )
+        return loaded
+
+    def process(self, data: bytes) -> bytes:
+        """Normalize raw image bytes into a compact RGB JPEG at the target width."""
+        image = Image.open(BytesIO(data))
+        if image.format == "JPEG":
+            # JPEG-Decoder direkt in reduzierter Auflösung dekodieren lassen
+            image.draft("RGB", (self.target_width, self.target_width * 4))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        if image.width > self.target_width:
+            height = max(1, round(image.height * self.target_width / image.width))
+            image = image.resize((self.target_width, height), Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=self.quality, optimize=True)
+        return buffer.getvalue()
+
+    def _store(self, url: str, data: bytes):
+        with self._lock:
+            self._images[url] = data
+            self._images.move_to_end(url)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {**self.counters, "entries": len(self._images)}
+        if self.disk_cache is not None:
+            stats["disk"] = self.disk_cache.stats()
+        return stats
+
+
+_default_pipeline: Optional[ImagePipeline] = None
+
+
+def get_default_image_pipeline() -> ImagePipeline:
+    """Return the process-wide athlete image pipeline."""
+    global _default_pipeline
+    if _default_pipeline is None:
+        _default_pipeline = ImagePipeline()
+    return _default_pipeline
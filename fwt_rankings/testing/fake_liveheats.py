@@ -0,0 +1,457 @@
+"""Local stand-in for the Liveheats GraphQL API with synthetic data.
+
+Implements the subset of the schema this project queries, so
+``fetch_multiple_series``, the ``/events`` cache and ``/generate_pdf`` can be
+load-tested at any scale without touching the production API:
+
+    python -m fwt_rankings.testing.fake_liveheats --series 300 --athletes 5000
+    export FWT_RANKINGS_API_URL=http://127.0.0.1:8765/graphql FWT_RANKINGS_CACHE_DIR=<printed dir>
+    python generate_rankings_web.py <event_id>
+
+Caches for any endpoint other than Liveheats live in their own
+subdirectory; the server additionally prints a cache directory per
+dataset, so runs with different sizes don't share cached synthetic data.
+
+Requires the optional dependency ``graphql-core``.
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import random
+import tempfile
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+from ..api.cache import request_key
+from ..api.transport import LatencyProfile
+from ..utils.logging import get_logger
+
+try:
+    from graphql import build_schema, execute, parse, validate, GraphQLError
+except ImportError:  # graphql-core ist nur für den Testserver nötig
+    build_schema = None
+
+logger = get_logger(__name__)
+
+# Auflösung der Originalbilder, wenn keine Größe angefragt wird
+ORIGINAL_IMAGE_SIZE = (1200, 1500)
+
+SCHEMA_SDL = """
+scalar StringOrInteger
+
+type Query {
+    organisationByShortName(shortName: String): Organisation
+    series(id: ID!): Series
+    event(id: ID!): Event
+    athlete(id: ID!): Athlete
+}
+
+type Organisation {
+    id: ID!
+    name: String!
+    series: [Series!]!
+}
+
+type Series {
+    id: ID!
+    name: String!
+    rankingsDivisions: [Division!]!
+    events: [Event!]!
+    rankings(divisionId: ID!): [Ranking!]
+}
+
+type Division {
+    id: ID!
+    name: String!
+}
+
+type Event {
+    id: ID!
+    name: String!
+    date: String
+    status: String
+    series: [Series!]!
+    eventDivisions: [EventDivision!]!
+}
+
+type EventDivision {
+    division: Division!
+    event: Event
+    entries: [Entry!]!
+    status: String
+}
+
+type Entry {
+    athlete: Athlete!
+    status: String
+    bib: String
+}
+
+type Athlete {
+    id: ID!
+    name: String!
+    dob: String
+    nationality: String
+    image(size: StringOrInteger): String
+    eventDivisions(limit: Int): [EventDivision!]!
+}
+
+type Ranking {
+    athlete: Athlete!
+    place: Int
+    points: Float
+    results: [Result!]!
+}
+
+type Result {
+    place: Int
+    points: Float
+    eventDivision: EventDivision
+}
+"""
+
+SERIES_KINDS = ("Freeride World Tour", "Freeride World Qualifier", "Freeride Junior Tour", "National Rankings")
+DIVISION_NAMES = ("Ski Men", "Ski Women", "Snowboard Men", "Snowboard Women")
+NATIONALITIES = ("AUT", "SUI", "FRA", "USA", "CAN", "ITA", "GER", "SWE", "NOR", "AND")
+EVENT_VENUES = ("Verbier", "Fieberbrunn", "Kicking Horse", "Baqueira", "Ordino", "Kappl", "Obertauern", "Chamonix")
+PLACE_POINTS = (1000, 860, 730, 610, 500, 410, 330, 260, 200, 150)
+
+# Die Daten sind statisch: fertige Antworten werden gemerkt, damit der Server bei Wiederholungen nicht bremst
+RESPONSE_MEMO_BYTES = 256 * 1024 * 1024
+
+
+def _iso(day: datetime) -> str:
+    return day.strftime("%Y-%m-%dT00:00:00Z")
+
+
+class SyntheticDataset:
+    """Deterministic organisation with ``series`` series, ``divisions`` per series and ``athletes`` riders.
+
+    Series are spread over the last ``seasons`` years; events of the
+    current season lie partly in the future so start lists and upcoming
+    events exist. Each rider belongs to one division and enters a series
+    with probability ``participation``. Instances serve as the GraphQL
+    root value.
+    """
+
+    def __init__(self, series: int = 30, divisions: int = 4, athletes: int = 500,
+                 events_per_series: int = 3, seasons: int = 5, participation: float = 0.3,
+                 short_name: str = "fwtglobal", image_base: Optional[str] = None, seed: int = 1):
+        self.short_name = short_name
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc)
+        years = list(range(now.year - seasons + 1, now.year + 1))
+
+        self.athletes_by_id: Dict[str, Dict] = {}
+        for i in range(athletes):
+            athlete_id = str(500000 + i)
+            birth = datetime(1985, 1, 1, tzinfo=timezone.utc) + timedelta(days=rng.randrange(7000))
+            self.athletes_by_id[athlete_id] = {
+                "id": athlete_id,
+                "name": f"Rider {i:05d}",
+                "dob": _iso(birth),
+                "nationality": rng.choice(NATIONALITIES),
+                "image": f"{image_base}/{athlete_id}.jpg" if image_base else None,
+                "eventDivisions": [],
+            }
+        riders_by_division: Dict[int, List[Dict]] = {}
+        for i, athlete in enumerate(self.athletes_by_id.values()):
+            riders_by_division.setdefault(i % divisions, []).append(athlete)
+
+        self.series_by_id: Dict[str, Dict] = {}
+        self.events_by_id: Dict[str, Dict] = {}
+        for s in range(series):
+            year = years[s % len(years)]
+            series_id = str(10000 + s)
+            series_data = {
+                "id": series_id,
+                "name": f"{SERIES_KINDS[s % len(SERIES_KINDS)]} {year} #{s}",
+                "rankingsDivisions": [],
+                "events": [],
+                "_rankings": {},
+            }
+            # Felder mit Argumenten werden von graphql-core als Funktion aufgerufen
+            series_data["rankings"] = lambda info, divisionId, series_data=series_data: \
+                series_data["_rankings"].get(str(divisionId))
+            self.series_by_id[series_id] = series_data
+
+            # Events über den Winter verteilt; die laufende Saison ist etwa zur Hälfte vorbei
+            if year == now.year:
+                season_start = (now - timedelta(days=events_per_series * 21 // 2)).replace(
+                    hour=0, minute=0, second=0, microsecond=0)
+            else:
+                season_start = datetime(year, 1, 10, tzinfo=timezone.utc)
+            for e in range(events_per_series):
+                date = season_start + timedelta(days=e * 21 + rng.randrange(7))
+                event = {
+                    "id": str(900000 + s * events_per_series + e),
+                    "name": f"{EVENT_VENUES[(s + e) % len(EVENT_VENUES)]} {year}",
+                    "date": _iso(date),
+                    "status": "results_published" if date < now else "upcoming",
+                    "series": [series_data],
+                    "eventDivisions": [],
+                }
+                self.events_by_id[event["id"]] = event
+                series_data["events"].append(event)
+
+            for m in range(divisions):
+                division = {
+                    "id": f"{series_id}{m:02d}",
+                    "name": DIVISION_NAMES[m % len(DIVISION_NAMES)] + ("" if m < len(DIVISION_NAMES) else f" {m}"),
+                }
+                series_data["rankingsDivisions"].append(division)
+                riders = [a for a in riders_by_division.get(m, []) if rng.random() < participation]
+                self._add_division(rng, series_data, division, riders)
+
+    def _add_division(self, rng: random.Random, series_data: Dict, division: Dict, riders: List[Dict]):
+        totals = {athlete["id"]: 0.0 for athlete in riders}
+        results: Dict[str, List[Dict]] = {athlete["id"]: [] for athlete in riders}
+        for event in series_data["events"]:
+            event_division = {"division": division, "event": event, "entries": [], "status": event["status"]}
+            event["eventDivisions"].append(event_division)
+            order = riders[:]
+            rng.shuffle(order)
+            for place, athlete in enumerate(order, start=1):
+                event_division["entries"].append({
+                    "athlete": athlete,
+                    "status": "confirmed" if place <= 0.9 * len(order) else "waitlisted",
+                    "bib": str(place),
+                })
+                athlete["eventDivisions"].append(event_division)
+                if event["status"] == "upcoming":
+                    continue
+                points = float(PLACE_POINTS[place - 1] if place <= len(PLACE_POINTS) else max(10, 150 - place))
+                totals[athlete["id"]] += points
+                results[athlete["id"]].append({"place": place, "points": points, "eventDivision": event_division})
+
+        standings = sorted(riders, key=lambda a: (-totals[a["id"]], a["id"]))
+        series_data["_rankings"][division["id"]] = [
+            {"athlete": athlete, "place": place, "points": totals[athlete["id"]], "results": results[athlete["id"]]}
+            for place, athlete in enumerate(standings, start=1)
+        ]
+
+    def upcoming_event_ids(self) -> List[str]:
+        """Events with a start list but no results, usable as report targets."""
+        return [event_id for event_id, event in self.events_by_id.items() if event["status"] == "upcoming"]
+
+    # Root-Resolver: graphql-core ruft Methoden des root_value mit info und Argumenten auf
+    def organisationByShortName(self, info, shortName: Optional[str] = None) -> Optional[Dict]:
+        if shortName != self.short_name:
+            return None
+        return {"id": "1", "name": self.short_name, "series": list(self.series_by_id.values())}
+
+    def series(self, info, id: str) -> Optional[Dict]:
+        return self.series_by_id.get(str(id))
+
+    def event(self, info, id: str) -> Optional[Dict]:
+        return self.events_by_id.get(str(id))
+
+    def athlete(self, info, id: str) -> Optional[Dict]:
+        return self.athletes_by_id.get(str(id))
+
+
+def _resolve_athlete_image(athlete: Dict, info, size: Any = None) -> Optional[str]:
+    # Wie Liveheats: Zahl = maximale Breite in Pixeln, "original" = Originalbild
+    url = athlete.get("image")
+    if url and size is not None and str(size) != "original":
+        return f"{url}?size={int(size)}"
+    return url
+
+
+def _resolve_athlete_event_divisions(athlete: Dict, info, limit: Optional[int] = None) -> List[Dict]:
+    event_divisions = athlete.get("eventDivisions") or []
+    return event_divisions[:limit] if limit is not None else event_divisions
+
+
+class FakeLiveheatsServer:
+    """aiohttp server answering GraphQL requests from a :class:`SyntheticDataset`.
+
+    Every request waits ``latency`` plus ``per_lookup_latency`` for each
+    top-level field, so alias batches cost more than single lookups like
+    on the real API. ``GET /stats`` returns request counters per operation.
+    """
+
+    def __init__(self, dataset: Optional[SyntheticDataset] = None,
+                 latency: Optional[LatencyProfile] = None,
+                 per_lookup_latency: float = 0.0,
+                 seed: Optional[int] = None):
+        if build_schema is None:
+            raise RuntimeError("Der Testserver benötigt graphql-core (pip install graphql-core)")
+        self.schema = build_schema(SCHEMA_SDL)
+        self.dataset = dataset or SyntheticDataset()
+        self.latency = latency or LatencyProfile()
+        self.per_lookup_latency = per_lookup_latency
+        self.operations: Counter = Counter()
+        self.counters = {"requests": 0, "lookups": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+        self._rng = random.Random(seed)
+        self.schema.type_map["Athlete"].fields["image"].resolve = _resolve_athlete_image
+        self.schema.type_map["Athlete"].fields["eventDivisions"].resolve = _resolve_athlete_event_divisions
+        self._images: Dict[tuple, bytes] = {}
+        self._responses: "OrderedDict[str, bytes]" = OrderedDict()
+        self._response_bytes = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_post("/graphql", self._handle_graphql)
+        app.router.add_get("/images/{athlete_id}.jpg", self._handle_image)
+        app.router.add_get("/stats", self._handle_stats)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> str:
+        """Start serving and return the GraphQL endpoint URL."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        url = f"http://{host}:{port}/graphql"
+        logger.info(f"Fake-Liveheats läuft auf {url}")
+        return url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "operations": dict(self.operations)}
+
+    async def _handle_graphql(self, request: web.Request) -> web.Response:
+        self.counters["requests"] += 1
+        self.counters["in_flight"] += 1
+        self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self.counters["in_flight"])
+        try:
+            payload = await request.json()
+            try:
+                document = parse(payload["query"])
+            except GraphQLError as e:
+                self.counters["errors"] += 1
+                return web.json_response({"errors": [e.formatted]})
+
+            operation = document.definitions[0]
+            lookups = len(operation.selection_set.selections)
+            self.operations[operation.name.value if operation.name else ""] += 1
+            self.counters["lookups"] += lookups
+
+            delay = self.latency.delay(0.0, self._rng) + self.per_lookup_latency * lookups
+            if delay:
+                await asyncio.sleep(delay)
+
+            key = request_key(payload["query"], payload.get("variables"))
+            body = self._responses.get(key)
+            if body is None:
+                # Große Batches blockieren sonst die Event-Loop des Servers
+                body = await asyncio.get_running_loop().run_in_executor(
+                    None, self._execute, document, payload.get("variables") or {}
+                )
+                self._responses[key] = body
+                self._response_bytes += len(body)
+                while self._response_bytes > RESPONSE_MEMO_BYTES:
+                    self._response_bytes -= len(self._responses.popitem(last=False)[1])
+            else:
+                self._responses.move_to_end(key)
+            return web.Response(body=body, content_type="application/json")
+        finally:
+            self.counters["in_flight"] -= 1
+
+    def _execute(self, document, variables: Dict[str, Any]) -> bytes:
+        errors = validate(self.schema, document)
+        if errors:
+            self.counters["errors"] += 1
+            return json.dumps({"errors": [e.formatted for e in errors]}).encode('utf-8')
+        result = execute(self.schema, document, root_value=self.dataset, variable_values=variables)
+        body: Dict[str, Any] = {"data": result.data}
+        if result.errors:
+            self.counters["errors"] += 1
+            body["errors"] = [e.formatted for e in result.errors]
+        return json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+    async def _handle_image(self, request: web.Request) -> web.Response:
+        athlete_id = request.match_info["athlete_id"]
+        if athlete_id not in self.dataset.athletes_by_id:
+            raise web.HTTPNotFound()
+        delay = self.latency.delay(0.0, self._rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        size = request.query.get("size")
+        width = int(size) if size and size.isdigit() else ORIGINAL_IMAGE_SIZE[0]
+        key = (athlete_id, min(width, ORIGINAL_IMAGE_SIZE[0]))
+        if key not in self._images:
+            from PIL import Image
+            # Verrauschtes Foto-Ersatzbild, damit die Dateigröße mit der Auflösung wächst
+            color = Image.new("RGB", ORIGINAL_IMAGE_SIZE, tuple(hashlib.md5(athlete_id.encode()).digest()[:3]))
+            noise = Image.effect_noise(ORIGINAL_IMAGE_SIZE, 40).convert("RGB")
+            image = Image.blend(color, noise, 0.3)
+            if key[1] < ORIGINAL_IMAGE_SIZE[0]:
+                image = image.resize((key[1], key[1] * ORIGINAL_IMAGE_SIZE[1] // ORIGINAL_IMAGE_SIZE[0]))
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=90)
+            self._images[key] = buffer.getvalue()
+        body = self._images[key]
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="image/jpeg", headers={"ETag": etag})
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+
+def dataset_cache_dir(args: argparse.Namespace) -> Path:
+    """Separate cache directory for clients of one synthetic dataset."""
+    dataset = {name: getattr(args, name) for name in
+               ("host", "port", "series", "divisions", "athletes", "events", "participation", "seed")}
+    digest = hashlib.sha256(json.dumps(dataset, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / "fwt_rankings_fake" / digest
+
+
+async def _serve(args: argparse.Namespace):
+    dataset = SyntheticDataset(
+        series=args.series, divisions=args.divisions, athletes=args.athletes,
+        events_per_series=args.events, participation=args.participation,
+        image_base=f"http://{args.host}:{args.port}/images", seed=args.seed,
+    )
+    server = FakeLiveheatsServer(
+        dataset,
+        latency=LatencyProfile(base=args.latency, jitter=args.jitter),
+        per_lookup_latency=args.per_lookup_latency,
+        seed=args.seed,
+    )
+    url = await server.start(args.host, args.port)
+    upcoming = dataset.upcoming_event_ids()
+    print(f"{len(dataset.series_by_id)} Series, {len(dataset.athletes_by_id)} Athleten, "
+          f"{len(dataset.events_by_id)} Events")
+    print(f"Kommende Events: {', '.join(upcoming[:5])}{' ...' if len(upcoming) > 5 else ''}")
+    print(f"export FWT_RANKINGS_API_URL={url}")
+    print(f"export FWT_RANKINGS_CACHE_DIR={dataset_cache_dir(args)}")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Liveheats-Ersatz mit synthetischen Daten")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--series", type=int, default=30)
+    parser.add_argument("--divisions", type=int, default=4)
+    parser.add_argument("--athletes", type=int, default=500)
+    parser.add_argument("--events", type=int, default=3, help="Events pro Series")
+    parser.add_argument("--participation", type=float, default=0.3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Grundlatenz pro Request in Sekunden")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--per-lookup-latency", type=float, default=0.005)
+    parser.add_argument("--seed", type=int, default=1)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR_ENV = "FWT_RANKINGS_CACHE_DIR"
+
+DEFAULT_API_URL = "https://liveheats.com/api/graphql"
+# Alternativer Endpunkt, z.B. der lokale Testserver aus fwt_rankings.testing
+API_URL_ENV = "FWT_RANKINGS_API_URL"
+
+
+def api_url(base_url: Optional[str] = None) -> str:
+    """Return ``base_url`` or the configured Liveheats endpoint."""
+    return base_url or os.environ.get(API_URL_ENV) or DEFAULT_API_URL
+
+
+def api_namespace(base_url: Optional[str] = None) -> str:
+    """Cache namespace of an API endpoint: ``""`` for Liveheats, a short hash for any other URL."""
+    url = api_url(base_url).strip().rstrip('/').lower()
+    if url == DEFAULT_API_URL:
+        return ""
+    return "api-" + hashlib.sha256(url.encode('utf-8')).hexdigest()[:12]
+
+
+def get_cache_dir(subdir: str = "") -> Path:
+    """Return (and create) the local cache directory shared by CLI and web app.
+
+    Caches for another endpoint than Liveheats (``FWT_RANKINGS_API_URL``)
+    live in their own subdirectory, so test data never mixes with real data.
+    """
+    base = os.environ.get(CACHE_DIR_ENV)
+    if base:
+        path = Path(base)
+    else:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = Path(xdg_cache) / "fwt_rankings"
+    namespace = api_namespace()
+    if namespace:
+        path = path / namespace
+    if subdir:
+        path = path / subdir
+    path.mkdir(parents=True, exist_ok=True)
+    return path
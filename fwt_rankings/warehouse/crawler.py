@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from ..api.client import LiveheatsClient
+from ..utils.logging import get_logger
+from .store import RankingsWarehouse, get_default_warehouse
+
+logger = get_logger(__name__)
+
+# Series, die gleichzeitig gecrawlt werden (HTTP begrenzt zusätzlich der Scheduler)
+DEFAULT_MAX_CONCURRENT_SERIES = 8
+
+
+class WarehouseCrawler:
+    """Crawl every FWT series into the local rankings warehouse."""
+
+    def __init__(self, client: Optional[LiveheatsClient] = None,
+                 warehouse: Optional[RankingsWarehouse] = None,
+                 max_concurrent_series: int = DEFAULT_MAX_CONCURRENT_SERIES):
+        self.client = client or LiveheatsClient()
+        self.warehouse = warehouse or get_default_warehouse()
+        self.max_concurrent_series = max_concurrent_series
+
+    async def crawl(self, organisation_short_name: str = "fwtglobal") -> Dict[str, int]:
+        """Run one full crawl; the warehouse only counts as fresh if every series succeeded."""
+        if self.warehouse is None:
+            raise RuntimeError("Kein Warehouse konfiguriert")
+
+        started = time.monotonic()
+        # Das Warehouse hält alle Saisons, die Historien-Tiefe greift erst beim Lesen
+        series_ids = await self.client.get_fwt_series(organisation_short_name, seasons=0)
+        if not series_ids:
+            logger.error("Keine Series gefunden, Crawl abgebrochen")
+            return {"series": 0, "failed": 0}
+
+        slots = asyncio.Semaphore(self.max_concurrent_series)
+        failed = []
+
+        async def crawl_series(position: int, series_id: str):
+            async with slots:
+                tables = await self.client.fetch_series_tables(series_id)
+            if tables is None or any(rankings is None for _, rankings in tables["divisions"]):
+                failed.append(series_id)
+                return
+            self.warehouse.store_series(series_id, tables["name"], position, tables["divisions"], tables["events"])
+
+        await asyncio.gather(*[crawl_series(i, s) for i, s in enumerate(series_ids)])
+
+        if failed:
+            logger.warning(f"Crawl unvollständig: {len(failed)} von {len(series_ids)} Series fehlgeschlagen")
+        else:
+            self.warehouse.remove_missing_series(series_ids)
+            self.warehouse.mark_crawled()
+
+        logger.info(
+            f"Warehouse-Crawl: {len(series_ids) - len(failed)} Series in "
+            f"{time.monotonic() - started:.1f}s, Stand: {self.warehouse.stats()}"
+        )
+        return {"series": len(series_ids), "failed": len(failed)}
@@ -0,0 +1,295 @@
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+from ..data.processors import RankingsProcessor
+from ..utils.logging import get_logger
+from ..utils.paths import get_cache_dir
+
+logger = get_logger(__name__)
+
+WAREHOUSE_ENABLED_ENV = "FWT_RANKINGS_WAREHOUSE"
+# Ein Crawl gilt so lange als aktuell (tägliches Update plus Puffer); die laufende Saison
+# wird trotzdem immer live geladen, siehe current_season_series
+DEFAULT_MAX_AGE = 26 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    crawled_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS divisions (
+    series_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (series_id, id)
+);
+CREATE TABLE IF NOT EXISTS athletes (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    dob TEXT,
+    nationality TEXT,
+    image TEXT
+);
+CREATE TABLE IF NOT EXISTS rankings (
+    series_id TEXT NOT NULL,
+    division_id TEXT NOT NULL,
+    athlete_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    place INTEGER,
+    points REAL,
+    PRIMARY KEY (series_id, division_id, athlete_id)
+);
+CREATE TABLE IF NOT EXISTS results (
+    series_id TEXT NOT NULL,
+    division_id TEXT NOT NULL,
+    athlete_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    place INTEGER,
+    points REAL,
+    event_name TEXT,
+    event_date TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    series_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    status TEXT,
+    PRIMARY KEY (series_id, id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_series_year ON series (year);
+CREATE INDEX IF NOT EXISTS idx_rankings_athlete ON rankings (athlete_id);
+CREATE INDEX IF NOT EXISTS idx_rankings_series ON rankings (series_id);
+CREATE INDEX IF NOT EXISTS idx_results_athlete ON results (athlete_id, series_id, division_id);
+CREATE INDEX IF NOT EXISTS idx_events_series ON events (series_id);
+"""
+
+
+class RankingsWarehouse:
+    """Normalized local copy of all FWT series, rankings, events and athletes.
+
+    Filled by :class:`~fwt_rankings.warehouse.crawler.WarehouseCrawler`;
+    ``load_results`` returns the same raw structure as
+    ``LiveheatsClient.fetch_multiple_series`` without touching the network.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = str(path or get_cache_dir() / "warehouse.sqlite")
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def store_series(self, series_id: str, name: str, position: int,
+                     divisions: List, events: Optional[List[Dict]] = None):
+        """Replace one series with freshly crawled ranking tables.
+
+        ``divisions`` is a list of ``(division, rankings)`` pairs as returned
+        by ``LiveheatsClient.fetch_series_tables``; ``events`` None keeps the
+        stored events of the series.
+        """
+        series_id = str(series_id)
+        athletes = {}
+        ranking_rows = []
+        result_rows = []
+        division_rows = []
+
+        for division_position, (division, rankings) in enumerate(divisions):
+            division_id = str(division["id"])
+            division_rows.append((series_id, division_id, division["name"], division_position))
+            for ranking_position, ranking in enumerate(rankings or []):
+                athlete = ranking["athlete"]
+                athletes[athlete["id"]] = (
+                    athlete["id"], athlete.get("name") or "Unknown", athlete.get("dob"),
+                    athlete.get("nationality"), athlete.get("image")
+                )
+                ranking_rows.append((
+                    series_id, division_id, athlete["id"], ranking_position,
+                    ranking.get("place"), ranking.get("points")
+                ))
+                for result_position, result in enumerate(ranking.get("results") or []):
+                    event = ((result.get("eventDivision") or {}).get("event")) or {}
+                    result_rows.append((
+                        series_id, division_id, athlete["id"], result_position,
+                        result.get("place"), result.get("points"), event.get("name"), event.get("date")
+                    ))
+
+        with self._conn:
+            for table in ("divisions", "rankings", "results"):
+                self._conn.execute(f"DELETE FROM {table} WHERE series_id = ?", (series_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO series (id, name, year, position, crawled_at) VALUES (?, ?, ?, ?, ?)",
+                (series_id, name, RankingsProcessor.extract_year_from_series(name), position, time.time())
+            )
+            self._conn.executemany("INSERT INTO divisions VALUES (?, ?, ?, ?)", division_rows)
+            self._conn.executemany("INSERT OR REPLACE INTO athletes VALUES (?, ?, ?, ?, ?)", athletes.values())
+            self._conn.executemany("INSERT OR REPLACE INTO rankings VALUES (?, ?, ?, ?, ?, ?)", ranking_rows)
+            self._conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", result_rows)
+            if events is not None:
+                self._conn.execute("DELETE FROM events WHERE series_id = ?", (series_id,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?)",
+                    [(series_id, str(e["id"]), e["name"], e["date"], e.get("status")) for e in events if e.get("id")]
+                )
+
+    def remove_missing_series(self, series_ids: Iterable[str]):
+        """Drop series that are no longer listed by the organisation."""
+        keep = {str(s) for s in series_ids}
+        stale = [row[0] for row in self._conn.execute("SELECT id FROM series") if row[0] not in keep]
+        with self._conn:
+            for series_id in stale:
+                for table in ("divisions", "rankings", "results", "events"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE series_id = ?", (series_id,))
+                self._conn.execute("DELETE FROM series WHERE id = ?", (series_id,))
+
+    def mark_crawled(self):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_crawl', ?)", (str(time.time()),)
+            )
+
+    def last_crawl(self) -> Optional[float]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_crawl'").fetchone()
+        return float(row[0]) if row else None
+
+    def is_fresh(self, max_age: float = DEFAULT_MAX_AGE) -> bool:
+        """True if a complete crawl finished within ``max_age`` seconds."""
+        last = self.last_crawl()
+        return last is not None and time.time() - last <= max_age
+
+    def current_season_series(self, min_year: Optional[int] = None) -> List[str]:
+        """Ids of the newest season's series in crawl order, if not older than ``min_year``.
+
+        Their tables change during running events and can be a whole crawl
+        interval old, so reports fetch them live instead.
+        """
+        return [row[0] for row in self._conn.execute(
+            "SELECT id FROM series WHERE year = (SELECT MAX(year) FROM series) AND year >= ? ORDER BY position",
+            (min_year or 0,)
+        )]
+
+    def load_results(self, athlete_ids: List[str], athlete_details: Optional[Dict[str, Dict]] = None,
+                     min_year: Optional[int] = None,
+                     live_results: Optional[Dict[str, Optional[Dict]]] = None) -> list:
+        """Return raw rankings for the given athletes in ``fetch_multiple_series`` format.
+
+        ``min_year`` limits the result to series of that season or later.
+        ``live_results`` maps series fetched from Liveheats to their result
+        (None if none of the athletes is ranked); they replace the stored copies.
+        """
+        wanted = list(dict.fromkeys(athlete_ids))
+        if not wanted:
+            return []
+        live_results = {str(series_id): r for series_id, r in (live_results or {}).items()}
+
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_athletes (id TEXT PRIMARY KEY)")
+        self._conn.execute("DELETE FROM wanted_athletes")
+        self._conn.executemany("INSERT OR IGNORE INTO wanted_athletes VALUES (?)", [(a,) for a in wanted])
+
+        results_by_ranking: Dict[tuple, List[Dict]] = {}
+        for series_id, division_id, athlete_id, place, points, event_name, event_date in self._conn.execute(
+            """
+            SELECT r.series_id, r.division_id, r.athlete_id, r.place, r.points, r.event_name, r.event_date
+            FROM results r
+            JOIN wanted_athletes w ON w.id = r.athlete_id
+            JOIN series s ON s.id = r.series_id
+            WHERE s.year >= ?
+            ORDER BY r.series_id, r.division_id, r.athlete_id, r.position
+            """, (min_year or 0,)
+        ):
+            if series_id in live_results:
+                continue
+            results_by_ranking.setdefault((series_id, division_id, athlete_id), []).append({
+                "place": place,
+                "points": points,
+                "eventDivision": {"event": {"name": event_name, "date": event_date}},
+            })
+
+        series_map: Dict[str, Dict] = {}
+        found = set()
+        for (series_id, series_name, division_id, division_name, athlete_id,
+             name, dob, nationality, image, place, points) in self._conn.execute(
+            """
+            SELECT s.id, s.name, d.id, d.name, a.id, a.name, a.dob, a.nationality, a.image, rk.place, rk.points
+            FROM rankings rk
+            JOIN wanted_athletes w ON w.id = rk.athlete_id
+            JOIN series s ON s.id = rk.series_id
+            JOIN divisions d ON d.series_id = rk.series_id AND d.id = rk.division_id
+            JOIN athletes a ON a.id = rk.athlete_id
+            WHERE s.year >= ?
+            ORDER BY s.position, d.position, rk.position
+            """, (min_year or 0,)
+        ):
+            if series_id in live_results:
+                continue
+            series = series_map.setdefault(series_id, {
+                "series_id": series_id,
+                "series_name": series_name,
+                "divisions": {},
+            })
+            series["divisions"].setdefault(division_name, []).append({
+                "athlete": {"id": athlete_id, "name": name, "dob": dob, "nationality": nationality, "image": image},
+                "place": place,
+                "points": points,
+                "results": results_by_ranking.get((series_id, division_id, athlete_id), []),
+            })
+            found.add(athlete_id)
+
+        if live_results:
+            # Live geladene Series an ihrer Crawl-Position einsortieren
+            positions = dict(self._conn.execute("SELECT id, position FROM series"))
+            for series_id, series in live_results.items():
+                if series is None:
+                    continue
+                series_map[series_id] = series
+                found.update(
+                    ranking["athlete"]["id"]
+                    for rankings in series["divisions"].values() for ranking in rankings
+                )
+            series_map = dict(sorted(series_map.items(), key=lambda item: positions.get(item[0], len(positions))))
+
+        raw_data = list(series_map.values())
+        empty_series = RankingsProcessor.build_new_athlete_series(
+            [a for a in wanted if a not in found], athlete_details or {}
+        )
+        if empty_series:
+            raw_data.append(empty_series)
+
+        logger.info(f"Warehouse: {len(found)} von {len(wanted)} Athleten mit Ergebnissen in {len(series_map)} Series")
+        return raw_data
+
+    def stats(self) -> Dict[str, int]:
+        counts = {
+            table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("series", "divisions", "athletes", "rankings", "results", "events")
+        }
+        return {**counts, "last_crawl": self.last_crawl()}
+
+    def close(self):
+        self._conn.close()
+
+
+_default_warehouse: Optional[RankingsWarehouse] = None
+
+
+def get_default_warehouse() -> Optional[RankingsWarehouse]:
+    """Return the shared warehouse, or None if disabled via FWT_RANKINGS_WAREHOUSE=0."""
+    global _default_warehouse
+    if os.environ.get(WAREHOUSE_ENABLED_ENV, "1").lower() in ("0", "false", "off", "no"):
+        return None
+    if _default_warehouse is None:
+        try:
+            _default_warehouse = RankingsWarehouse()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Rankings-Warehouse nicht verfügbar: {e}")
+            return None
+    return _default_warehouse
@@ -2,6 +2,7 @@ import asyncio
 from pathlib import Path
 from datetime import datetime
 from fwt_rankings.api.client import LiveheatsClient
+from fwt_rankings.api import session as liveheats_session
 from fwt_rankings.data.processors import RankingsProcessor
 from fwt_rankings.pdf.generator import RankingsReportGenerator
 from fwt_rankings.utils.logging import get_logger
@@ -95,6 +96,9 @@ async def main():
     except Exception as e:
         logger.error(f"Fehler beim Erstellen des Reports: {e}", exc_info=True)
         raise
+    finally:
+        # Gepoolte Verbindungen sauber schließen
+        await liveheats_session.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
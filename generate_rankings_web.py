@@ -1,24 +1,33 @@
+import argparse
 import asyncio
-import sys
 from pathlib import Path
 from datetime import datetime
-from fwt_rankings.api.client import LiveheatsClient
+from typing import List, Optional
+from fwt_rankings.api.client import LiveheatsClient, first_season_year
+from fwt_rankings.api import session as liveheats_session
 from fwt_rankings.data.processors import RankingsProcessor
 from fwt_rankings.pdf.generator import RankingsReportGenerator
+from fwt_rankings.warehouse.store import get_default_warehouse
 from fwt_rankings.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-async def main(event_id: str):
+async def main(event_id: str, seasons: Optional[int] = None, unfreeze: Optional[List[str]] = None):
     fwt_org_shortname = "fwtglobal"  # Der korrekte Short Name
     output_dir = "reports"
     
     # Erstelle Output-Verzeichnis falls nicht vorhanden
     Path(output_dir).mkdir(exist_ok=True)
     
+    client = None
     try:       
         # Client initialisieren
-        client = LiveheatsClient()
+        client = LiveheatsClient(history_seasons=seasons)
+
+        # Korrigierte Series aus dem Season-Store entfernen, damit sie neu geladen werden
+        for series_id in unfreeze or []:
+            if client.sync is None or not client.sync.unfreeze(series_id):
+                logger.warning(f"Series {series_id} ist nicht eingefroren")
 
         # 1. Zuerst Event-Details mit BIB Nummern holen
         event_data = await client.get_event_athletes(event_id)
@@ -37,44 +46,54 @@ async def main(event_id: str):
         
         logger.info(f"Erstelle Report für Event: {event_name}")
         
-        # Erstelle Mapping: Athlete ID -> BIB Nummer
-        bib_mapping = {}
-        athlete_ids = []
+        # Startliste (bestätigt/Warteliste) mit BIB und Status hat get_event_athletes bereits erfasst
+        entries = client.event_entries.get(str(event_id), {})
+        athlete_ids = list(entries)
+        bib_mapping = {athlete_id: entry["bib"] for athlete_id, entry in entries.items() if entry.get("bib")}
         
-        for division in event_data["event"]["eventDivisions"]:
-            logger.info(f"Verarbeite Division: {division['division']['name']}")
-            
-            for entry in division["entries"]:
-                if entry["status"] in ["confirmed", "waitlisted"]:
-                    athlete = entry["athlete"]
-                    athlete_id = athlete["id"]
-                    athlete_ids.append(athlete_id)
-                    
-                    bib = entry.get("bib")
-                    if bib:
-                        bib_mapping[athlete_id] = bib
-                        logger.info(f"Athlet gefunden: {athlete['name']} (BIB: {bib}, Status: {entry['status']})")
-                    else:
-                        logger.info(f"Athlet gefunden: {athlete['name']} (Status: {entry['status']})")
+        for athlete_id, entry in entries.items():
+            name = client.athletes.get(athlete_id, {}).get("name", athlete_id)
+            bib = f"BIB: {entry['bib']}, " if entry.get("bib") else ""
+            logger.info(f"Athlet gefunden: {name} ({entry['division']}, {bib}Status: {entry['status']})")
         
         logger.info(f"{len(athlete_ids)} Athleten gefunden")
         
-        # Hole Series IDs direkt von Liveheats
-        logger.info(f"Hole FWT Series IDs für Organisation: {fwt_org_shortname}")
-        series_ids = await client.get_fwt_series(fwt_org_shortname)
-        
-        # Rankings für diese Athleten abrufen
-        logger.info("Hole Rankings Daten...")
-        raw_data = await client.fetch_multiple_series(series_ids, athlete_ids)
+        processor = RankingsProcessor()
+        warehouse = get_default_warehouse()
+        # Nach --unfreeze live laden, das Warehouse enthält noch die alten Tabellen
+        if not unfreeze and warehouse is not None and warehouse.is_fresh():
+            # Abgeschlossene Saisons lokal aus dem Warehouse lesen, die laufende live von Liveheats
+            min_year = first_season_year(client.history_seasons)
+            live_series_ids = warehouse.current_season_series(min_year)
+            logger.info(f"Hole {len(live_series_ids)} Series der laufenden Saison live...")
+            live_results = await client.fetch_multiple_series(live_series_ids, athlete_ids) if live_series_ids else []
+            logger.info("Verarbeite Rankings aus dem lokalen Warehouse...")
+            rankings_data = processor.process_from_warehouse(
+                warehouse, athlete_ids, bib_mapping, client.athletes,
+                min_year=min_year, live_series_ids=live_series_ids, live_results=live_results
+            )
+            series_count = len({r.series_name for data in rankings_data for r in data.series_results})
+        else:
+            # Hole Series IDs direkt von Liveheats
+            logger.info(f"Hole FWT Series IDs für Organisation: {fwt_org_shortname}")
+            series_ids = await client.get_fwt_series(fwt_org_shortname)
+            
+            # Rankings für diese Athleten abrufen
+            logger.info("Hole Rankings Daten...")
+            raw_data = await client.fetch_multiple_series(series_ids, athlete_ids)
+            
+            if not raw_data:
+                logger.error("Keine Rankings gefunden!")
+                return
+                
+            # Daten verarbeiten
+            logger.info("Verarbeite Rankings...")
+            rankings_data = processor.process_rankings({"results": raw_data}, bib_mapping)
+            series_count = len(raw_data)
         
-        if not raw_data:
+        if not rankings_data:
             logger.error("Keine Rankings gefunden!")
             return
-            
-        # Daten verarbeiten
-        logger.info("Verarbeite Rankings...")
-        processor = RankingsProcessor()
-        rankings_data = processor.process_rankings({"results": raw_data}, bib_mapping)
         
         # PDF generieren
         logger.info("Generiere PDF Report...")
@@ -83,18 +102,31 @@ async def main(event_id: str):
         
         # Zusammenfassung
         logger.info("\nZusammenfassung:")
-        logger.info(f"- Verarbeitete Series: {len(raw_data)}")
+        logger.info(f"- Verarbeitete Series: {series_count}")
+        if client.pruning_stats["pruned_series"]:
+            logger.info(
+                f"- Übersprungene ältere Series: {client.pruning_stats['pruned_series']} "
+                f"({client.pruning_stats['avoided_lookups']} Lookups in ca. "
+                f"{client.pruning_stats['avoided_requests']} Requests eingespart)"
+            )
         logger.info(f"- Gefundene Athleten: {len(rankings_data)}")
         logger.info(f"- Report erstellt: {output_file}")
 
     except Exception as e:
         logger.error(f"Fehler beim Erstellen des Reports: {e}", exc_info=True)
         raise
+    finally:
+        # Aufzeichnung sichern und gepoolte Verbindungen sauber schließen
+        if client is not None:
+            await client.client.close()
+        await liveheats_session.shutdown()
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Verwendung: python generate_report.py <event_id>")
-        sys.exit(1)
-    
-    event_id = sys.argv[1]
-    asyncio.run(main(event_id))
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Erstellt den Rankings-Report für ein Event")
+    parser.add_argument("event_id")
+    parser.add_argument("--seasons", type=int, default=None,
+                        help="Nur die letzten N Saisons berücksichtigen (0 = alle)")
+    parser.add_argument("--unfreeze", action="append", default=[], metavar="SERIES_ID",
+                        help="Eingefrorene Series neu von Liveheats laden (mehrfach möglich)")
+    args = parser.parse_args()
+    asyncio.run(main(args.event_id, args.seasons, args.unfreeze))
\ No newline at end of file
@@ -13,7 +13,6 @@ setup(
         "fpdf2>=2.7.0",  # Verbesserte Version von fpdf mit Unicode Support
         
         # Data Processing & Visualization
-        "matplotlib>=3.5.0",  # Für Performance Charts
         "pillow>=9.0.0",     # Für Bildverarbeitung
         "python-dateutil>=2.8.0",  # Für Datumsverarbeitung
         
@@ -33,6 +32,12 @@ setup(
             'mypy>=1.0.0',             # Type checking
             'flake8>=6.0.0',           # Code linting
         ],
+        'testing': [
+            'graphql-core>=3.2.0',     # Lokaler Liveheats-Testserver
+        ],
+        'parallel': [
+            'pypdf>=3.10.0',           # Zusammenführen parallel gerenderter PDF-Teile
+        ],
     },
     
     # Metadata
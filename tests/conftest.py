@@ -0,0 +1,91 @@
+import asyncio
+import socket
+import threading
+import pytest
+import requests
+from fwt_rankings.api import cache, entities, session, sync
+from fwt_rankings.api.scheduler import RequestScheduler
+from fwt_rankings.api.singleflight import SingleFlight
+from fwt_rankings.pdf.images import ImagePipeline
+from fwt_rankings.testing.fake_liveheats import FakeLiveheatsServer, SyntheticDataset
+from fwt_rankings.warehouse import store
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def isolated_state(tmp_path, monkeypatch):
+    """Point all on-disk caches to ``tmp_path`` and reset the process-wide singletons."""
+    monkeypatch.setenv("FWT_RANKINGS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("FWT_RANKINGS_IMAGE_CACHE", "0")
+    monkeypatch.delenv("FWT_RANKINGS_TRANSPORT", raising=False)
+    monkeypatch.delenv("FWT_RANKINGS_SEASONS", raising=False)
+    monkeypatch.setattr(cache, "_default_cache", None)
+    monkeypatch.setattr(sync, "_default_sync", None)
+    monkeypatch.setattr(entities, "_default_athlete_cache", None)
+    monkeypatch.setattr(store, "_default_warehouse", None)
+    monkeypatch.setattr("fwt_rankings.api.singleflight._default_single_flight", SingleFlight())
+    monkeypatch.setattr("fwt_rankings.api.scheduler._default_scheduler", RequestScheduler())
+    monkeypatch.setattr(session, "_session_manager", session.SessionManager())
+    return tmp_path
+
+
+@pytest.fixture
+def dataset():
+    return SyntheticDataset(series=8, divisions=3, athletes=120, seasons=3)
+
+
+@pytest.fixture
+def fake_liveheats(dataset, isolated_state, monkeypatch):
+    """Run a :class:`FakeLiveheatsServer` in a background thread and point the client at it."""
+    server = FakeLiveheatsServer(dataset)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    url = asyncio.run_coroutine_threadsafe(server.start(port=_free_port()), loop).result(10)
+    monkeypatch.setenv("FWT_RANKINGS_API_URL", url)
+    yield server
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+
+class _ImageResponse:
+    def __init__(self, status_code: int, content: bytes = b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class FakeImageHTTP:
+    """Serves ``images[url] = (body, etag)`` in place of the pipeline's requests session."""
+
+    def __init__(self):
+        self.images = {}
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        headers = dict(headers or {})
+        self.requests.append((url, headers))
+        body, etag = self.images.get(url, (None, None))
+        if body is None:
+            return _ImageResponse(404)
+        if etag and headers.get("If-None-Match") == etag:
+            return _ImageResponse(304, headers={"ETag": etag})
+        return _ImageResponse(200, body, {"ETag": etag} if etag else {})
+
+
+@pytest.fixture
+def image_http(monkeypatch):
+    http = FakeImageHTTP()
+    monkeypatch.setattr(ImagePipeline, "_session", lambda self: http)
+    return http
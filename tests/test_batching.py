@@ -0,0 +1,51 @@
+import asyncio
+from fwt_rankings.api import session
+from fwt_rankings.api.batching import RankingsBatcher
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+
+
+async def _fetch(dataset, use_batching: bool):
+    client = LiveheatsClient(use_sync=False, use_batching=use_batching, athlete_cache=AthleteCache(),
+                             graphql_client=GraphQLClient(use_cache=False))
+    try:
+        event_id = dataset.upcoming_event_ids()[0]
+        await client.get_event_athletes(event_id)
+        series_ids = await client.get_fwt_series(seasons=0)
+        results = await client.fetch_multiple_series(series_ids, list(client.event_entries[event_id]),
+                                                     strategy="series")
+        return client, results
+    finally:
+        await session.shutdown()
+
+
+def test_batched_rankings_match_single_lookups(fake_liveheats, dataset):
+    _, single = asyncio.run(_fetch(dataset, use_batching=False))
+    single_requests = fake_liveheats.operations["GetSeriesRankingsLean"]
+    fake_liveheats.operations.clear()
+
+    client, batched = asyncio.run(_fetch(dataset, use_batching=True))
+
+    assert batched == single
+    assert fake_liveheats.operations["GetSeriesRankingsLean"] == 0
+    batches = fake_liveheats.operations["GetBatchedSeriesRankingsLean"]
+    assert 0 < batches < single_requests
+    assert client.batcher.stats["lookups"] == single_requests
+    assert client.batcher.stats["fallbacks"] == 0
+
+
+def test_batch_limit_respects_size_and_cost():
+    batcher = RankingsBatcher(client=None, max_batch_size=25, max_query_cost=400)
+    assert 1 <= batcher.batch_limit("full") <= batcher.batch_limit("lean") <= 25
+
+    assert RankingsBatcher(client=None, max_batch_size=3).batch_limit("lean") == 3
+    # Auch eine einzelne zu teure Abfrage wird noch gesendet
+    assert RankingsBatcher(client=None, max_query_cost=1).batch_limit("full") == 1
+
+
+def test_union_filter():
+    wanted = frozenset({"1"})
+    assert RankingsBatcher._union_filter([wanted, wanted]) is wanted
+    assert RankingsBatcher._union_filter([wanted, frozenset({"2"})]) == {"1", "2"}
+    assert RankingsBatcher._union_filter([wanted, None]) is None
+
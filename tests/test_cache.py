@@ -0,0 +1,60 @@
+from datetime import datetime
+from fwt_rankings.api import cache as cache_module
+from fwt_rankings.api.cache import CachePolicy, ResponseCache, operation_name, request_key
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    cache = ResponseCache(path=tmp_path / "cache.sqlite")
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+
+    cache.set("short", "event", {"a": 1}, ttl=60)
+    cache.set("forever", "GetSeriesRankings", {"b": 2}, ttl=None)
+    cache.set("skipped", "GetBatchedSeriesRankings", {"c": 3}, ttl=0)
+
+    assert cache.get("short") == {"a": 1}
+    assert cache.get("skipped") is None
+    now[0] += 61
+    assert cache.get("short") is None
+    assert cache.get("forever") == {"b": 2}
+    assert cache.counters["expired"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_policy_ttls():
+    policy = CachePolicy()
+    this_year = datetime.now().year
+    assert policy.ttl_for("GetBatchedSeriesRankings") == 0
+    assert policy.ttl_for("GetSeriesRankings", this_year) == policy.ttls["GetSeriesRankings"]
+    # Abgeschlossene Saisons ändern sich nicht mehr
+    assert policy.ttl_for("GetSeriesRankings", this_year - 1) == policy.past_season_ttl
+    assert policy.ttl_for("UnknownOperation") == policy.default_ttl
+    assert CachePolicy(ttls={"event": 5}).ttl_for("event") == 5
+
+
+def test_eviction_keeps_recently_used(tmp_path, monkeypatch):
+    cache = ResponseCache(path=tmp_path / "cache.sqlite")
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    for i in range(3):
+        now[0] += 1
+        cache.set(f"k{i}", "event", {"value": "x" * 100, "i": i}, ttl=None)
+    now[0] += 1
+    cache.get("k0")
+
+    size = cache.stats()["bytes"]
+    cache.max_bytes = size * 2 // 3
+    now[0] += 1
+    cache.set("k3", "event", {"i": 3}, ttl=None)
+
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
+    assert cache.counters["evictions"] >= 1
+
+
+def test_request_key_ignores_formatting():
+    query = "query GetSeriesRankings($id: ID!) { series(id: $id) { name } }"
+    reformatted = "query GetSeriesRankings($id: ID!) {\n  series(id: $id) {\n    name\n  }\n}"
+    assert operation_name(query) == "GetSeriesRankings"
+    assert request_key(query, {"id": "1"}) == request_key(reformatted, {"id": "1"})
+    assert request_key(query, {"id": "1"}) != request_key(query, {"id": "2"})
@@ -0,0 +1,45 @@
+from fwt_rankings.api.cache import ResponseCache, request_key
+from fwt_rankings.api.client import GraphQLClient
+from fwt_rankings.api.sync import SeasonSync
+from fwt_rankings.utils.paths import API_URL_ENV, CACHE_DIR_ENV, DEFAULT_API_URL, api_namespace, get_cache_dir
+from fwt_rankings.warehouse.store import RankingsWarehouse
+
+FAKE_URL = "http://127.0.0.1:8765/graphql"
+QUERY = "query GetDivisions($id: ID!) { series(id: $id) { name } }"
+
+
+def test_cached_responses_are_not_shared_between_api_urls(tmp_path, monkeypatch):
+    monkeypatch.delenv(API_URL_ENV, raising=False)
+    cache = ResponseCache(path=tmp_path / "cache.sqlite")
+    fake = GraphQLClient(base_url=FAKE_URL, cache=cache)
+    live = GraphQLClient(cache=cache)
+
+    fake.cache_store(QUERY, {"id": "1"}, {"series": {"name": "Synthetic"}})
+
+    assert live.cache_lookup(QUERY, {"id": "1"}) is None
+    assert fake.cache_lookup(QUERY, {"id": "1"}) == {"series": {"name": "Synthetic"}}
+    assert GraphQLClient(base_url=FAKE_URL + "/", cache=cache).cache_lookup(QUERY, {"id": "1"}) is not None
+
+
+def test_api_namespace_keeps_liveheats_keys_unchanged(monkeypatch):
+    monkeypatch.delenv(API_URL_ENV, raising=False)
+    assert api_namespace() == api_namespace(DEFAULT_API_URL) == ""
+    assert request_key(QUERY, {"id": "1"}, api_namespace()) == request_key(QUERY, {"id": "1"})
+    assert api_namespace(FAKE_URL) != api_namespace("http://127.0.0.1:8766/graphql")
+
+
+def test_stores_of_other_api_urls_live_in_their_own_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    monkeypatch.delenv(API_URL_ENV, raising=False)
+    live_dir = get_cache_dir()
+    SeasonSync().freeze_series("10", "FWT 2023", [{"id": "1", "name": "Ski Men"}], [[{"place": 1}]])
+    RankingsWarehouse().mark_crawled()
+
+    monkeypatch.setenv(API_URL_ENV, FAKE_URL)
+    fake_dir = get_cache_dir()
+
+    assert fake_dir != live_dir
+    assert live_dir == tmp_path
+    assert not SeasonSync().is_frozen("10")
+    assert RankingsWarehouse().last_crawl() is None
+    assert ResponseCache().path.startswith(str(fake_dir))
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import pytest
+from fwt_rankings.pdf import components
+from fwt_rankings.pdf.components import DEFAULT_CHART_STYLE, ChartStyle, chart_key, chart_ticks
+from fwt_rankings.pdf.generator import RankingsPDF
+
+
+@pytest.fixture
+def chart_cache(monkeypatch):
+    cache = OrderedDict()
+    monkeypatch.setattr(components, "_chart_cache", cache)
+    monkeypatch.setattr(components, "chart_cache_stats", {"hits": 0, "misses": 0, "evictions": 0})
+    return cache
+
+
+def _pdf() -> RankingsPDF:
+    pdf = RankingsPDF()
+    pdf.add_page()
+    return pdf
+
+
+def _operations(points, w: float = 90, h: float = 35):
+    return _pdf().components._build_chart(tuple(points), w, h, DEFAULT_CHART_STYLE)
+
+
+def _texts(operations):
+    return [op[-1] for op in operations if op[0] == "text"]
+
+
+def test_chart_ticks_use_1_2_5_steps():
+    assert chart_ticks(2019, 2025) == [2020, 2022, 2024]
+    assert chart_ticks(2023, 2025) == [2023, 2024, 2025]
+    assert chart_ticks(1, 30) == [10, 20, 30]
+    assert chart_ticks(1, 100) == [50, 100]
+    # Gleiche Grenzen ergeben genau einen Tick
+    assert chart_ticks(5, 5) == [5]
+
+
+def test_single_point_chart_is_padded_around_the_point():
+    operations = _operations([(2024, 3.0)])
+
+    assert [t for t in _texts(operations) if t.isdigit()] == ["2023", "2024", "2025", "2", "3", "4"]
+    assert not [op for op in operations if op[0] == "polyline"]
+    assert len([op for op in operations if op[0] == "ellipse"]) == 1
+
+
+def test_equal_places_do_not_collapse_the_place_axis():
+    operations = _operations([(2022, 1.0), (2023, 1.0), (2024, 1.0)])
+    markers = [op for op in operations if op[0] == "ellipse"]
+
+    # Platz 0 gibt es nicht, die Achse beginnt bei 1
+    assert [t for t in _texts(operations) if t.isdigit()] == ["2022", "2023", "2024", "1", "2"]
+    assert len({round(op[2], 6) for op in markers}) == 1
+    assert len({round(op[1], 6) for op in markers}) == 3
+    assert [op for op in operations if op[0] == "polyline"]
+
+
+def _draw(points, x: float = 20, y: float = 40) -> bytes:
+    pdf = _pdf()
+    pdf.components.add_performance_chart(points, x, y, w=90)
+    return bytes(pdf.pages[1].contents)
+
+
+def test_cache_hit_replays_the_drawing_of_a_fresh_build(chart_cache):
+    points = [(2023, 4.0), (2024, 2.0)]
+
+    fresh = _draw(points)
+    replayed = _draw(list(reversed(points)))
+
+    assert components.chart_cache_stats == {"hits": 1, "misses": 1, "evictions": 0}
+    assert replayed == fresh
+    # An anderer Position werden dieselben Operationen nur verschoben
+    assert _draw(points, x=30) != fresh
+    assert components.chart_cache_stats["hits"] == 2
+
+
+def test_chart_key_separates_size_and_style():
+    points = [(2024, 2), (2023, 4.0)]
+
+    assert chart_key(points, 90, 35) == chart_key(sorted(points), 90.0001, 35)
+    assert chart_key(points, 90, 35)[0] == ((2023, 4.0), (2024, 2.0))
+    assert chart_key(points, 80, 35) != chart_key(points, 90, 35)
+    assert chart_key(points, 90, 35, ChartStyle(title="Other")) != chart_key(points, 90, 35)
+
+
+def test_chart_cache_is_bounded(chart_cache, monkeypatch):
+    monkeypatch.setattr(components, "CHART_CACHE_SIZE", 2)
+    for year in (2022, 2023, 2024):
+        _draw([(year, 1.0)])
+
+    assert len(chart_cache) == 2
+    assert components.chart_cache_stats["evictions"] == 1
+    assert chart_key([(2022, 1.0)], 90, 35) not in chart_cache
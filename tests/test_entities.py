@@ -0,0 +1,50 @@
+from fwt_rankings.api import entities
+from fwt_rankings.api.client import LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+
+
+def _athlete(athlete_id: str, **fields):
+    return {"id": athlete_id, "name": f"Rider {athlete_id}", "nationality": "AUT", "dob": None, "image": None, **fields}
+
+
+def test_stores_profile_fields_only():
+    cache = AthleteCache()
+    cache.put(_athlete("1", bib="7", status="confirmed"))
+
+    assert cache.get("1") == {"id": "1", "name": "Rider 1", "nationality": "AUT", "dob": None, "image": None}
+    assert cache.get("2", {}) == {}
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_profiles_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(entities.time, "monotonic", lambda: now[0])
+    cache = AthleteCache(ttl=60)
+    cache.put(_athlete("1"))
+
+    now[0] += 59
+    assert "1" in cache
+    now[0] += 2
+    assert "1" not in cache
+    assert cache.get("1") is None
+    assert cache.counters["expired"] == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_profile_is_evicted():
+    cache = AthleteCache(max_entries=2, ttl=None)
+    cache.update([_athlete("1"), _athlete("2")])
+    cache.get("1")
+    cache.put(_athlete("3"))
+
+    assert "1" in cache and "3" in cache
+    assert "2" not in cache
+    assert cache.counters["evictions"] == 1
+
+
+def test_clients_share_the_default_cache(isolated_state):
+    first, second = LiveheatsClient(use_sync=False), LiveheatsClient(use_sync=False)
+    first.athletes.put(_athlete("1"))
+
+    assert second.athletes is first.athletes
+    assert second.athletes.get("1")["name"] == "Rider 1"
@@ -0,0 +1,81 @@
+import asyncio
+from fwt_rankings.api import client as client_module
+from fwt_rankings.api import session
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient, choose_fetch_strategy
+from fwt_rankings.api.entities import AthleteCache
+
+
+def _rankings_requests(server) -> int:
+    # Ohne Batching ist jede Division ein eigener Request
+    return sum(n for op, n in server.operations.items() if "Rankings" in op)
+
+
+async def _fetch(dataset, strategy: str, client=None, athletes: int = None):
+    client = client or LiveheatsClient(use_sync=False, use_batching=False, athlete_cache=AthleteCache(),
+                                       graphql_client=GraphQLClient(use_cache=False))
+    try:
+        event_id = dataset.upcoming_event_ids()[0]
+        await client.get_event_athletes(event_id)
+        series_ids = await client.get_fwt_series(seasons=0)
+        athlete_ids = list(client.event_entries[event_id])[:athletes]
+        results = await client.fetch_multiple_series(series_ids, athlete_ids, strategy=strategy)
+        return sorted(results, key=lambda r: str(r["series_id"]))
+    finally:
+        await session.shutdown()
+
+
+def _scan(server, dataset, athletes: int = None):
+    server.operations.clear()
+    results = asyncio.run(_fetch(dataset, "series", athletes=athletes))
+    requests = _rankings_requests(server)
+    server.operations.clear()
+    return results, requests
+
+
+def test_choose_fetch_strategy():
+    assert choose_fetch_strategy(10, 100) == "athlete"
+    assert choose_fetch_strategy(500, 100) == "series"
+    assert choose_fetch_strategy(0, 100) == "series"
+    assert choose_fetch_strategy(10, 0) == "series"
+
+
+def test_athlete_strategy_matches_series_scan(fake_liveheats, dataset):
+    # Wenige Athleten starten nicht in jeder Division, der Athleten-Modus spart Tabellen ein
+    scanned, scan_requests = _scan(fake_liveheats, dataset, athletes=3)
+
+    resolved = asyncio.run(_fetch(dataset, "athlete", athletes=3))
+
+    assert any(r["divisions"] for r in scanned)
+    assert resolved == scanned
+    assert fake_liveheats.operations["GetBatchedAthleteHistory"] > 0
+    assert _rankings_requests(fake_liveheats) < scan_requests
+
+
+def test_truncated_history_falls_back_to_series_scan(fake_liveheats, dataset, monkeypatch, caplog):
+    scanned, scan_requests = _scan(fake_liveheats, dataset)
+    # Jede Historie erreicht das Limit und gilt damit als abgeschnitten
+    monkeypatch.setattr(client_module, "ATHLETE_HISTORY_LIMIT", 1)
+
+    resolved = asyncio.run(_fetch(dataset, "athlete"))
+
+    assert resolved == scanned
+    assert fake_liveheats.operations["GetBatchedAthleteHistory"] > 0
+    assert _rankings_requests(fake_liveheats) == scan_requests
+    assert any("Historie unvollständig" in record.getMessage() for record in caplog.records)
+
+
+def test_failed_history_query_falls_back_to_series_scan(fake_liveheats, dataset, caplog):
+    scanned, scan_requests = _scan(fake_liveheats, dataset)
+    client = LiveheatsClient(use_sync=False, use_batching=False, athlete_cache=AthleteCache(),
+                             graphql_client=GraphQLClient(use_cache=False))
+    # Ungültiges Feld, der Server antwortet mit einem GraphQL-Fehler
+    client.queries.build_batched_athlete_history_query = (
+        lambda count: "query GetBatchedAthleteHistory { a0: athlete(id: \"1\") { unknownField } }"
+    )
+
+    resolved = asyncio.run(_fetch(dataset, "athlete", client))
+
+    assert resolved == scanned
+    assert fake_liveheats.counters["errors"] > 0
+    assert _rankings_requests(fake_liveheats) == scan_requests
+    assert any("Historie unvollständig" in record.getMessage() for record in caplog.records)
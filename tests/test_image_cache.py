@@ -0,0 +1,114 @@
+from io import BytesIO
+from PIL import Image
+from fwt_rankings.pdf import image_cache as image_cache_module
+from fwt_rankings.pdf.image_cache import (
+    DEFAULT_MAX_BYTES, DEFAULT_REVALIDATE_AFTER, IMAGE_CACHE_ENV, IMAGE_CACHE_MB_ENV, ImageCache, content_hash,
+    get_default_image_cache,
+)
+from fwt_rankings.pdf.images import ImagePipeline
+
+URL = "https://images.example/rider.jpg"
+
+
+def _jpeg(color) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (300, 400), color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def _clock(monkeypatch, start: float = 1000.0):
+    now = [start]
+    monkeypatch.setattr(image_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def _pipeline(cache: ImageCache) -> ImagePipeline:
+    # Neue Pipeline = leerer Speicher-Cache, nur der Platten-Cache bleibt
+    return ImagePipeline(width_mm=25.4, dpi=100, disk_cache=cache)
+
+
+def test_revalidates_with_etag_after_a_day(tmp_path, image_http, monkeypatch):
+    now = _clock(monkeypatch)
+    cache = ImageCache(path=tmp_path)
+    image_http.images[URL] = (_jpeg((200, 0, 0)), '"v1"')
+    original = _pipeline(cache).fetch(URL)
+
+    assert _pipeline(cache).fetch(URL) == original
+    assert len(image_http.requests) == 1
+
+    # Nach 24 h fragt die Pipeline mit If-None-Match nach, 304 behält das Bild
+    now[0] += DEFAULT_REVALIDATE_AFTER + 1
+    pipeline = _pipeline(cache)
+    assert pipeline.fetch(URL) == original
+    assert image_http.requests[-1][1]["If-None-Match"] == '"v1"'
+    assert pipeline.counters["revalidated"] == 1
+    assert cache.get(URL, pipeline.variant).fresh
+
+    # Geändertes Foto: 200 mit neuem ETag ersetzt den Eintrag
+    now[0] += DEFAULT_REVALIDATE_AFTER + 1
+    image_http.images[URL] = (_jpeg((0, 0, 200)), '"v2"')
+    pipeline = _pipeline(cache)
+    updated = pipeline.fetch(URL)
+    assert updated != original
+    assert pipeline.counters["downloads"] == 1
+    assert cache.get(URL, pipeline.variant) == (updated, '"v2"', None, True)
+
+
+def test_stale_image_is_used_when_revalidation_fails(tmp_path, image_http, monkeypatch):
+    now = _clock(monkeypatch)
+    cache = ImageCache(path=tmp_path)
+    image_http.images[URL] = (_jpeg((200, 0, 0)), '"v1"')
+    original = _pipeline(cache).fetch(URL)
+
+    now[0] += DEFAULT_REVALIDATE_AFTER + 1
+    del image_http.images[URL]
+
+    assert _pipeline(cache).fetch(URL) == original
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path, monkeypatch):
+    now = _clock(monkeypatch)
+    cache = ImageCache(path=tmp_path, max_bytes=250)
+    for name in ("a", "b"):
+        cache.put(f"https://images.example/{name}.jpg", "w100", name.encode() * 100, content_hash(name.encode()))
+        now[0] += 1
+    cache.get("https://images.example/a.jpg", "w100")
+    now[0] += 1
+
+    cache.put("https://images.example/c.jpg", "w100", b"c" * 100, content_hash(b"c"))
+
+    assert cache.get("https://images.example/b.jpg", "w100") is None
+    assert cache.get("https://images.example/a.jpg", "w100").data == b"a" * 100
+    assert cache.stats()["bytes"] == 200
+    assert cache.counters["evictions"] == 1
+    assert not list(tmp_path.glob(f"objects/*/{content_hash(b'b' * 100)}.jpg"))
+
+
+def test_size_limit_defaults_to_300_mb(isolated_state, monkeypatch):
+    monkeypatch.setattr(image_cache_module, "_default_image_cache", None)
+    monkeypatch.setenv(IMAGE_CACHE_ENV, "1")
+    assert DEFAULT_MAX_BYTES == 300 * 1024 * 1024
+    assert get_default_image_cache().max_bytes == DEFAULT_MAX_BYTES
+
+    monkeypatch.setattr(image_cache_module, "_default_image_cache", None)
+    monkeypatch.setenv(IMAGE_CACHE_MB_ENV, "5")
+    assert get_default_image_cache().max_bytes == 5 * 1024 * 1024
+
+
+def test_identical_photos_behind_different_urls_are_processed_once(tmp_path, image_http):
+    photo = _jpeg((0, 120, 0))
+    image_http.images[URL] = (photo, None)
+    image_http.images["https://cdn.example/copy.jpg"] = (photo, None)
+    cache = ImageCache(path=tmp_path)
+    pipeline = _pipeline(cache)
+
+    first = pipeline.fetch(URL)
+    copy = pipeline.fetch("https://cdn.example/copy.jpg")
+
+    assert copy == first
+    assert cache.get_by_source(content_hash(photo), pipeline.variant) == first
+    assert cache.get_by_source(content_hash(b"other"), pipeline.variant) is None
+    assert cache.counters["shared"] == 2
+    assert pipeline.counters["downloads"] == 2
+    assert pipeline.counters["bytes_out"] == len(first)
+    assert cache.stats()["objects"] == 1
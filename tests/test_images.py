@@ -0,0 +1,76 @@
+from io import BytesIO
+from PIL import Image
+from fwt_rankings.pdf.images import ImagePipeline, pixels_for_width
+
+URL = "https://images.example/rider.jpg"
+
+
+def _image(size, mode="RGB", color=(200, 40, 40), format="JPEG", exif=None) -> bytes:
+    buffer = BytesIO()
+    image = Image.new(mode, size, color)
+    image.save(buffer, format=format, **({"exif": exif} if exif is not None else {}))
+    return buffer.getvalue()
+
+
+def _pipeline(**options) -> ImagePipeline:
+    # 25,4 mm bei 100 dpi ergeben genau 100 Pixel Zielbreite
+    return ImagePipeline(width_mm=25.4, dpi=100, use_disk_cache=False, **options)
+
+
+def test_pixels_for_width():
+    assert pixels_for_width(25.4, 100) == 100
+    assert pixels_for_width(60, 200) == 472
+    assert pixels_for_width(0.01, 72) == 1
+
+
+def test_process_scales_down_to_a_baseline_jpeg():
+    pipeline = _pipeline()
+
+    large = Image.open(BytesIO(pipeline.process(_image((400, 600)))))
+    small = Image.open(BytesIO(pipeline.process(_image((50, 80)))))
+
+    assert (large.format, large.mode, large.size) == ("JPEG", "RGB", (100, 150))
+    assert not large.info.get("progressive")
+    # Kleinere Bilder werden nicht hochskaliert
+    assert small.size == (50, 80)
+
+
+def test_process_flattens_transparency_and_applies_exif_rotation():
+    pipeline = _pipeline()
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: 90° im Uhrzeigersinn drehen
+
+    flattened = Image.open(BytesIO(pipeline.process(_image((40, 20), "RGBA", (0, 0, 0, 0), "PNG"))))
+    rotated = Image.open(BytesIO(pipeline.process(_image((80, 40), exif=exif))))
+
+    assert flattened.mode == "RGB"
+    assert all(channel > 245 for channel in flattened.getpixel((20, 10)))
+    assert rotated.size == (40, 80)
+
+
+def test_fetch_keeps_processed_images_in_memory(image_http):
+    image_http.images[URL] = (_image((400, 600)), None)
+    pipeline = _pipeline()
+
+    first = pipeline.fetch(URL)
+
+    assert pipeline.fetch(URL) == first
+    assert len(image_http.requests) == 1
+    assert pipeline.stats()["hits"] == 1
+    assert pipeline.fetch("https://images.example/missing.jpg") is None
+    assert pipeline.counters["failures"] == 1
+
+
+def test_prefetch_downloads_each_distinct_url_once(image_http):
+    urls = [f"https://images.example/{i}.jpg" for i in range(6)]
+    for url in urls:
+        image_http.images[url] = (_image((300, 400)), None)
+    pipeline = _pipeline(max_workers=4)
+
+    loaded = pipeline.prefetch(urls + urls[:3] + [None, "", "https://images.example/missing.jpg"])
+
+    assert sorted(loaded) == sorted(urls)
+    assert sorted(url for url, _ in image_http.requests) == sorted(urls + ["https://images.example/missing.jpg"])
+    # Danach liegen alle Bilder im Speicher
+    assert pipeline.prefetch(urls) == loaded
+    assert len(image_http.requests) == len(urls) + 1
@@ -0,0 +1,34 @@
+import asyncio
+import pytest
+from fwt_rankings.api import session
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+from fwt_rankings.data.processors import RankingsProcessor
+
+
+async def _report(dataset, profile: str, use_batching: bool):
+    # Eigener Athleten-Cache pro Lauf, damit "lean" die Profile selbst nachladen muss
+    client = LiveheatsClient(use_sync=False, use_batching=use_batching, athlete_cache=AthleteCache(),
+                             graphql_client=GraphQLClient(use_cache=False), query_profile=profile)
+    try:
+        event_id = dataset.upcoming_event_ids()[0]
+        await client.get_event_athletes(event_id)
+        entries = client.event_entries[event_id]
+        series_ids = await client.get_fwt_series(seasons=0)
+        raw = await client.fetch_multiple_series(series_ids, list(entries), strategy="series")
+        bib_mapping = {athlete_id: entry["bib"] for athlete_id, entry in entries.items() if entry.get("bib")}
+        return RankingsProcessor().process_rankings({"results": raw}, bib_mapping)
+    finally:
+        await session.shutdown()
+
+
+@pytest.mark.parametrize("use_batching", [False, True])
+def test_lean_profile_matches_full_profile(fake_liveheats, dataset, use_batching):
+    full = asyncio.run(_report(dataset, "full", use_batching))
+    fake_liveheats.operations.clear()
+
+    lean = asyncio.run(_report(dataset, "lean", use_batching))
+
+    assert any(r.series_results and r.series_results[0].results for r in full)
+    assert lean == full
+    assert sum(n for op, n in fake_liveheats.operations.items() if op.endswith("Lean")) > 0
@@ -0,0 +1,56 @@
+import re
+from datetime import datetime
+import pytest
+from fwt_rankings.data.models import Athlete, AthleteStats, EventResult, RankingsData, SeriesResult
+from fwt_rankings.pdf import generator as generator_module
+from fwt_rankings.pdf.generator import MIN_PARALLEL_ATHLETES, RankingsReportGenerator
+from fwt_rankings.pdf.images import ImagePipeline
+
+pypdf = pytest.importorskip("pypdf")
+
+
+def _athletes(count: int):
+    athletes = []
+    for i in range(count):
+        # Unterschiedlich viele Series, damit die Athleten unterschiedlich viele Seiten brauchen
+        series = [
+            SeriesResult(f"Freeride World Tour {year}", year, "Ski Men", i % 20 + 1, 500.0,
+                         [EventResult(f"Event {year}", datetime(year, 2, 1), 3, 500.0)] * (i % 6 + 1))
+            for year in range(2024 - i % 7, 2025)
+        ]
+        stats = AthleteStats(None, None, series[0], None, None, len(series), len(series))
+        athletes.append(RankingsData(Athlete(str(i), f"Rider {i}", "AUT", datetime(1995, 3, 3), None, str(i + 1)),
+                                     stats, series))
+    return athletes
+
+
+def _render(path, workers: int):
+    RankingsReportGenerator(image_pipeline=ImagePipeline(use_disk_cache=False)).generate_report(
+        _athletes(MIN_PARALLEL_ATHLETES + 6), str(path), workers=workers
+    )
+    return [page.extract_text() for page in pypdf.PdfReader(str(path)).pages]
+
+
+def test_parallel_render_matches_sequential(tmp_path):
+    sequential = _render(tmp_path / "sequential.pdf", workers=1)
+    parallel = _render(tmp_path / "parallel.pdf", workers=2)
+
+    assert len(parallel) == len(sequential) > MIN_PARALLEL_ATHLETES
+    total = len(sequential)
+    # Seitenzahlen werden nach dem Zusammenfügen gestempelt, fortlaufend über das ganze Dokument
+    numbers = [re.search(r"Page (\d+) of (\d+)", text).groups() for text in parallel]
+    assert numbers == [(str(n), str(total)) for n in range(1, total + 1)]
+    assert parallel == sequential
+
+
+def test_missing_pypdf_falls_back_once(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(generator_module, "PdfWriter", None)
+    monkeypatch.setattr(generator_module, "_warned_no_pypdf", False)
+
+    for name in ("a.pdf", "b.pdf"):
+        RankingsReportGenerator(image_pipeline=ImagePipeline(use_disk_cache=False)).generate_report(
+            _athletes(MIN_PARALLEL_ATHLETES), str(tmp_path / name), workers=2
+        )
+
+    assert (tmp_path / "b.pdf").exists()
+    assert sum("pypdf" in record.getMessage() for record in caplog.records) == 1
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from fwt_rankings.api.scheduler import AdaptiveLimiter, RequestScheduler, TokenBucket, parse_retry_after
+
+
+def test_token_bucket_allows_burst_then_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=100.0, burst=5)
+        waits = [await bucket.acquire() for _ in range(8)]
+        return waits
+
+    waits = asyncio.run(scenario())
+    assert waits[:5] == [0.0] * 5
+    # Danach ein Token pro 10 ms
+    assert all(0 < wait < 0.1 for wait in waits[5:])
+
+
+def test_token_bucket_pause():
+    async def scenario():
+        bucket = TokenBucket(rate=1000.0, burst=1)
+        bucket.pause(0.05)
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) >= 0.04
+
+
+def test_adaptive_limiter_aimd():
+    limiter = AdaptiveLimiter(initial=8, minimum=2, maximum=10, decrease_cooldown=60)
+    assert limiter.on_throttled()
+    assert limiter.limit == 4
+    # Innerhalb der Abklingzeit keine weitere Halbierung
+    assert not limiter.on_throttled()
+    assert limiter.limit == 4
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 10
+
+
+def test_slot_limits_in_flight_requests():
+    async def scenario():
+        scheduler = RequestScheduler(max_in_flight=3, min_in_flight=1, initial_in_flight=3,
+                                     requests_per_second=1000.0, burst=100)
+
+        async def request():
+            async with scheduler.slot():
+                await asyncio.sleep(0.01)
+            scheduler.record_success()
+
+        await asyncio.gather(*[request() for _ in range(12)])
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["requests"] == 12
+    assert stats["successes"] == 12
+    assert stats["peak_in_flight"] == 3
+    assert stats["in_flight"] == 0
+
+
+def test_throttling_counters_and_backoff():
+    scheduler = RequestScheduler(initial_in_flight=8, backoff_base=0.5, backoff_max=4.0, max_retries=2)
+    scheduler.record_throttled(429, retry_after=0.01)
+    scheduler.record_throttled(503)
+    scheduler.record_throttled(None)
+    stats = scheduler.stats()
+    assert (stats["throttled"], stats["server_errors"], stats["network_errors"]) == (1, 1, 1)
+    assert stats["in_flight_limit"] == 4
+
+    assert [scheduler.backoff_delay(a) for a in (1, 2, 3, 5)] == [0.5, 1.0, 2.0, 4.0]
+    assert scheduler.backoff_delay(1, retry_after=2.5) == 2.5
+    assert scheduler.should_retry(2)
+    assert not scheduler.should_retry(3)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
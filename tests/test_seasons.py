@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+from fwt_rankings.api import session
+from fwt_rankings.api.client import (
+    HISTORY_SEASONS_ENV, GraphQLClient, LiveheatsClient, default_history_seasons, first_season_year
+)
+from fwt_rankings.api.entities import AthleteCache
+
+
+def test_history_seasons_from_env(monkeypatch, caplog):
+    monkeypatch.setenv(HISTORY_SEASONS_ENV, " 3 ")
+    assert default_history_seasons() == 3
+
+    monkeypatch.setenv(HISTORY_SEASONS_ENV, "")
+    assert default_history_seasons() == 0
+
+    monkeypatch.setenv(HISTORY_SEASONS_ENV, "drei")
+    assert default_history_seasons() == 0
+    assert any(HISTORY_SEASONS_ENV in record.getMessage() for record in caplog.records)
+
+
+def test_first_season_year():
+    assert first_season_year(1) == datetime.now().year
+    assert first_season_year(3) == datetime.now().year - 2
+    assert first_season_year(0) is None
+    assert first_season_year(-1) is None
+
+
+def test_pruning_counts_batches_not_lookups(fake_liveheats, dataset):
+    async def prune(use_batching: bool):
+        client = LiveheatsClient(use_sync=False, use_batching=use_batching, athlete_cache=AthleteCache(),
+                                 graphql_client=GraphQLClient(use_cache=False))
+        try:
+            await client.get_fwt_series(seasons=1)
+            return client.pruning_stats
+        finally:
+            await session.shutdown()
+
+    single = asyncio.run(prune(use_batching=False))
+    batched = asyncio.run(prune(use_batching=True))
+
+    assert single["pruned_series"] == batched["pruned_series"] > 0
+    assert single["avoided_requests"] == single["avoided_lookups"]
+    assert batched["avoided_lookups"] == single["avoided_lookups"]
+    assert batched["pruned_series"] < batched["avoided_requests"] < batched["avoided_lookups"]
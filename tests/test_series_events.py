@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from fwt_rankings.api.client import LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+
+
+def _event(event_id: str, days_ahead: int):
+    date = datetime.now(timezone.utc) + timedelta(days=days_ahead)
+    return {"id": event_id, "name": f"Event {event_id}", "date": date.isoformat().replace("+00:00", "Z")}
+
+
+class _SeriesEventsClient:
+    """Stand-in GraphQL client answering GetEventsBySeries with per-series delays."""
+
+    def __init__(self, events, delays):
+        self.events = events
+        self.delays = delays
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def execute(self, query, variables=None, season=None, row_filter=None):
+        series_id = variables["id"]
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(series_id, 0.01))
+        finally:
+            self.in_flight -= 1
+        return {"series": {"events": self.events.get(series_id)}}
+
+
+def _client(graphql_client, **options):
+    return LiveheatsClient(use_sync=False, athlete_cache=AthleteCache(), graphql_client=graphql_client, **options)
+
+
+def test_slow_series_is_skipped_after_timeout(caplog):
+    graphql = _SeriesEventsClient(
+        events={"1": [_event("11", 10)], "2": [_event("21", 5)], "3": [_event("31", 3)]},
+        delays={"2": 5.0},
+    )
+
+    events = asyncio.run(_client(graphql).get_events_from_series(["1", "2", "3"], timeout=0.2))
+
+    assert [e["id"] for e in events] == ["31", "11"]
+    assert any("Timeout" in r.getMessage() and "Series 2" in r.getMessage() for r in caplog.records)
+
+
+def test_series_events_are_bounded_deduplicated_and_sorted():
+    shared = _event("99", 2)
+    graphql = _SeriesEventsClient(
+        events={str(i): [_event(f"{i}0", 20 - i), shared, _event(f"{i}1", -30)] for i in range(10)},
+        delays={},
+    )
+    graphql.events["10"] = None
+
+    events = asyncio.run(_client(graphql, max_concurrent_series=3).get_events_from_series(
+        [str(i) for i in range(11)]
+    ))
+
+    assert graphql.peak_in_flight == 3
+    # Vergangene Events fallen weg, geteilte Events erscheinen nur einmal
+    assert [e["id"] for e in events] == ["99"] + [f"{i}0" for i in reversed(range(10))]
@@ -0,0 +1,43 @@
+from fwt_rankings.data.series_policy import SERIES_EXCLUDE_ENV, SERIES_INCLUDE_ENV, SeriesPolicy
+
+SERIES = [
+    {"id": "1", "name": "Freeride World Tour 2025"},
+    {"id": "2", "name": "FWT Challenger Region 1 2025"},
+    {"id": "3", "name": "National Rankings 2025"},
+    {"id": "4", "name": "Seeding List Ski Men 2025"},
+    {"id": "5", "name": "IFSA Junior 2025"},
+]
+
+
+def _names(series):
+    return [s["name"] for s in series]
+
+
+def test_default_policy_excludes_rankings_and_seeding_lists(monkeypatch):
+    monkeypatch.delenv(SERIES_EXCLUDE_ENV, raising=False)
+    monkeypatch.delenv(SERIES_INCLUDE_ENV, raising=False)
+
+    included, excluded = SeriesPolicy.from_env().classify(SERIES)
+
+    assert _names(excluded) == ["National Rankings 2025", "Seeding List Ski Men 2025"]
+    assert len(included) == 3
+
+
+def test_env_terms_replace_defaults(monkeypatch):
+    monkeypatch.setenv(SERIES_EXCLUDE_ENV, " junior , ,seeding list")
+    monkeypatch.setenv(SERIES_INCLUDE_ENV, "Freeride World Tour,Challenger")
+
+    policy = SeriesPolicy.from_env()
+
+    assert policy.exclude_terms == ("junior", "seeding list")
+    assert _names(policy.classify(SERIES)[0]) == ["Freeride World Tour 2025", "FWT Challenger Region 1 2025"]
+
+
+def test_empty_exclude_env_disables_exclusion(monkeypatch):
+    monkeypatch.setenv(SERIES_EXCLUDE_ENV, "")
+    monkeypatch.delenv(SERIES_INCLUDE_ENV, raising=False)
+
+    policy = SeriesPolicy.from_env()
+
+    assert policy.include_terms is None
+    assert all(policy.is_included(s["name"]) for s in SERIES)
@@ -0,0 +1,37 @@
+import asyncio
+from fwt_rankings.api.session import READ_TIMEOUT_ENV, SessionManager
+
+
+def test_session_from_finished_loop_is_closed():
+    manager = SessionManager()
+    first = asyncio.run(manager.get_session())
+
+    async def reuse():
+        try:
+            return await manager.get_session()
+        finally:
+            await manager.shutdown()
+
+    second = asyncio.run(reuse())
+
+    assert second is not first
+    assert first.closed
+    assert second.closed
+
+
+def test_read_timeout_replaces_total_timeout(monkeypatch):
+    monkeypatch.setenv(READ_TIMEOUT_ENV, "90")
+    manager = SessionManager(connect_timeout=5)
+
+    async def timeout():
+        try:
+            return (await manager.get_session()).timeout
+        finally:
+            await manager.shutdown()
+
+    result = asyncio.run(timeout())
+
+    assert result.total is None
+    assert result.sock_read == 90
+    assert result.sock_connect == 5
+    assert SessionManager(read_timeout=12).read_timeout == 12
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from fwt_rankings.api.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_request():
+    async def scenario():
+        group = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"data": len(calls)}
+
+        results = await asyncio.gather(*[group.do("key", fetch) for _ in range(5)])
+        other = await group.do("other", fetch)
+        return group, calls, results, other
+
+    group, calls, results, other = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert results == [{"data": 1}] * 5
+    assert other == {"data": 2}
+    assert group.counters["leaders"] == 2
+    assert group.counters["coalesced"] == 4
+    assert group.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    async def scenario():
+        group = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        first = asyncio.ensure_future(group.do("key", fetch))
+        second = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return group, await second
+
+    group, result = asyncio.run(scenario())
+    assert result == "ok"
+    assert group.counters["abandoned"] == 0
+
+
+def test_request_is_cancelled_when_all_waiters_leave():
+    async def scenario():
+        group = SingleFlight()
+        started = asyncio.Event()
+        cancelled = []
+
+        async def fetch():
+            started.set()
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        waiter = asyncio.ensure_future(group.do("key", fetch))
+        await started.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+        # Ein neuer Aufrufer startet eine frische Anfrage statt der abgebrochenen
+        async def fresh():
+            return "fresh"
+        return group, cancelled, await group.do("key", fresh)
+
+    group, cancelled, result = asyncio.run(scenario())
+    assert cancelled == [True]
+    assert group.counters["abandoned"] == 1
+    assert result == "fresh"
+
+
+def test_failures_are_shared_and_not_cached():
+    async def scenario():
+        group = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(group.do("key", fail), group.do("key", fail), return_exceptions=True)
+
+        async def succeed():
+            return "ok"
+        return results, await group.do("key", succeed)
+
+    results, retry = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert retry == "ok"
@@ -0,0 +1,73 @@
+import asyncio
+from fwt_rankings.api import session
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+from fwt_rankings.api.streaming import RankingsRowFilter
+
+
+async def _report_rankings(dataset, stream_rows: bool = True):
+    client = LiveheatsClient(use_sync=False, athlete_cache=AthleteCache(),
+                             graphql_client=GraphQLClient(stream_rows=stream_rows))
+    try:
+        event_id = dataset.upcoming_event_ids()[0]
+        await client.get_event_athletes(event_id)
+        athlete_ids = list(client.event_entries[event_id])
+        series_ids = await client.get_fwt_series(seasons=0)
+        results = await client.fetch_multiple_series(series_ids, athlete_ids, strategy="series")
+        return client, athlete_ids, results
+    finally:
+        await session.shutdown()
+
+
+def _rankings(results):
+    return sorted(
+        (r["series_id"], division, ranking["athlete"]["id"], ranking["place"])
+        for r in results
+        for division, rankings in r["divisions"].items()
+        for ranking in rankings
+    )
+
+
+def test_default_client_streams_filtered_rankings(fake_liveheats, dataset):
+    client, athlete_ids, results = asyncio.run(_report_rankings(dataset))
+
+    graphql = client.client
+    # Standardkonfiguration: Response-Cache aktiv und trotzdem gefiltert gestreamt
+    assert graphql.cache is not None
+    assert graphql.supports_row_filter
+    assert graphql.stream_stats["streamed"] > 0
+    assert 0 < graphql.stream_stats["rows_kept"] < graphql.stream_stats["rows_seen"]
+    assert {row[2] for row in _rankings(results)} <= set(athlete_ids)
+
+
+def test_filtered_responses_are_not_cached(fake_liveheats, dataset):
+    client, _, _ = asyncio.run(_report_rankings(dataset))
+
+    cache = client.client.cache
+    operations = {row[0] for row in cache._conn.execute("SELECT operation FROM responses")}
+    assert "GetDivisions" in operations
+    assert not operations & {"GetSeriesRankings", "GetSeriesRankingsLean"}
+
+
+def test_filtered_rankings_match_unfiltered(fake_liveheats, dataset):
+    _, _, streamed = asyncio.run(_report_rankings(dataset))
+    client, _, full = asyncio.run(_report_rankings(dataset, stream_rows=False))
+
+    assert client.client.stream_stats["streamed"] == 0
+    assert _rankings(streamed) == _rankings(full)
+
+
+def test_row_filter_keeps_only_wanted_rows():
+    payload = (
+        b'{"data": {"series": {"name": "X", "rankings": ['
+        b'{"athlete": {"id": "1"}, "place": 1}, {"athlete": {"id": "2"}, "place": 2}'
+        b']}}}'
+    )
+    row_filter = RankingsRowFilter({"2"})
+    # Chunk-Grenzen mitten im Schlüssel und in einer Zeile
+    for chunk in (payload[:35], payload[35:60], payload[60:]):
+        row_filter.feed(chunk)
+    data = row_filter.close()
+
+    assert data["data"]["series"] == {"name": "X", "rankings": [{"athlete": {"id": "2"}, "place": 2}]}
+    assert (row_filter.rows_seen, row_filter.rows_kept) == (2, 1)
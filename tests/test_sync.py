@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from fwt_rankings.api import session
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+from fwt_rankings.api.sync import SeasonSync, is_series_finished
+
+
+def _event(days_ago: int, status: str = "results_published"):
+    date = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return {"date": date.isoformat().replace("+00:00", "Z"), "status": status}
+
+
+def test_is_series_finished():
+    assert is_series_finished([_event(40), _event(20)])
+    assert not is_series_finished([_event(40), _event(-5, "upcoming")])
+    # Letztes Event noch nicht abgeklungen
+    assert not is_series_finished([_event(40), _event(2)])
+    assert not is_series_finished([])
+
+
+def test_freeze_load_and_unfreeze(tmp_path):
+    sync = SeasonSync(path=tmp_path / "sync.sqlite")
+    divisions = [{"id": "1", "name": "Ski Men"}, {"id": "2", "name": "Ski Women"}]
+
+    sync.freeze_series("10", "FWT 2023", divisions, [[{"place": 1}], None])
+    assert not sync.is_frozen("10")
+
+    sync.freeze_series("10", "FWT 2023", divisions, [[{"place": 1}], []])
+    assert sync.frozen_ids(["10", "11"]) == {"10"}
+    assert sync.load_series("10") == {
+        "name": "FWT 2023",
+        "divisions": [({"id": "1", "name": "Ski Men"}, [{"place": 1}]), ({"id": "2", "name": "Ski Women"}, [])],
+    }
+
+    sync.unfreeze("10")
+    assert sync.load_series("10") is None
+    assert sync.stats()["frozen_series"] == 0
+
+
+async def _fetch(dataset):
+    client = LiveheatsClient(athlete_cache=AthleteCache(), graphql_client=GraphQLClient(use_cache=False))
+    try:
+        event_id = dataset.upcoming_event_ids()[0]
+        await client.get_event_athletes(event_id)
+        series_ids = await client.get_fwt_series(seasons=0)
+        results = await client.fetch_multiple_series(series_ids, list(client.event_entries[event_id]),
+                                                     strategy="series")
+        return client, results
+    finally:
+        await session.shutdown()
+
+
+def test_finished_series_are_served_from_store(fake_liveheats, dataset):
+    client, first = asyncio.run(_fetch(dataset))
+    frozen = client.sync.stats()["frozen_series"]
+    assert frozen > 0
+    fake_liveheats.operations.clear()
+
+    client, second = asyncio.run(_fetch(dataset))
+
+    assert second == first
+    assert client.sync.counters["frozen_hits"] == frozen
+    # Nur noch die Divisionen der laufenden Saison werden abgefragt
+    rankings_requests = sum(n for op, n in fake_liveheats.operations.items() if "Rankings" in op)
+    assert 0 < rankings_requests
+    assert fake_liveheats.operations["GetBatchedSeriesRankings"] == 0
+
+
+def test_expired_frozen_series_is_refetched(tmp_path):
+    sync = SeasonSync(path=tmp_path / "sync.sqlite", max_age_days=30)
+    sync.freeze_series("10", "FWT 2023", [{"id": "1", "name": "Ski Men"}], [[{"place": 1}]])
+    assert sync.is_frozen("10")
+
+    with sync._conn:
+        sync._conn.execute("UPDATE frozen_series SET frozen_at = frozen_at - 31 * 86400")
+
+    assert not sync.is_frozen("10")
+    assert sync.frozen_ids(["10"]) == set()
+    assert sync.load_series("10") is None
+    assert SeasonSync(path=tmp_path / "sync.sqlite", max_age_days=None).is_frozen("10")
+
+    # Erneutes Einfrieren setzt das Alter zurück
+    sync.freeze_series("10", "FWT 2023", [{"id": "1", "name": "Ski Men"}], [[{"place": 2}]])
+    assert sync.load_series("10")["divisions"][0][1] == [{"place": 2}]
+    assert sync.unfreeze("10")
+    assert not sync.unfreeze("10")
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from fwt_rankings.api import session
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+from fwt_rankings.api.transport import (
+    BufferedResponse, Cassette, CassetteMiss, ErrorProfile, LatencyProfile, RecordingTransport, ReplayTransport
+)
+
+
+async def _fetch(dataset, transport):
+    client = LiveheatsClient(use_sync=False, athlete_cache=AthleteCache(),
+                             graphql_client=GraphQLClient(transport=transport, use_cache=False))
+    try:
+        event_id = dataset.upcoming_event_ids()[0]
+        await client.get_event_athletes(event_id)
+        series_ids = await client.get_fwt_series(seasons=0)
+        return await client.fetch_multiple_series(series_ids, list(client.event_entries[event_id]))
+    finally:
+        await client.client.close()
+        await session.shutdown()
+
+
+def test_replay_matches_recording_without_network(fake_liveheats, dataset, tmp_path):
+    cassette = str(tmp_path / "cassette.json")
+    recorded = asyncio.run(_fetch(dataset, RecordingTransport(cassette)))
+    requests = fake_liveheats.counters["requests"]
+
+    transport = ReplayTransport(cassette, seed=1)
+    replayed = asyncio.run(_fetch(dataset, transport))
+
+    assert replayed == recorded
+    assert fake_liveheats.counters["requests"] == requests
+    assert transport.counters["replayed"] > 0
+    assert transport.counters["misses"] == 0
+
+
+def test_replay_retries_injected_errors(fake_liveheats, dataset, tmp_path):
+    cassette = str(tmp_path / "cassette.json")
+    recorded = asyncio.run(_fetch(dataset, RecordingTransport(cassette)))
+
+    transport = ReplayTransport(
+        cassette,
+        latency=LatencyProfile(base=0.001),
+        errors=ErrorProfile(rate=0.2, status=429, retry_after=0.01),
+        seed=3,
+    )
+    assert asyncio.run(_fetch(dataset, transport)) == recorded
+    assert transport.counters["injected_errors"] > 0
+
+
+def _cassette_with(tmp_path, interactions) -> str:
+    path = tmp_path / "cassette.json"
+    path.write_text(json.dumps({"version": 1, "created": "2025-01-01T00:00:00", "interactions": interactions}))
+    return str(path)
+
+
+def _interaction(query, variables, data, operation="GetBatchedSeriesRankings"):
+    cassette = Cassette("unused")
+    cassette.add({"query": query, "variables": variables}, 200, json.dumps({"data": data}).encode(), {}, 0.0)
+    interaction = next(iter(cassette.interactions.values()))[0]
+    interaction["operation"] = operation
+    return interaction
+
+
+def test_replay_composes_regrouped_batches(tmp_path):
+    query = "query GetBatchedSeriesRankings($s0: ID!, $d0: ID!, $s1: ID!, $d1: ID!) { x }"
+    path = _cassette_with(tmp_path, [
+        _interaction(query, {"s0": "1", "d0": "10", "s1": "2", "d1": "20"},
+                     {"s0": {"rankings": ["a"]}, "s1": {"rankings": ["b"]}}),
+    ])
+    transport = ReplayTransport(path)
+
+    async def post(variables):
+        async with transport.post("http://replay", {"query": query, "variables": variables}) as response:
+            assert isinstance(response, BufferedResponse)
+            return await response.json()
+
+    # Gleiche Abfragen in anderer Batch-Zusammensetzung
+    data = asyncio.run(post({"s0": "2", "d0": "20", "s1": "1", "d1": "10"}))
+    assert data == {"data": {"s0": {"rankings": ["b"]}, "s1": {"rankings": ["a"]}}}
+    assert transport.counters["composed"] == 1
+
+    with pytest.raises(CassetteMiss):
+        asyncio.run(post({"s0": "3", "d0": "30"}))
+
+
+def test_cassette_rejects_unknown_version(tmp_path):
+    path = tmp_path / "cassette.json"
+    path.write_text(json.dumps({"version": 99, "interactions": []}))
+    with pytest.raises(ValueError):
+        Cassette.load(str(path))
@@ -0,0 +1,118 @@
+import asyncio
+from fwt_rankings.api import session
+from fwt_rankings.api.client import GraphQLClient, LiveheatsClient
+from fwt_rankings.api.entities import AthleteCache
+from fwt_rankings.data.processors import RankingsProcessor
+from fwt_rankings.warehouse.crawler import WarehouseCrawler
+from fwt_rankings.warehouse.store import RankingsWarehouse
+
+
+def _rankings(results):
+    return sorted(
+        (r["series_id"], division, ranking["athlete"]["id"], ranking["athlete"]["name"],
+         ranking["place"], ranking["points"], len(ranking["results"]))
+        for r in results
+        for division, rankings in r["divisions"].items()
+        for ranking in rankings
+    )
+
+
+def _client():
+    return LiveheatsClient(use_sync=False, athlete_cache=AthleteCache(),
+                           graphql_client=GraphQLClient(use_cache=False))
+
+
+async def _crawl(warehouse):
+    try:
+        return await WarehouseCrawler(client=_client(), warehouse=warehouse).crawl()
+    finally:
+        await session.shutdown()
+
+
+async def _fetch(dataset, athlete_ids=None):
+    client = _client()
+    try:
+        event_id = dataset.upcoming_event_ids()[0]
+        await client.get_event_athletes(event_id)
+        athlete_ids = athlete_ids or list(client.event_entries[event_id])
+        series_ids = await client.get_fwt_series(seasons=0)
+        return athlete_ids, await client.fetch_multiple_series(series_ids, athlete_ids)
+    finally:
+        await session.shutdown()
+
+
+def test_warehouse_matches_live_rankings(fake_liveheats, dataset, tmp_path):
+    warehouse = RankingsWarehouse(path=tmp_path / "warehouse.sqlite")
+    assert not warehouse.is_fresh()
+
+    summary = asyncio.run(_crawl(warehouse))
+    assert summary["failed"] == 0
+    assert warehouse.is_fresh()
+    assert warehouse.stats()["series"] == summary["series"]
+
+    athlete_ids, live = asyncio.run(_fetch(dataset))
+    requests = fake_liveheats.counters["requests"]
+    stored = warehouse.load_results(athlete_ids)
+
+    assert fake_liveheats.counters["requests"] == requests
+    assert _rankings(stored) == _rankings(live)
+
+
+def test_warehouse_season_window(fake_liveheats, dataset, tmp_path):
+    warehouse = RankingsWarehouse(path=tmp_path / "warehouse.sqlite")
+    asyncio.run(_crawl(warehouse))
+    athlete_ids = list(dataset.athletes_by_id)
+
+    latest_year = max(int(s["name"].split()[-2]) for s in dataset.series_by_id.values())
+    names = {r["series_name"] for r in warehouse.load_results(athlete_ids, min_year=latest_year)}
+    assert names
+    assert all(str(latest_year) in name for name in names)
+
+
+def test_remove_missing_series(tmp_path):
+    warehouse = RankingsWarehouse(path=tmp_path / "warehouse.sqlite")
+    division = {"id": "1", "name": "Ski Men"}
+    ranking = {"athlete": {"id": "7", "name": "Rider"}, "place": 1, "points": 100.0, "results": []}
+    warehouse.store_series("10", "FWT 2024", 0, [(division, [ranking])])
+    warehouse.store_series("11", "FWT 2025", 1, [(division, [ranking])])
+
+    warehouse.remove_missing_series(["11"])
+
+    assert [r["series_id"] for r in warehouse.load_results(["7"])] == ["11"]
+
+
+def test_current_season_is_fetched_live(fake_liveheats, dataset, tmp_path):
+    warehouse = RankingsWarehouse(path=tmp_path / "warehouse.sqlite")
+    asyncio.run(_crawl(warehouse))
+    current = warehouse.current_season_series()
+    latest_year = max(int(s["name"].split()[-2]) for s in dataset.series_by_id.values())
+    assert current
+    assert all(str(latest_year) in dataset.series_by_id[s]["name"] for s in current)
+
+    # Nach dem Crawl ändert sich eine Rangliste der laufenden Saison
+    ranking = next(r for s in current for rankings in dataset.series_by_id[s]["_rankings"].values() for r in rankings)
+    ranking["points"] += 1000
+    fake_liveheats._responses.clear()
+    athlete_ids, live = asyncio.run(_fetch(dataset))
+    athlete_ids.append(ranking["athlete"]["id"])
+
+    async def report():
+        client = _client()
+        try:
+            live_results = await client.fetch_multiple_series(current, athlete_ids)
+            rankings_data = RankingsProcessor().process_from_warehouse(
+                warehouse, athlete_ids, {}, client.athletes, live_series_ids=current, live_results=live_results
+            )
+            return live_results, rankings_data
+        finally:
+            await session.shutdown()
+
+    live_results, rankings_data = asyncio.run(report())
+    live_by_id = {r["series_id"]: r for r in live_results if r["series_id"] != "new_athlete"}
+    stored = warehouse.load_results(athlete_ids, live_results={**dict.fromkeys(current), **live_by_id})
+    _, live = asyncio.run(_fetch(dataset, athlete_ids))
+
+    assert _rankings(stored) == _rankings(live)
+    assert _rankings(warehouse.load_results(athlete_ids)) != _rankings(live)
+    rider = next(r for r in rankings_data if r.athlete.id == ranking["athlete"]["id"])
+    assert ranking["points"] in [s.points for s in rider.series_results]